@@ -25,6 +25,9 @@ LOGGER_NAME = ""
 LOG_LEVEL = logging.DEBUG
 logger = idp_utils.setup_logger(LOGGER_NAME, LOG_LEVEL)
 
+# HTTP 세션 (keep-alive 커넥션 재사용 : 상주 워커에서는 호출 간에도 유지)
+_session = requests.Session()
+
 
 def analyze_cropped_images_with_azure(in_params: dict) -> str:
     """
@@ -56,7 +59,7 @@ def analyze_cropped_images_with_azure(in_params: dict) -> str:
 
         for image_path in input_dir.glob("*.png"):
             with open(image_path, "rb") as img_file:
-                response = requests.post(
+                response = _session.post(
                     url=f"{endpoint}/formrecognizer/documentModels/prebuilt-receipt:analyze?api-version=2024-02-29",
                     headers=headers,
                     data=img_file
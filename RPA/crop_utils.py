@@ -1,8 +1,17 @@
 import os
-from ultralytics import YOLO
+import sys
+from pathlib import Path
 from PIL import Image
 from datetime import datetime
 
+# 저장소 루트의 공통 검출 모듈(receipt_detectors) 임포트
+repo_root = str(Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from box_postprocess import BOX_DEFAULTS
+from receipt_detectors import build_detector
+
 # ──────────────── 로그 훅 예시 ────────────────
 def log_info(msg):
     pass
@@ -12,7 +21,7 @@ def log_error(msg):
 # ─────────────────────────────────────────────
 
 
-def crop_with_yolo(image_path: str, output_dir: str) -> dict:
+def crop_with_yolo(image_path: str, output_dir: str, model_path: str = "best.pt", detector: str = "yolo") -> dict:
     """
     YOLOv8 기반 객체 감지 후 크롭 저장
 
@@ -22,6 +31,10 @@ def crop_with_yolo(image_path: str, output_dir: str) -> dict:
         전처리된 이미지 경로
     output_dir : str
         크롭된 이미지 저장 디렉터리
+    model_path : str
+        검출 모델 경로 (.pt 또는 .onnx, .onnx 이면 ONNX Runtime 으로 추론)
+    detector : str
+        검출 백엔드 yolo / onnx / contour / cascade
 
     Returns
     -------
@@ -35,24 +48,21 @@ def crop_with_yolo(image_path: str, output_dir: str) -> dict:
     try:
         os.makedirs(output_dir, exist_ok=True)
 
-        # 모델 로드
-        model = YOLO("best.pt")
+        # 모델 로드 (경로별 캐시), 작은 박스 제거 + 중복 박스 병합
+        receipt_detector = build_detector(detector, model_path=model_path, box_options=BOX_DEFAULTS)
 
         # 감지 수행
-        results = model(image_path)
-        boxes = results[0].boxes
+        image = Image.open(image_path)
+        detections = receipt_detector(image, image_path)
 
-        if boxes is None or len(boxes) == 0:
+        if not detections:
             return {"success": False, "saved_paths": [], "error": "디텍션 결과 없음"}
 
         saved_paths = []
-        image = Image.open(image_path)
         base_name = os.path.splitext(os.path.basename(image_path))[0]
 
-        for idx, box in enumerate(boxes):
-            coords = box.xyxy[0].cpu().numpy()
-            x1, y1, x2, y2 = map(int, coords)
-            cropped = image.crop((x1, y1, x2, y2))
+        for idx, detection in enumerate(detections):
+            cropped = image.crop(detection["box"])
 
             filename = f"{base_name}_crop{idx+1}.png"
             save_path = os.path.join(output_dir, filename)
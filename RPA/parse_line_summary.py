@@ -3,6 +3,14 @@ from datetime import datetime
 from pathlib import Path
 import re
 
+from receipt_line_scanner import ReceiptLineScanner
+
+# 파일명 "_n.jpg" 에서 receipt_index 추출
+RECEIPT_INDEX_RE = re.compile(r"_(\d+)\.jpg")
+
+# 사업자번호(라벨 무관 첫 번호) + "address" 포함 라인 (대소문자 무시) 1회 스캔용
+SUMMARY_SCANNER = ReceiptLineScanner({"delivery_addr": r"address"}, ignore_case=True, prefer_label=False)
+
 def parse_line_summary(json_path: str, file_info_dict: dict) -> dict:
     """
     JSON 결과 파일을 파싱하여 라인 요약 테이블에 들어갈 데이터를 구성한다.
@@ -37,7 +45,7 @@ def parse_line_summary(json_path: str, file_info_dict: dict) -> dict:
         attach_file = file_info_dict["ATTACH_FILE"]
 
         # receipt_index 추출 (_n 형식에서 n을 파싱)
-        match = re.search(r"_(\d+)\.jpg", file_info_dict["FILENAME"])
+        match = RECEIPT_INDEX_RE.search(file_info_dict["FILENAME"])
         receipt_index = int(match.group(1)) if match else 0
 
         # 기본 정보 추출
@@ -58,16 +66,9 @@ def parse_line_summary(json_path: str, file_info_dict: dict) -> dict:
         )
 
         # 사업자번호 / 배송지 주소 추출 (라인에서)
-        biz_no = None
-        delivery_addr = None
-        for line in lines:
-            content = line.get("content", "")
-            if not biz_no:
-                match = re.search(r"\d{3}-\d{2}-\d{5}", content)
-                if match:
-                    biz_no = match.group()
-            if not delivery_addr and "address" in content.lower():
-                delivery_addr = content
+        scanned = SUMMARY_SCANNER.scan_lines(line.get("content", "") for line in lines)
+        biz_no = scanned["business_number"] or None
+        delivery_addr = scanned["delivery_addr"] or None
 
         now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -118,26 +119,27 @@ def parse_line_summary(json_path: str, file_info_dict: dict) -> dict:
             "UPDATE_DATE": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
 
-# 두 샘플 JSON 파일 테스트용 정보
-sample_input_1 = {
-    "FIID": "FIID001",
-    "LINE_INDEX": 1,
-    "ATTACH_FILE": "https://example.com/receipt1.jpg",
-    "COMMON_YN": "N",
-    "FILENAME": "receipt-app-like_3.jpg"
-}
-
-sample_input_2 = {
-    "FIID": "FIID002",
-    "LINE_INDEX": 2,
-    "ATTACH_FILE": "https://example.com/receipt2.jpg",
-    "COMMON_YN": "Y",
-    "FILENAME": "receipt-with-tips_2.jpg"
-}
-
-# 실행
-result1 = parse_line_summary("/mnt/data/receipt-app-like.png (1).json", sample_input_1)
-result2 = parse_line_summary("/mnt/data/receipt-with-tips.jpg.json", sample_input_2)
-
-import pandas as pd
-import ace_tools as tools; tools.display_dataframe_to_user(name="Parsed Line Summary", dataframe=pd.DataFrame([result1, result2]))
+if __name__ == "__main__":
+    # 두 샘플 JSON 파일 테스트용 정보
+    sample_input_1 = {
+        "FIID": "FIID001",
+        "LINE_INDEX": 1,
+        "ATTACH_FILE": "https://example.com/receipt1.jpg",
+        "COMMON_YN": "N",
+        "FILENAME": "receipt-app-like_3.jpg"
+    }
+
+    sample_input_2 = {
+        "FIID": "FIID002",
+        "LINE_INDEX": 2,
+        "ATTACH_FILE": "https://example.com/receipt2.jpg",
+        "COMMON_YN": "Y",
+        "FILENAME": "receipt-with-tips_2.jpg"
+    }
+
+    # 실행
+    result1 = parse_line_summary("/mnt/data/receipt-app-like.png (1).json", sample_input_1)
+    result2 = parse_line_summary("/mnt/data/receipt-with-tips.jpg.json", sample_input_2)
+
+    import pandas as pd
+    import ace_tools as tools; tools.display_dataframe_to_user(name="Parsed Line Summary", dataframe=pd.DataFrame([result1, result2]))
@@ -1,6 +1,5 @@
 import json
 import logging
-import re
 import sys
 import traceback
 from pathlib import Path
@@ -20,6 +19,7 @@ if app_path not in sys.path:
     sys.path.append(app_path)
 
 from util import idp_utils
+from receipt_line_scanner import scan_receipt_json
 
 LOGGER_NAME = ""
 LOG_LEVEL = logging.DEBUG
@@ -27,31 +27,15 @@ logger = idp_utils.setup_logger(LOGGER_NAME, LOG_LEVEL)
 
 
 def extract_business_number(json_data: dict) -> str:
-    lines = json_data.get("analyzeResult", {}).get("pages", [{}])[0].get("lines", [])
-    for line in lines:
-        text = line.get("content", "")
-        if "사업자번호" in text or "사업자 번호" in text:
-            match = re.search(r"\d{3}-\d{2}-\d{5}", text)
-            if match:
-                return match.group()
-    full_text = json_data.get("analyzeResult", {}).get("content", "")
-    match = re.search(r"\d{3}-\d{2}-\d{5}", full_text)
-    return match.group() if match else ""
+    return scan_receipt_json(json_data)["business_number"]
 
 
 def extract_shipping_address(json_data: dict) -> str:
-    lines = json_data.get("analyzeResult", {}).get("pages", [{}])[0].get("lines", [])
-    for line in lines:
-        text = line.get("content", "")
-        if "배송지" in text:
-            return text
-    return ""
+    return scan_receipt_json(json_data)["shipping_address"]
 
 
 def extract_phone_number(json_data: dict) -> str:
-    text = json_data.get("analyzeResult", {}).get("content", "")
-    match = re.search(r"0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4}", text)
-    return match.group() if match else ""
+    return scan_receipt_json(json_data)["phone_number"]
 
 
 def postprocess_receipt_json(in_params: dict) -> str:
@@ -63,19 +47,20 @@ def postprocess_receipt_json(in_params: dict) -> str:
         for json_file in input_dir.glob("*.json"):
             raw = json.loads(json_file.read_text(encoding="utf-8"))
             fields = raw.get("analyzeResult", {}).get("documents", [{}])[0].get("fields", {})
+            scanned = scan_receipt_json(raw)  # 사업자번호/전화번호/배송지 1회 스캔
 
             out = {
                 "country": fields.get("CountryRegion", {}).get("valueCountryRegion", ""),
                 "receipt_type": fields.get("ReceiptType", {}).get("valueString", ""),
                 "merchant_name": fields.get("MerchantName", {}).get("valueString", ""),
-                "merchant_phone": extract_phone_number(raw),
+                "merchant_phone": scanned["phone_number"],
                 "transaction_date": fields.get("TransactionDate", {}).get("valueDate", ""),
                 "transaction_time": fields.get("TransactionTime", {}).get("valueTime", ""),
                 "subtotal": fields.get("Subtotal", {}).get("valueCurrency", {}).get("amount", None),
                 "tax": fields.get("TotalTax", {}).get("valueCurrency", {}).get("amount", None),
                 "total": fields.get("Total", {}).get("valueCurrency", {}).get("amount", None),
-                "business_number": extract_business_number(raw),
-                "shipping_address": extract_shipping_address(raw),
+                "business_number": scanned["business_number"],
+                "shipping_address": scanned["shipping_address"],
                 "items": []
             }
 
@@ -0,0 +1,116 @@
+import re
+from typing import Dict, Iterable, Optional
+
+# ─ 값 패턴 (사업자번호 / 전화번호 / 사업자번호 라벨) : 모듈 로드 시 1회 컴파일 ─
+BIZ_NO_RE = re.compile(r"\d{3}-\d{2}-\d{5}")
+PHONE_RE = re.compile(r"0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4}")
+BIZ_LABEL_RE = re.compile(r"사업자 ?번호")
+
+# ─ 키워드 라인 필드 (키워드가 포함된 라인 전체를 값으로 사용) ─
+DEFAULT_KEYWORD_FIELDS = {
+    "shipping_address": r"배송지",
+}
+
+
+class ReceiptLineScanner:
+    """
+    영수증 텍스트에서 사업자번호, 전화번호, 키워드 라인(배송지 등)을 한 번에 추출하는 스캐너
+
+    - 모든 패턴은 생성 시 1회 컴파일하고, 필드별 첫 매칭에서 바로 종료
+    - 사업자번호는 prefer_label=True 이면 라벨("사업자번호") 라인의 번호 우선 (postprocess_receipt_json),
+      False 이면 텍스트의 첫 번호 (parse_line_summary)
+    - 라인 단위 반복 없이 전체 텍스트에서 매칭 위치 기준으로 해당 라인만 잘라냄
+    - 패턴을 하나의 alternation 으로 합치지 않음
+      (CPython re 는 백트래킹 엔진이라 alternation 이 되면 리터럴 prefix 고속 탐색이 꺼지고
+       위치마다 모든 분기를 시도하여 오히려 느려짐 : benchmarks/bench_line_scanner.py 참고)
+    """
+
+    def __init__(self, keyword_fields: Optional[Dict[str, str]] = None, ignore_case: bool = False,
+                 prefer_label: bool = True):
+        """
+        Args:
+            keyword_fields (dict): {필드명: 키워드 정규식} (기본값 : 배송지)
+            ignore_case (bool): 키워드 대소문자 무시 여부
+            prefer_label (bool): 사업자번호 라벨 라인의 번호 우선 여부
+        """
+        self.prefer_label = prefer_label
+        self.keyword_fields = dict(DEFAULT_KEYWORD_FIELDS if keyword_fields is None else keyword_fields)
+        flags = re.IGNORECASE if ignore_case else 0
+        self._keyword_res = {name: re.compile(pattern, flags) for name, pattern in self.keyword_fields.items()}
+
+    @staticmethod
+    def _line_bounds(text: str, start: int, end: int) -> tuple:
+        """매칭 위치(start~end)를 포함하는 라인의 (시작, 끝) 인덱스"""
+        line_start = text.rfind("\n", 0, start) + 1
+        line_end = text.find("\n", end)
+        return line_start, (len(text) if line_end < 0 else line_end)
+
+    def scan(self, text: str, full_text: Optional[str] = None) -> Dict[str, str]:
+        """
+        텍스트 전체를 스캔하여 필드 값 추출
+
+        Args:
+            text (str): 개행(\\n)으로 구분된 OCR 텍스트 (사업자번호 라벨 / 키워드 라인 검색 범위)
+            full_text (str): 전화번호와 라벨 없는 사업자번호 검색 범위 (기본값 : text)
+
+        Returns:
+            dict: {"business_number", "phone_number", <keyword 필드>...} (없으면 "")
+        """
+        result = {"business_number": "", "phone_number": ""}
+        result.update({name: "" for name in self.keyword_fields})
+        if full_text is None:
+            full_text = text
+        if not text and not full_text:
+            return result
+
+        match = PHONE_RE.search(full_text)
+        if match:
+            result["phone_number"] = match.group()
+
+        # 라벨("사업자번호")과 같은 라인에 있는 번호 우선, 없으면 full_text 의 첫 번호
+        labels = BIZ_LABEL_RE.finditer(text) if self.prefer_label else ()
+        for label in labels:
+            line_start, line_end = self._line_bounds(text, label.start(), label.end())
+            match = BIZ_NO_RE.search(text, line_start, line_end)
+            if match:
+                result["business_number"] = match.group()
+                break
+        else:
+            match = BIZ_NO_RE.search(full_text)
+            if match:
+                result["business_number"] = match.group()
+
+        for name, keyword_re in self._keyword_res.items():
+            match = keyword_re.search(text)
+            if match:
+                line_start, line_end = self._line_bounds(text, match.start(), match.end())
+                result[name] = text[line_start:line_end]
+
+        return result
+
+    def scan_lines(self, lines: Iterable[str]) -> Dict[str, str]:
+        """라인 리스트를 개행으로 합쳐 scan() 수행"""
+        return self.scan("\n".join(lines))
+
+
+# 기본 스캐너 (모듈 로드 시 1회 컴파일)
+default_scanner = ReceiptLineScanner()
+
+
+def scan_receipt_json(json_data: dict, scanner: ReceiptLineScanner = default_scanner) -> Dict[str, str]:
+    """
+    Azure OCR 결과 JSON 을 한 번에 스캔 (기존 extract_* 함수와 같은 범위)
+    - 사업자번호 라벨 라인 / 배송지 : 첫 페이지 lines
+    - 전화번호 / 라벨 없는 사업자번호 : 전체 페이지 content (없으면 "")
+
+    Args:
+        json_data (dict): Azure OCR 결과 (REST 응답의 analyzeResult 또는 SDK to_dict() 형식)
+        scanner (ReceiptLineScanner): 사용할 스캐너
+
+    Returns:
+        dict: scan() 결과
+    """
+    analyze_result = json_data.get("analyzeResult", json_data)
+    lines = (analyze_result.get("pages") or [{}])[0].get("lines", [])
+    text = "\n".join(line.get("content", "") for line in lines)
+    return scanner.scan(text, analyze_result.get("content", ""))
@@ -0,0 +1,224 @@
+import importlib
+import json
+import logging
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# ─ 공통 설정 ─
+script_path = Path(__file__).resolve()
+app_path = ""
+for parent in script_path.parents:
+    if parent.name in ("idp", "DEX", "PEX"):
+        app_path = str(parent)
+        break
+
+if not app_path:
+    raise FileNotFoundError("idp, DEX, PEX not found in path")
+
+if app_path not in sys.path:
+    sys.path.append(app_path)
+
+# 같은 폴더의 스텝 모듈을 모듈명으로 임포트
+if str(script_path.parent) not in sys.path:
+    sys.path.append(str(script_path.parent))
+
+from util import idp_utils
+
+LOGGER_NAME = ""
+LOG_LEVEL = logging.DEBUG
+logger = idp_utils.setup_logger(LOGGER_NAME, LOG_LEVEL)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# ─ 스텝 목록 : 스텝 이름 -> (모듈명, 함수명, 직렬 실행 여부) ─
+# YOLO 모델 객체는 스레드 간 동시 추론이 안전하지 않으므로 직렬 실행
+STEPS = {
+    "convert_image_folder_to_png": ("conver_to_image_path_pdf", "convert_image_folder_to_png", False),
+    "run_yolo_crop_on_folder": ("run_yolo_crop_on_folder", "run_yolo_crop_on_folder", True),
+    "analyze_cropped_images_with_azure": ("analyze_cropped_images_with_azure", "analyze_cropped_images_with_azure", False),
+    "postprocess_receipt_json": ("postprocess_receipt_json", "postprocess_receipt_json", False),
+    "select_and_save_csv": ("select_db", "select_and_save_csv", False),
+}
+
+_step_funcs = {}
+_step_locks = {name: threading.Lock() for name, (_, _, serial) in STEPS.items() if serial}
+_load_lock = threading.Lock()
+_started_at = time.time()
+_call_counts = {name: 0 for name in STEPS}
+_count_lock = threading.Lock()
+
+
+def get_step(step: str):
+    """
+    스텝 함수 조회 (최초 호출 시 1회 임포트, 이후 프로세스 수명 동안 재사용)
+    """
+    if step not in STEPS:
+        raise KeyError(f"알 수 없는 스텝: {step}")
+    func = _step_funcs.get(step)
+    if func is None:
+        with _load_lock:
+            func = _step_funcs.get(step)
+            if func is None:
+                module_name, func_name, _ = STEPS[step]
+                func = getattr(importlib.import_module(module_name), func_name)
+                _step_funcs[step] = func
+    return func
+
+
+def warm_up(model_path: str = None, detector_params: dict = None):
+    """
+    스텝 모듈 사전 임포트 및 YOLO 모델 사전 로드 (첫 요청 지연 제거)
+    detector_params 는 요청 in_params 와 같은 검출 옵션 (detector, onnx_threads 등)
+    → 모델 / ONNX 세션 캐시 키가 실제 요청과 같아야 첫 요청에서 다시 로드하지 않습니다.
+    """
+    for step in STEPS:
+        try:
+            get_step(step)
+        except Exception as e:
+            logger.warning(f"[워커] 스텝 로드 실패 {step}: {e}")
+    if model_path:
+        from run_yolo_crop_on_folder import load_yolo_model
+        load_yolo_model(str(model_path), detector_params)
+
+
+def run_step(step: str, in_params: dict):
+    """
+    스텝 실행 (기존 진입점과 동일한 in_params 사용, 반환값도 동일)
+    """
+    func = get_step(step)
+    lock = _step_locks.get(step)
+    start = time.perf_counter()
+    if lock:
+        with lock:
+            result = func(in_params)
+    else:
+        result = func(in_params)
+    with _count_lock:
+        _call_counts[step] += 1
+    logger.info(f"[워커] {step} 완료 ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    return result
+
+
+class WorkerRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /run/<step>  : body = in_params(JSON), 응답 = {"result": ...}
+    GET  /health      : 상태 및 스텝별 호출 수
+    """
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": f"not found: {self.path}"})
+            return
+        with _count_lock:
+            calls = dict(_call_counts)
+        self._send_json(200, {
+            "status": "ok",
+            "uptime_sec": round(time.time() - _started_at, 1),
+            "loaded_steps": sorted(_step_funcs),
+            "calls": calls,
+        })
+
+    def do_POST(self):
+        if not self.path.startswith("/run/"):
+            self._send_json(404, {"error": f"not found: {self.path}"})
+            return
+        step = self.path[len("/run/"):]
+        if step not in STEPS:
+            self._send_json(404, {"error": f"알 수 없는 스텝: {step}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            in_params = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"in_params JSON 파싱 실패: {e}"})
+            return
+
+        try:
+            result = run_step(step, in_params)
+            self._send_json(200, {"result": result})
+        except Exception as e:
+            # 트레이스백은 워커 로그에만 남기고 클라이언트에는 오류 메시지만 반환
+            logger.exception(f"[워커] {step} 실패: {e}")
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        logger.debug(f"[워커] {self.address_string()} {format % args}")
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, model_path: str = None, detector_params: dict = None):
+    """
+    상주 워커 실행 (로컬 전용 HTTP 서버)
+
+    Args:
+        host (str): 바인딩 주소 (기본값 : 127.0.0.1)
+        port (int): 포트 (기본값 : 8765)
+        model_path (str): 사전 로드할 YOLO 모델 경로 (.pt 또는 .onnx, 선택)
+        detector_params (dict): 사전 로드에 사용할 검출 옵션 (요청 in_params 와 같은 키, 선택)
+    """
+    warm_up(model_path, detector_params)
+    server = ThreadingHTTPServer((host, port), WorkerRequestHandler)
+    server.daemon_threads = True
+    logger.info(f"[워커] 대기 중: http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("[워커] 종료")
+    finally:
+        server.server_close()
+
+
+def call_worker(step: str, in_params: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 600):
+    """
+    상주 워커에 스텝 실행 요청 (RPA 측 클라이언트)
+
+    Args:
+        step (str): 스텝 이름 (STEPS 키)
+        in_params (dict): 스텝 입력 파라미터
+        timeout (float): 요청 타임아웃(초)
+
+    Returns:
+        Any: 스텝 함수 반환값
+    """
+    request = urllib.request.Request(
+        f"http://{host}:{port}/run/{step}",
+        data=json.dumps(in_params, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())["result"]
+    except urllib.error.HTTPError as e:
+        error = json.loads(e.read() or b"{}").get("error", str(e))
+        raise RuntimeError(f"[워커] {step} 실패: {error}") from None
+
+
+# ─ 실행 ─
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RPA 상주 워커")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model-path", default=None, help="사전 로드할 YOLO 모델 경로 (.pt 또는 .onnx)")
+    parser.add_argument("--detector", default="yolo", help="사전 로드 검출 백엔드 (요청 in_params 의 detector 와 동일하게)")
+    parser.add_argument("--onnx-threads", type=int, default=None, help="사전 로드 ONNX 세션 스레드 수 (요청 in_params 의 onnx_threads 와 동일하게)")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.model_path,
+          detector_params={"detector": args.detector, "onnx_threads": args.onnx_threads})
@@ -5,8 +5,6 @@ import traceback
 from pathlib import Path
 from PIL import Image
 
-from ultralytics import YOLO
-
 # ─ 공통 설정 ─
 script_path = Path(__file__).resolve()
 app_path = ""
@@ -21,13 +19,47 @@ if not app_path:
 if app_path not in sys.path:
     sys.path.append(app_path)
 
+# 저장소 루트의 공통 검출 모듈(receipt_detectors) 임포트
+repo_root = str(script_path.parents[1])
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
 from util import idp_utils
+from box_postprocess import box_options_from
+from receipt_detectors import build_detector
 
 LOGGER_NAME = ""
 LOG_LEVEL = logging.DEBUG
 logger = idp_utils.setup_logger(LOGGER_NAME, LOG_LEVEL)
 
 
+def build_folder_detector(in_params: dict):
+    """
+    run_yolo_crop_on_folder() 의 검출기 생성 (in_params 키는 run_yolo_crop_on_folder 참고)
+    """
+    return build_detector(
+        in_params.get("detector", "yolo"),
+        model_path=str(in_params["yolo_model_path"]),
+        onnx_options={"threads": in_params.get("onnx_threads")},
+        tile_options=in_params.get("detector_tile_options", {}) if in_params.get("detector_tiled") else None,
+        box_options=box_options_from(in_params),
+    )
+
+
+def load_yolo_model(model_path: str, in_params: dict = None):
+    """
+    검출 모델 사전 로드 (상주 워커 warm-up : 모델 / 세션은 경로 + 옵션별 캐시로 프로세스 수명 동안 재사용)
+    실제 실행과 같은 옵션(in_params 의 detector / onnx_threads 등)으로 검출기를 만들어 빈 이미지 1장을 검출하므로
+    첫 요청이 같은 캐시 키의 모델 / ONNX 세션을 그대로 사용합니다.
+
+    Returns:
+        ReceiptDetector: 로드된 검출기
+    """
+    detector = build_folder_detector({**(in_params or {}), "yolo_model_path": model_path})
+    detector(Image.new("RGB", (64, 64), (255, 255, 255)))
+    return detector
+
+
 def run_yolo_crop_on_folder(in_params: dict) -> str:
     """
     폴더 내 이미지들에 대해 YOLO 모델로 객체 감지 후 크롭된 이미지를 저장
@@ -36,7 +68,11 @@ def run_yolo_crop_on_folder(in_params: dict) -> str:
         in_params (dict): {
             "preprocessing_image_path": 전처리 이미지 폴더,
             "cropped_image_path": 크롭 이미지 저장 폴더,
-            "yolo_model_path": YOLO 모델 pt 경로
+            "yolo_model_path": YOLO 모델 경로 (.pt 또는 export_onnx() 로 변환한 .onnx),
+            "detector": 검출 백엔드 yolo(기본) / onnx / contour / cascade (선택),
+            "onnx_threads": ONNX Runtime 스레드 수 (선택),
+            "detector_tiled": True 이면 세로로 긴 이미지(문서 병합)를 타일로 나눠 검출 (선택, 기본 False),
+            "box_*": 박스 후처리 옵션 (box_min_score, box_min_area_ratio, box_iou, box_containment, box_top_k, 선택)
         }
 
     Returns:
@@ -45,29 +81,24 @@ def run_yolo_crop_on_folder(in_params: dict) -> str:
     try:
         input_dir = Path(in_params["preprocessing_image_path"])
         output_dir = Path(in_params["cropped_image_path"])
-        model_path = in_params["yolo_model_path"]
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        model = YOLO(model_path)
+        detector = build_folder_detector(in_params)
 
         images = sorted([f for f in input_dir.iterdir() if f.suffix.lower() == ".png"])
         if not images:
             raise FileNotFoundError("PNG 이미지가 없습니다.")
 
         for img_path in images:
-            results = model(str(img_path))
-            boxes = results[0].boxes
+            image = Image.open(img_path)
+            detections = detector(image, str(img_path))
 
-            if boxes is None or len(boxes) == 0:
+            if not detections:
                 logger.warning(f"디텍션 없음: {img_path}")
                 continue
 
-            image = Image.open(img_path)
-
-            for i, box in enumerate(boxes):
-                coords = box.xyxy[0].cpu().numpy()  # [x1, y1, x2, y2]
-                x1, y1, x2, y2 = map(int, coords)
-                cropped = image.crop((x1, y1, x2, y2))
+            for i, detection in enumerate(detections):
+                cropped = image.crop(detection["box"])  # [x1, y1, x2, y2]
 
                 save_path = output_dir / f"{img_path.stem}_{i}.png"
                 cropped.save(save_path)
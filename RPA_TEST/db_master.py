@@ -5,6 +5,10 @@ import traceback
 from sqlalchemy import text
 from decimal import Decimal
 
+from stage_metrics import metrics, timed
+
+logger = logging.getLogger("DB_MASTER")
+
 def query_data_by_date(duser_input: dict) -> list:
     """
     지정한 날짜의 SAP HANA 테이블 레코드를 조회하여 반환합니다.
@@ -57,7 +61,23 @@ def query_data_by_date(duser_input: dict) -> list:
         traceback.print_exc()
         return []
 
-def insert_postprocessed_result(json_path: str, duser_input: dict) -> None:
+def delete_postprocessed_result(conn, summary: dict) -> None:
+    """
+    영수증 1건(FIID / LINE_INDEX / RECEIPT_INDEX)의 기존 요약 및 품목 행을 삭제합니다. (재입력 전 중복 방지)
+
+    입력:
+    - conn: SQLAlchemy 연결 (커밋은 호출측에서 수행)
+    - summary (dict): 후처리 결과 summary (FIID, LINE_INDEX, RECEIPT_INDEX 사용)
+    """
+    keys = {key: summary.get(key) for key in ("FIID", "LINE_INDEX", "RECEIPT_INDEX")}
+    for table in ("RPA_CCR_LINE_ITEMS", "RPA_CCR_LINE_SUMM"):
+        conn.execute(text(f"""
+            DELETE FROM {table}
+            WHERE FIID = :FIID AND LINE_INDEX = :LINE_INDEX AND RECEIPT_INDEX = :RECEIPT_INDEX
+        """), keys)
+
+@timed("db_insert")
+def insert_postprocessed_result(json_path: str, duser_input: dict, replace: bool = False):
     """
     후처리 완료된 JSON 파일을 읽어 SAP HANA DB의 요약 및 품목 테이블에 삽입합니다.
     요약 정보는 RPA_CCR_LINE_SUMM 테이블에, 항목 리스트는 RPA_CCR_LINE_ITEMS 테이블에 INSERT합니다.
@@ -65,9 +85,10 @@ def insert_postprocessed_result(json_path: str, duser_input: dict) -> None:
     입력:
     - json_path (str): 후처리 결과 JSON 파일 경로. 이 파일에는 summary와 items 키가 포함된 JSON 구조여야 합니다.
     - duser_input (dict): 데이터베이스 연결 정보 등을 포함한 파라미터 딕셔너리. (sqlalchemy_conn 필수)
+    - replace (bool): True 이면 같은 FIID / LINE_INDEX / RECEIPT_INDEX 의 기존 행을 삭제 후 입력 (재생 모드 재입력, 기본값 : False)
 
     출력:
-    - None: DB 삽입 완료 후 반환값이 없습니다. (실패 시 예외를 발생시키며, 로그에 에러를 기록합니다)
+    - str | None: 입력한 summary 의 RESULT_CODE (DB 저장 실패 시 None, 에러는 로그에 기록합니다)
     """
     logger = logging.getLogger("WRAPPER")
     logger.info("[시작] insert_postprocessed_result")
@@ -76,13 +97,15 @@ def insert_postprocessed_result(json_path: str, duser_input: dict) -> None:
         logger.error(f"[ERROR] 후처리 JSON 파일이 존재하지 않습니다: {json_path}")
         raise FileNotFoundError(f"후처리 JSON 파일이 존재하지 않습니다: {json_path}")
 
+    conn = duser_input.get("sqlalchemy_conn")
     try:
         with open(json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
         summary = data["summary"]
         items = data["items"]
-        conn = duser_input["sqlalchemy_conn"]
+        if replace:
+            delete_postprocessed_result(conn, summary)
 
         # ✅ SAP HANA용 INSERT 문 (TO_DATE 사용하지 않음)
         insert_summ_sql = text("""
@@ -127,10 +150,16 @@ def insert_postprocessed_result(json_path: str, duser_input: dict) -> None:
         conn.commit()
 
     except Exception as e:
+        # replace 시 먼저 실행된 DELETE 가 공유 연결에 남아 다음 commit 에 반영되지 않도록 되돌림
+        if conn is not None:
+            conn.rollback()
+        metrics.incr("db_insert_failed")
         logger.error(f"[ERROR] DB 저장 실패: {e}")
         traceback.print_exc()
+        return None
 
     logger.info("[종료] insert_postprocessed_result")
+    return str(summary.get("RESULT_CODE"))
 
 # (No __main__ testing code, as Oracle support is removed and HANA usage is configured in wrapper)
 if __name__ == "__main__":
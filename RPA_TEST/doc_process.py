@@ -1,10 +1,13 @@
 import os
 import json
 import logging
+import threading
 import traceback
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.formrecognizer import DocumentAnalysisClient
 
+from stage_metrics import metrics, stage_timer
+
 logger = logging.getLogger("AZURE_OCR")
 
 def run_azure_ocr(duser_input: dict, record: dict) -> dict:
@@ -39,22 +42,28 @@ def run_azure_ocr(duser_input: dict, record: dict) -> dict:
 
         # OCR 호출
         with open(file_path, "rb") as f:
-            poller = client.begin_analyze_document("prebuilt-receipt", document=f)
-            result = poller.result()
+            with stage_timer("ocr_submit"):
+                poller = client.begin_analyze_document("prebuilt-receipt", document=f)
+            with stage_timer("ocr_poll"):
+                result = poller.result()
             result_dict = result.to_dict()
 
         # OCR 결과 저장
         base_filename = os.path.splitext(os.path.basename(file_path))[0]
         json_filename = f"{base_filename}.ocr.json"
         json_path = os.path.join(json_dir, json_filename)
-        with open(json_path, "w", encoding="utf-8") as jf:
+        # 같은 크롭(중복 크롭이 원본 OCR 전에 직접 OCR)을 동시에 저장해도 읽는 쪽이 완전한 JSON 만 보도록 임시 파일 후 교체
+        tmp_path = f"{json_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as jf:
             json.dump(result_dict, jf, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, json_path)
 
         logger.info(f"[완료] OCR 성공 및 JSON 저장: {json_path}")
         logger.info("[종료] run_azure_ocr")
         return result_dict
 
     except Exception as e:
+        metrics.incr("ocr_failed")
         logger.error(f"[ERROR] OCR 실패: {e}")
         traceback.print_exc()
 
@@ -15,6 +15,11 @@ if not app_path:
 if app_path not in sys.path:
     sys.path.append(app_path)
 
+# 저장소 루트의 공통 모듈(stage_metrics 등) 임포트 경로
+repo_root = str(script_path.parents[1])
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
 from rpa.ai.idp.util import idp_setup_env, idp_utils
 from logru import logger
 
@@ -28,6 +33,7 @@ import logging
 import os
 import re
 import json
+import threading
 import tomlkit
 from datetime import datetime 
 
@@ -35,6 +41,15 @@ from db_master import query_data_by_date, insert_postprocessed_result
 from pre_pre_process import run_pre_pre_process    # Integrated pre-processing + YOLO
 from doc_process import run_azure_ocr
 from post_process import post_process_and_save
+from stage_metrics import metrics
+from mem_profile import MemoryProfiler
+from replay import save_idp_manifest, load_replay_items, replay_worker
+from priority_scheduler import PriorityScheduler, PRIORITY_CLASSES, classify_item, estimate_cost
+from task_graph import TaskGraph
+from image_dedup import DedupIndex, reuse_duplicate_ocr, mark_ocr_result
+from orientation import OrientationCache
+from quality_gate import REJECT_CODE, gate_crop, quality_options_from, quality_summary, reject_result
+from image_decode import decode_savings
 from typing import Optional
 
 #
@@ -161,6 +176,130 @@ def write_fail_and_insert(duser_input: dict,
     except Exception as e:
         logger.error("error")    
 
+#
+#
+def write_pre_process_fail(record: dict, duser_input: dict):
+    """
+    전처리(다운로드/크롭) 결과가 없는 레코드의 실패 요약 저장 및 DB 입력
+    """
+    for key, r_idx, c_yn in [("ATTACH_FILE", 1, "N"), ("FILE_PATH",1,"Y")]:
+        url = record.get(key)
+        if not url:
+            continue
+        write_fail_and_insert(
+        	duser_input=duser_input,
+            base={"FIID":record.get("FIID"),
+            "LINE_INDEX":record.get("LINE_INDEX"),
+            "GUBUN":record.get("GUBUN"),
+            "COMMON_YN":c_yn,
+            "RECEIPT_INDEX":r_idx},
+            code="500",
+            message="전처리 단계 실패",
+            attach_file=url,
+            receipt_index=r_idx
+            )
+        return
+
+#
+#
+def process_cropped(record: dict, cropped: dict, duser_input: dict) -> dict:
+    """
+    크롭 이미지 1건에 대해 OCR → 후처리까지 실행합니다. (DB 저장은 호출측에서 레코드 단위로 수행)
+    YOLO 단계 오류 아이템은 실패 요약을 바로 저장/입력합니다.
+    OCR 전 품질 판정(quality_gate, 기본 True)에서 저해상도 / 저대비 / 흐림은 보정 이미지로 OCR 하고,
+    quality_gate_reject=True 이면 빈 / 심한 흐림 크롭은 Azure 호출 없이 E004 로 저장합니다. (기준값 : quality_<QUALITY_DEFAULTS 키>)
+
+    입력:
+    - record (dict): 크롭의 원본 레코드
+    - cropped (dict): run_pre_pre_process() 결과 아이템 1건
+    - duser_input (dict): 파이프라인 설정
+
+    출력:
+    - dict: {"result_path": DB 에 입력할 후처리/오류 JSON 경로 또는 None, "item": OCR 성공 아이템 또는 None}
+    """
+    result = {"result_path": None, "item": None}
+    if "RESULT_CODE" in cropped:
+        logger.warning(f"[SKIP] YOLO 오류 발생: {cropped}")
+        write_fail_and_insert(
+        	duser_input=duser_input,
+            base={"FIID":cropped.get("FIID"),
+            "LINE_INDEX":cropped.get("LINE_INDEX"),
+            "GUBUN":cropped.get("GUBUN"),
+            "COMMON_YN":cropped.get("COMMON_YN"),
+            "RECEIPT_INDEX":cropped.get("RECEIPT_INDEX")},
+            code=cropped.get("RESULT_CODE", 500),
+            message=cropped.get("RESULT_MESSAGE", "YOLO 단계 오류"),
+            attach_file=cropped.get("source_url"),
+            receipt_index=cropped.get("RECEIPT_INDEX")
+        )
+        return result
+
+    # 후처리 JSON 경로 구성
+    json_path = os.path.join(
+        duser_input["idp_azure_dir"],
+        f"{os.path.splitext(os.path.basename(cropped['file_path']))[0]}.ocr.json"
+    )
+
+    # 중복 크롭(DUPLICATE_OF)은 원본 OCR 결과 재사용 (Azure 호출 생략)
+    reused_json_path = reuse_duplicate_ocr(duser_input, cropped, json_path)
+    if reused_json_path:
+        json_path = reused_json_path
+        ocr_result = {}
+    else:
+        # OCR 실행 ✅ 수정 코드:
+        ocr_ok = False
+        try:
+            # 흐리거나 작은 크롭은 Azure 호출 없이 실패 처리, 보정 가능한 크롭은 보정 이미지로 OCR
+            quality_options = quality_options_from(duser_input)
+            gate = gate_crop(cropped, quality_options) if quality_options is not None else None
+            if gate is not None and gate["decision"] == "reject":
+                ocr_result = reject_result(cropped, gate)
+            else:
+                ocr_input = {**cropped, "file_path": gate["file_path"]} if gate is not None else cropped
+                ocr_result = run_azure_ocr(duser_input, ocr_input)
+                ocr_ok = ocr_result.get("RESULT_CODE") != "AZURE_ERR"
+        finally:
+            mark_ocr_result(duser_input, cropped, ocr_ok, json_path)
+    if ocr_result.get("RESULT_CODE") in ("AZURE_ERR", REJECT_CODE):
+        logger.warning(f"[ERROR] Azure OCR 실패 / 품질 미달 → 오류 summary 저장 시도")
+
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        error_summary = {
+            "FIID": cropped.get("FIID"),
+            "LINE_INDEX": cropped.get("LINE_INDEX"),
+            "RECEIPT_INDEX": cropped.get("RECEIPT_INDEX"),
+            "COMMON_YN": cropped.get("COMMON_YN"),
+            "GUBUN": cropped.get("GUBUN"),
+            "ATTACH_FILE": record.get("ATTACH_FILE"),
+            "COUNTRY": None, "RECEIPT_TYPE": None, "MERCHANT_NAME": None, "MERCHANT_PHONE_NO": None,
+            "DELIVERY_ADDR": None, "TRANSACTION_DATE": None, "TRANSACTION_TIME": None,
+            "TOTAL_AMOUNT": None, "SUMTOTAL_AMOUNT": None, "TAX_AMOUNT": None, "BIZ_NO": None,
+            "RESULT_CODE": ocr_result.get("RESULT_CODE"),
+            "RESULT_MESSAGE": ocr_result.get("RESULT_MESSAGE"),
+            "CREATE_DATE": now_str,
+            "UPDATE_DATE": now_str
+        }
+
+        error_result_path = os.path.join(
+            duser_input["post_json_dir"],
+            f"fail_{error_summary['FIID']}_{error_summary['LINE_INDEX']}_{error_summary['RECEIPT_INDEX']}_post.json"
+        )
+        with open(error_result_path, "w", encoding="utf-8") as f:
+            json.dump({"summary": error_summary, "items": []}, f, ensure_ascii=False, indent=2)
+
+        result["result_path"] = error_result_path
+        return result
+
+    # 후처리 실행
+    post_json_path = post_process_and_save(
+        {**duser_input, "idp_postprocess_dir": duser_input["idp_postprocess_dir"]},
+        {**cropped, "json_path": json_path, "ATTACH_FILE": cropped.get("source_url")}
+    )
+
+    result["result_path"] = post_json_path
+    result["item"] = {**cropped, "json_path": json_path, "ATTACH_FILE": cropped.get("source_url")}
+    return result
+
 #
 #
 def execute_worker(record: dict, duser_input: dict):
@@ -173,100 +312,34 @@ def execute_worker(record: dict, duser_input: dict):
     - duser_input (dict): 파이프라인 실행에 필요한 설정 정보가 담긴 딕셔너리 (DB 연결, 경로, Azure OCR 키 등).
 
     출력:
-    - None: 처리는 부수 효과(파일 저장, DB 입력)로 이루어지며, 함수 자체는 값을 반환하지 않습니다. (오류 발생 시 내부적으로 로그를 기록합니다)
+    - list: OCR 까지 성공한 크롭 아이템 리스트 (재생 모드 매니페스트용, json_path 포함). 처리는 부수 효과(파일 저장, DB 입력)로 이루어집니다. (오류 발생 시 내부적으로 로그를 기록합니다)
     """
     logger.info(f"[시작] process_single_record - FIID={record.get('FIID')}, LINE_INDEX={record.get('LINE_INDEX')}")
+    processed_items = []
     try:
      #  #전처리 단계 실행 (다운로드 + 크롭)
         cropped_list = run_pre_pre_process(duser_input, record)
 
 		# 전처리 단계 실패
         if not cropped_list:
-            for key, r_idx, c_yn in [("ATTACH_FILE", 1, "N"), ("FILE_PATH",1,"Y")]:
-                url = record.get(key)
-                if not url:
-                    continue
-                write_fail_and_insert(
-                	duser_input=duser_input,
-                    base={"FIID":record.get("FIID"),
-                    "LINE_INDEX":record.get("LINE_INDEX"),
-                    "GUBUN":record.get("GUBUN"),
-                    "COMMON_YN":c_yn,
-                    "RECEIPT_INDEX":r_idx},
-                    code="500",
-                    message="전처리 단계 실패",
-                    attach_file=url,
-                    receipt_index=r_idx
-                    )
-                return
+            write_pre_process_fail(record, duser_input)
+            return processed_items
 
         for cropped in cropped_list:
-            if "RESULT_CODE" in cropped:
-                logger.warning(f"[SKIP] YOLO 오류 발생: {cropped}")
-                write_fail_and_insert(
-                	duser_input=duser_input,
-                    base={"FIID":cropped.get("FIID"),
-                    "LINE_INDEX":cropped.get("LINE_INDEX"),
-                    "GUBUN":cropped.get("GUBUN"),
-                    "COMMON_YN":cropped.get("COMMON_YN"),
-                    "RECEIPT_INDEX":cropped.get("RECEIPT_INDEX")},
-                    code=cropped.get("RESULT_CODE", 500),
-                    message=cropped.get("RESULT_MESSAGE", "YOLO 단계 오류"),
-                    attach_file=cropped.get("source_url"),
-                    receipt_index=cropped.get("RECEIPT_INDEX")
-                )
-                continue
+            result = process_cropped(record, cropped, duser_input)
+            if result["item"]:
+                processed_items.append(result["item"])
 
-            # OCR 실행 ✅ 수정 코드:
-            ocr_result = run_azure_ocr(duser_input, cropped)
-            if ocr_result.get("RESULT_CODE") == "AZURE_ERR":
-                logger.warning(f"[ERROR] Azure OCR 실패 → 오류 summary 저장 시도")
-
-                now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                error_summary = {
-                    "FIID": cropped.get("FIID"),
-                    "LINE_INDEX": cropped.get("LINE_INDEX"),
-                    "RECEIPT_INDEX": cropped.get("RECEIPT_INDEX"),
-                    "COMMON_YN": cropped.get("COMMON_YN"),
-                    "GUBUN": cropped.get("GUBUN"),
-                    "ATTACH_FILE": record.get("ATTACH_FILE"),
-                    "COUNTRY": None, "RECEIPT_TYPE": None, "MERCHANT_NAME": None, "MERCHANT_PHONE_NO": None,
-                    "DELIVERY_ADDR": None, "TRANSACTION_DATE": None, "TRANSACTION_TIME": None,
-                    "TOTAL_AMOUNT": None, "SUMTOTAL_AMOUNT": None, "TAX_AMOUNT": None, "BIZ_NO": None,
-                    "RESULT_CODE": ocr_result.get("RESULT_CODE"),
-                    "RESULT_MESSAGE": ocr_result.get("RESULT_MESSAGE"),
-                    "CREATE_DATE": now_str,
-                    "UPDATE_DATE": now_str
-                }
-
-                error_result_path = os.path.join(
-                    duser_input["post_json_dir"],
-                    f"fail_{error_summary['FIID']}_{error_summary['LINE_INDEX']}_{error_summary['RECEIPT_INDEX']}_post.json"
-                )
-                with open(error_result_path, "w", encoding="utf-8") as f:
-                    json.dump({"summary": error_summary, "items": []}, f, ensure_ascii=False, indent=2)
-
-                insert_postprocessed_result(error_result_path, duser_input)
-                continue
-
-            # 후처리 JSON 경로 구성
-            json_path = os.path.join(
-                duser_input["idp_azure_dir"],
-                f"{os.path.splitext(os.path.basename(cropped['file_path']))[0]}.ocr.json"
-            )
-
-            # 후처리 실행
-            post_json_path = post_process_and_save(
-                {**duser_input, "idp_postprocess_dir": duser_input["idp_postprocess_dir"]},
-                {**cropped, "json_path": json_path, "ATTACH_FILE": cropped.get("source_url")}
-            )
-
-            # DB 저장
-            insert_postprocessed_result(post_json_path, duser_input)
+            # DB 저장 (입력 결과 코드는 매니페스트에 남겨 재생 모드에서 성공 아이템 제외)
+            if result["result_path"]:
+                db_result_code = insert_postprocessed_result(result["result_path"], duser_input)
+                if result["item"]:
+                    result["item"]["DB_RESULT_CODE"] = db_result_code
 
     except Exception as e:
         logger.error(f"[FATAL] 처리 중 오류 발생 - FIID={record.get('FIID')}: {e}", exc_info=True)
     logger.info(f"[종료] process_single_record - FIID={record.get('FIID')}, LINE_INDEX={record.get('LINE_INDEX')}")
+    return processed_items
 
 #
 #
@@ -275,6 +348,94 @@ def _adapter_excute_worker(params:dict):
     duser_input = params["duser_input"]
     retrun execute_worker(record, duser_input)
 
+#
+#
+def _graph_ocr_task(record: dict, cropped: dict, duser_input: dict) -> dict:
+    # 크롭 1건 실패가 같은 레코드의 집계(DB 저장)를 막지 않도록 예외를 결과로 변환
+    try:
+        return process_cropped(record, cropped, duser_input)
+    except Exception as e:
+        logger.error(f"[ERROR] 크롭 처리 실패 - FIID={record.get('FIID')}, file={cropped.get('file_path')}: {e}", exc_info=True)
+        return {"result_path": None, "item": None}
+
+#
+#
+def _graph_record_join(record: dict, ocr_tasks: list, duser_input: dict) -> list:
+    # 레코드의 모든 크롭 OCR 완료 후 크롭 순서대로 DB 저장
+    processed_items = []
+    for task in ocr_tasks:
+        result = task.result or {}
+        if result.get("item"):
+            processed_items.append(result["item"])
+        if result.get("result_path"):
+            db_result_code = insert_postprocessed_result(result["result_path"], duser_input)
+            if result.get("item"):
+                result["item"]["DB_RESULT_CODE"] = db_result_code
+    logger.info(f"[종료] 레코드 집계 - FIID={record.get('FIID')}, LINE_INDEX={record.get('LINE_INDEX')}, 크롭 {len(ocr_tasks)}건")
+    return processed_items
+
+#
+#
+def _graph_record_task(graph: TaskGraph, record: dict, duser_input: dict, ocr_by_path: dict, ocr_lock):
+    """
+    레코드 전처리 후 크롭마다 OCR 작업을 만들고, 전체 OCR 작업에 의존하는 집계 작업을 추가합니다.
+    (크롭 OCR 작업은 유휴 워커가 가져가 병렬 실행)
+    중복 크롭(DUPLICATE_OF)의 OCR 작업은 원본 크롭의 OCR 작업을 선행 작업으로 연결하여 워커를 대기시키지 않습니다.
+    (원본 OCR 작업이 아직 없으면 대기 없이 직접 OCR : 같은 OCR JSON / 보정 이미지는 임시 파일 후 교체로 저장하여
+     원본 작업과 동시에 써도 읽는 쪽은 완전한 파일만 봄)
+    """
+    logger.info(f"[시작] 레코드 전처리 - FIID={record.get('FIID')}, LINE_INDEX={record.get('LINE_INDEX')}")
+    cropped_list = run_pre_pre_process(duser_input, record)
+    if not cropped_list:
+        write_pre_process_fail(record, duser_input)
+        return None
+
+    ocr_tasks = []
+    for cropped in cropped_list:
+        file_path = cropped.get("file_path")
+        with ocr_lock:
+            original = ocr_by_path.get(file_path) if cropped.get("DUPLICATE_OF") else None
+            task = graph.submit(_graph_ocr_task, record, cropped, duser_input,
+                                deps=[original] if original else (), name="ocr_crop")
+            if file_path and original is None:
+                ocr_by_path.setdefault(file_path, task)
+        ocr_tasks.append(task)
+    return graph.submit(_graph_record_join, record, ocr_tasks, duser_input, deps=ocr_tasks, name="record_join")
+
+#
+#
+def run_record_graph(data_records: list, duser_input: dict) -> list:
+    """
+    레코드 전체를 작업 그래프로 실행합니다. (전처리 → 크롭별 OCR/후처리 → 레코드별 DB 저장)
+    레코드 전처리 작업은 ATTACH_FILE 단건 우선, 추정 비용이 작은 순으로 투입합니다.
+
+    입력:
+    - data_records (list): query_data_by_date() 결과
+    - duser_input (dict): 파이프라인 설정 (graph_max_workers : 워커 수, 기본값 8)
+        중복 크롭은 원본 OCR 작업에 의존 작업으로 연결하므로 dedup_ocr_wait_sec 대기를 사용하지 않습니다.
+
+    출력:
+    - list: 레코드별 OCR 성공 크롭 아이템 리스트 (입력 순서)
+    """
+    graph = TaskGraph(max_workers=duser_input.get("graph_max_workers", 8))
+    graph_input = {**duser_input, "dedup_ocr_wait_sec": 0}
+    ocr_by_path, ocr_lock = {}, threading.Lock()      # 크롭 file_path → 원본 OCR 작업
+    order = sorted(
+        range(len(data_records)),
+        key=lambda i: (PRIORITY_CLASSES.index(classify_item(data_records[i])), estimate_cost(data_records[i])),
+    )
+    record_tasks = {
+        i: graph.submit(_graph_record_task, graph, data_records[i], graph_input, ocr_by_path, ocr_lock, name="record_pre")
+        for i in order
+    }
+    graph.run()
+
+    results = []
+    for i in range(len(data_records)):
+        join = record_tasks[i].result
+        results.append(join.result if join is not None and join.result else [])
+    return results
+
 #
 #
 def das_process_setup(duser_input:dict) -> dict:
@@ -328,6 +489,7 @@ def execute(duser_input: dict):
 
     입력:
     - duser_input (dict): 파이프라인 설정 및 DB 연결 정보를 담은 딕셔너리. (sqlalchemy_conn, target_date 등과 OCR/YOLO 관련 설정 포함)
+      profile_memory=True 이면 단계별 메모리 프로파일 리포트(memory_report.txt/json)를 메트릭 폴더에 저장합니다.
 
     출력:
     - None: 처리 완료 후 함수는 아무 값도 반환하지 않습니다. (과정 중 로그로 진행 상황을 기록합니다)
@@ -336,10 +498,27 @@ def execute(duser_input: dict):
     
     duser_input = {**duser_input,**working_paths}
     duser_input = das_process_setup(duser_input)
-    
-    data_records = query_data_by_date(duser_input)
+    metrics_dir = duser_input.get("idp_metrics_dir") or os.path.dirname(duser_input["idp_log_file_path"])
+
+    profiler = MemoryProfiler(enabled=bool(duser_input.get("profile_memory")))
+    profiler.start()
+    # 지연 시간 메트릭과 같은 단계(download, yolo_crop, ocr_poll, postprocess, db_insert 등)별로 메모리 증가량 분리
+    if profiler.enabled:
+        metrics.add_observer(profiler.stage)
+
+    # 배치 단위 이미지 중복 인덱스 (dedup_index_path 지정 시 날짜를 넘어 유지)
+    dedup_index = DedupIndex.from_config(duser_input) if duser_input.get("dedup", True) else None
+    duser_input["dedup_index"] = dedup_index
+    # 이미지 해시별 방향 보정 값 캐시 (orientation_cache_path 지정 시 날짜를 넘어 유지)
+    orientation_cache = OrientationCache.from_config(duser_input)
+    duser_input["orientation_cache"] = orientation_cache
+
+    with profiler.stage("query_data"):
+        data_records = query_data_by_date(duser_input)
     if not data_records:
         logger.info("📭 처리할 데이터가 없습니다.")
+        metrics.remove_observer(profiler.stage)
+        profiler.stop()
         return
 
     logger.info(f"총 {len(data_records)}건 처리 시작")
@@ -349,14 +528,88 @@ def execute(duser_input: dict):
         for rec in data_records
     ]
     
-    idp_utils.run_in_multi_thread(
-    	target_func=adapter_excute_worker,
-        func_params_list=func_params_list,
-    )
+    # 레코드 처리 전체 구간 (단계별 내역은 위에서 등록한 stage_metrics 관찰자가 기록)
+    # 기본은 작업 그래프 (크롭별 OCR 작업을 유휴 워커가 나눠 실행), task_graph=False 이면 레코드 단위 스케줄러
+    with profiler.stage("process_records"):
+        if duser_input.get("task_graph", True):
+            results = run_record_graph(data_records, duser_input)
+        else:
+            # ATTACH_FILE 단건 → FILE_PATH 문서 순, 같은 클래스는 추정 비용이 작은 순으로 실행
+            results = PriorityScheduler.from_config(duser_input).run(
+                adapter_excute_worker,
+                func_params_list,
+                item_key="record",
+            )
+
+    # 재생 모드(execute_replay) 입력 매니페스트 저장
+    processed_items = [item for items in results or [] for item in (items or [])]
+    save_idp_manifest(processed_items, duser_input["idp_azure_dir"], duser_input.get("replay_manifest_path"))
+
+    if dedup_index is not None:
+        dedup_index.save()
+    orientation_cache.save()
     
+    # 스테이지별 지연 시간 요약 (JSON + Prometheus 텍스트)
+    metrics.log_summary(logger)
+    logger.info(f"[메트릭] 품질 판정: {quality_summary()}")
+    logger.info(f"[메트릭] 축소 디코딩 절감: {decode_savings()}")
+    metrics.export(metrics_dir)
+
+    metrics.remove_observer(profiler.stage)
+    profiler.stop()
+    report_paths = profiler.write_report(metrics_dir)
+    if report_paths:
+        logger.info(f"[메모리] 프로파일 리포트 저장: {report_paths[1]}")
+
     logger.info("✅ 전체 파이프라인 완료")
     logger.info("[종료] run_wrapper")
 
+#
+#
+def _adapter_replay_worker(params: dict):
+    return replay_worker(params["idp_item"], params["duser_input"])
+
+#
+#
+def execute_replay(duser_input: dict) -> dict:
+    """
+    재생 모드: 저장된 OCR JSON(*.ocr.json)과 idp_items 매니페스트로 후처리 → DB 저장만 병렬 실행합니다.
+    전처리(다운로드/YOLO)와 Azure OCR 을 건너뛰므로 후처리 규칙 변경 후 과거 데이터를 빠르게 재처리할 수 있습니다.
+
+    입력:
+    - duser_input (dict): execute 와 동일한 설정 + 아래 재생 설정
+        - replay_manifest_path (str): 매니페스트 경로 (기본값 : idp_azure_dir/idp_items.json)
+        - replay_ocr_json_dir (str): OCR JSON 폴더를 옮긴 경우 새 위치 (선택)
+        - replay_all (bool): True 이면 DB 저장까지 성공한 아이템도 다시 처리 (기본값 : False, 기존 행은 삭제 후 재입력)
+
+    출력:
+    - dict: {"total": 전체 건수, "failed": 실패 건수}
+    """
+    logger.info("[시작] execute_replay")
+
+    duser_input = {**duser_input, **working_paths}
+    duser_input = das_process_setup(duser_input)
+
+    manifest_path = duser_input.get("replay_manifest_path") or os.path.join(duser_input["idp_azure_dir"], "idp_items.json")
+    idp_items = load_replay_items(manifest_path, duser_input.get("replay_ocr_json_dir"),
+                                  include_succeeded=duser_input.get("replay_all", False))
+    if not idp_items:
+        logger.info("📭 재생할 아이템이 없습니다.")
+        return {"total": 0, "failed": 0}
+
+    replay_input = {**duser_input, "postprocess_output_dir": duser_input["idp_postprocess_dir"]}
+    results = idp_utils.run_in_multi_thread(
+        target_func=_adapter_replay_worker,
+        func_params_list=[{"idp_item": item, "duser_input": replay_input} for item in idp_items],
+    )
+
+    failed = sum(1 for r in results or [] if r.get("has_error"))
+    metrics.log_summary(logger)
+    metrics.export(duser_input.get("idp_metrics_dir") or os.path.dirname(duser_input["idp_log_file_path"]), prefix="stage_metrics_replay")
+    logger.info(f"✅ 재생 완료: {len(idp_items)}건 (실패 {failed}건)")
+    logger.info("[종료] execute_replay")
+    return {"total": len(idp_items), "failed": failed}
+
 if __name__ == "__main__":
 	duser_input = {
     	"SystemName" : "DAS01",
@@ -0,0 +1,343 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from stage_metrics import metrics, timed
+
+logger = logging.getLogger("IMAGE_DEDUP")
+
+HASH_SIZE = 16                 # dHash 격자 (16x16 = 256 bit, 영수증처럼 글자가 많은 이미지는 8x8 로는 구분력이 부족)
+# 유사 중복 판정 해밍 거리 상한 (0 이면 완전 일치만 중복 처리)
+# 금액 한 줄만 바뀐 영수증도 거리 5 안팎으로 나와 (재촬영 사진은 10~15) 기본값은 완전 일치만 사용.
+# 유사 중복 재사용은 dedup_max_distance 로 명시적으로 켜야 합니다.
+# 같은 영수증을 ATTACH_FILE 사진과 FILE_PATH 문서 페이지로 함께 올린 경우는 기본값으로는 중복 처리되지 않음
+# (페이지 중복은 같은 파일 유형끼리만 비교하고, 문서에서 잘라낸 크롭은 사진 크롭과 바이트가 달라 완전 일치가 아님.
+#  크롭 비교는 파일 유형과 무관하므로 dedup_max_distance 를 켜면 유사 크롭으로 잡힐 수 있음)
+DEFAULT_MAX_DISTANCE = 0
+ASPECT_TOLERANCE = 0.05        # 유사 중복 판정 시 허용하는 가로세로비 차이
+DEFAULT_MAX_AGE_DAYS = 30      # 파일로 유지하는 인덱스 보관 기간
+DEFAULT_OCR_WAIT_SEC = 120     # 원본 OCR 완료 대기 시간 (초과 시 중복 아이템도 직접 OCR, 작업 그래프는 대기 없이 의존 작업으로 연결)
+
+
+def file_sha256(path: str) -> str:
+    """파일 바이트 SHA-256 (완전 중복 판정용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dhash(img: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """
+    difference hash (인접 픽셀 밝기 비교, 재압축/리사이즈/약간의 밝기 변화에 강함)
+
+    Returns:
+        int: hash_size * hash_size bit 정수
+    """
+    small = img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR, reducing_gap=2.0)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+@timed("dedup_hash")
+def image_fingerprint(path: str, img: Image.Image = None) -> dict:
+    """
+    이미지 지문 (sha256 + dhash + 가로세로비)
+
+    입력:
+    - path (str): 이미지 파일 경로
+    - img (PIL.Image.Image): 이미 열린 이미지 (없으면 path 로 열기)
+    """
+    if img is None:
+        with Image.open(path) as opened:
+            return image_fingerprint.__wrapped__(path, opened)
+    width, height = img.size
+    return {
+        "sha256": file_sha256(path),
+        "dhash": dhash(img),
+        "aspect": round(width / height, 4) if height else 0.0,
+    }
+
+
+class DedupIndex:
+    """
+    배치 단위 이미지 중복 인덱스 (변환 페이지 / 크롭 이미지)
+
+    - 페이지 중복 : 같은 파일 유형(ATTACH_FILE/FILE_PATH)의 이전 페이지 크롭 결과를 재사용 (YOLO 생략)
+    - 크롭 중복   : 이전 크롭의 OCR 결과 JSON 을 재사용 (Azure 호출 생략)
+    - persist_path 를 지정하면 JSON 파일로 저장/로드하여 날짜를 넘어 중복을 판정합니다.
+      (이전 날짜 크롭 파일이 정리되어 없으면 중복으로 보지 않고 새 크롭으로 교체)
+
+    사용 예:
+        index = DedupIndex.from_config(duser_input)
+        duser_input["dedup_index"] = index      # run_pre_pre_process / process_cropped 에서 사용
+        ...
+        index.save()
+    """
+
+    def __init__(self, persist_path: str = None, max_distance: int = DEFAULT_MAX_DISTANCE,
+                 max_age_days: int = DEFAULT_MAX_AGE_DAYS):
+        self.persist_path = persist_path
+        self.max_distance = max_distance
+        self.max_age_days = max_age_days
+        self.pages = []
+        self.crops = []
+        self._exact = {}             # (kind, sha256) -> entry
+        self._crop_by_path = {}      # 크롭 file_path -> entry
+        self._ocr_events = {}        # 크롭 file_path -> (Event, 결과 dict)
+        self._lock = threading.Lock()
+        if persist_path and os.path.exists(persist_path):
+            self.load()
+
+    @classmethod
+    def from_config(cls, duser_input: dict):
+        """duser_input 의 dedup_index_path / dedup_max_distance / dedup_max_age_days 설정 사용"""
+        return cls(
+            persist_path=duser_input.get("dedup_index_path"),
+            max_distance=duser_input.get("dedup_max_distance", DEFAULT_MAX_DISTANCE),
+            max_age_days=duser_input.get("dedup_max_age_days", DEFAULT_MAX_AGE_DAYS),
+        )
+
+    # ---------------------------------------------
+    # 조회 / 등록
+    # ---------------------------------------------
+    def _match(self, kind, entries, fingerprint, extra=None):
+        exact = self._exact.get((kind, fingerprint["sha256"]))
+        if exact is not None and (extra is None or extra(exact)):
+            return exact
+        if self.max_distance <= 0:
+            return None
+        best, best_distance = None, self.max_distance + 1
+        for entry in entries:
+            if extra is not None and not extra(entry):
+                continue
+            if abs(entry["aspect"] - fingerprint["aspect"]) > ASPECT_TOLERANCE * max(entry["aspect"], 1e-6):
+                continue
+            distance = (entry["dhash"] ^ fingerprint["dhash"]).bit_count()
+            if distance < best_distance:
+                best, best_distance = entry, distance
+        return best
+
+    def _drop(self, kind, entries, entry):
+        entries.remove(entry)
+        if self._exact.get((kind, entry["sha256"])) is entry:
+            del self._exact[(kind, entry["sha256"])]
+        if kind == "crop" and self._crop_by_path.get(entry["file_path"]) is entry:
+            del self._crop_by_path[entry["file_path"]]
+
+    def _add(self, kind, entries, entry):
+        entry.setdefault("date", datetime.now().strftime("%Y-%m-%d"))
+        entries.append(entry)
+        self._exact.setdefault((kind, entry["sha256"]), entry)
+        if kind == "crop":
+            self._crop_by_path[entry["file_path"]] = entry
+
+    def find_page(self, fingerprint: dict, file_type: str):
+        """같은 파일 유형의 크롭 결과(크롭 파일이 남아 있는)가 있는 중복 페이지 항목 (없으면 None)"""
+        def reusable(entry):
+            return (entry["file_type"] == file_type and entry["crops"]
+                    and all(os.path.exists(c["file_path"]) for c in entry["crops"]))
+
+        with self._lock:
+            page = self._match("page", self.pages, fingerprint, reusable)
+        if page is not None:
+            metrics.incr("dedup_page_hit")
+        return page
+
+    def add_page(self, fingerprint: dict, file_type: str, record: dict, crops: list):
+        """
+        페이지와 크롭 결과 등록 (크롭 결과는 식별자를 제외한 file_path / RECEIPT_INDEX 만 보관)
+        """
+        with self._lock:
+            self._add("page", self.pages, {
+                **fingerprint,
+                "file_type": file_type,
+                "FIID": record.get("FIID"),
+                "LINE_INDEX": record.get("LINE_INDEX"),
+                "crops": [
+                    {"file_path": c.get("file_path"), "RECEIPT_INDEX": c.get("RECEIPT_INDEX")}
+                    for c in crops if c.get("file_path")
+                ],
+            })
+
+    def find_or_add_crop(self, fingerprint: dict, cropped: dict):
+        """
+        중복 크롭이면 원본 항목 반환, 아니면 등록 후 None 반환 (조회와 등록을 원자적으로 수행)
+        원본 크롭 파일이 정리되어 없으면 원본 항목을 지우고 이 크롭을 새 원본으로 등록합니다.
+        """
+        with self._lock:
+            original = self._match("crop", self.crops, fingerprint)
+            if original is not None and not os.path.exists(original["file_path"]):
+                logger.info(f"[DEDUP] 원본 크롭 파일 없음 → 새 원본으로 교체: {original['file_path']}")
+                self._drop("crop", self.crops, original)
+                original = None
+            if original is None or original["file_path"] == cropped.get("file_path"):
+                if original is None:
+                    self._add("crop", self.crops, {
+                        **fingerprint,
+                        "file_path": cropped.get("file_path"),
+                        "FIID": cropped.get("FIID"),
+                        "LINE_INDEX": cropped.get("LINE_INDEX"),
+                        "RECEIPT_INDEX": cropped.get("RECEIPT_INDEX"),
+                    })
+                return None
+        metrics.incr("dedup_crop_hit")
+        return original
+
+    # ---------------------------------------------
+    # 원본 OCR 완료 대기 (중복 크롭이 원본 OCR 결과를 재사용)
+    # ---------------------------------------------
+    def _ocr_event(self, file_path):
+        with self._lock:
+            if file_path not in self._ocr_events:
+                self._ocr_events[file_path] = (threading.Event(), {})
+            return self._ocr_events[file_path]
+
+    def mark_ocr_done(self, file_path: str, ok: bool, json_path: str = None):
+        """원본 크롭 OCR 완료 기록 (성공 시 OCR JSON 경로를 인덱스에 보관 → 이후 날짜에서도 재사용)"""
+        with self._lock:
+            entry = self._crop_by_path.get(file_path)
+            if entry is not None and ok and json_path:
+                entry["json_path"] = json_path
+        event, state = self._ocr_event(file_path)
+        state["ok"] = ok
+        event.set()
+
+    def ocr_json_path(self, file_path: str):
+        """원본 크롭의 OCR JSON 경로 (아직 OCR 전이면 None)"""
+        with self._lock:
+            entry = self._crop_by_path.get(file_path)
+            return entry.get("json_path") if entry else None
+
+    def wait_ocr(self, file_path: str, json_path: str, timeout: float = DEFAULT_OCR_WAIT_SEC) -> bool:
+        """
+        원본 크롭의 OCR JSON 사용 가능 여부 (이미 파일이 있으면 바로 True, 진행 중이면 완료까지 대기)
+        timeout 이 0 이면 대기하지 않고 현재 완료 여부만 확인합니다. (작업 그래프에서 원본 OCR 작업에 의존하는 경우)
+        """
+        if os.path.exists(json_path):
+            return True
+        with self._lock:
+            entry = self._crop_by_path.get(file_path)
+        if entry is None or entry["date"] != datetime.now().strftime("%Y-%m-%d"):
+            return False    # 이전 날짜 원본인데 OCR JSON 이 없으면 대기하지 않음
+        event, state = self._ocr_event(file_path)
+        if not event.wait(timeout):
+            if timeout > 0:
+                logger.warning(f"[DEDUP] 원본 OCR 대기 시간 초과: {file_path}")
+            return False
+        return bool(state.get("ok")) and os.path.exists(json_path)
+
+    # ---------------------------------------------
+    # 파일 저장 / 로드
+    # ---------------------------------------------
+    def load(self):
+        with open(self.persist_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).strftime("%Y-%m-%d")
+        with self._lock:
+            for kind, entries in (("page", self.pages), ("crop", self.crops)):
+                for entry in data.get(f"{kind}s", []):
+                    if entry.get("date", "") < cutoff:
+                        continue
+                    entry["dhash"] = int(entry["dhash"], 16)
+                    self._add(kind, entries, entry)
+        logger.info(f"[DEDUP] 인덱스 로드: 페이지 {len(self.pages)}건, 크롭 {len(self.crops)}건 ({self.persist_path})")
+
+    def save(self):
+        """persist_path 가 있으면 인덱스 저장 (dhash 는 16진 문자열)"""
+        if not self.persist_path:
+            return None
+        with self._lock:
+            data = {
+                f"{kind}s": [{**entry, "dhash": format(entry["dhash"], "x")} for entry in entries]
+                for kind, entries in (("page", self.pages), ("crop", self.crops))
+            }
+        os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.persist_path)
+        logger.info(f"[DEDUP] 인덱스 저장: {self.persist_path}")
+        return self.persist_path
+
+
+def dedup_crops(index: DedupIndex, crops: list) -> list:
+    """
+    크롭 결과 중 이전 크롭과 중복인 항목에 DUPLICATE_OF(원본 식별자)를 표시하고 file_path 를 원본 크롭으로 교체
+    (식별자 FIID / LINE_INDEX / RECEIPT_INDEX 는 자기 값 유지)
+    """
+    for cropped in crops:
+        if not cropped.get("file_path"):
+            continue
+        original = index.find_or_add_crop(image_fingerprint(cropped["file_path"]), cropped)
+        if original is None:
+            continue
+        cropped["DUPLICATE_OF"] = {
+            "FIID": original.get("FIID"),
+            "LINE_INDEX": original.get("LINE_INDEX"),
+            "RECEIPT_INDEX": original.get("RECEIPT_INDEX"),
+            "file_path": original["file_path"],
+        }
+        cropped["file_path"] = original["file_path"]
+    return crops
+
+
+def reuse_page_crops(page: dict, base: dict) -> list:
+    """
+    중복 페이지의 크롭 결과를 자기 식별자로 복제 (YOLO 생략)
+
+    입력:
+    - page (dict): DedupIndex.find_page() 결과
+    - base (dict): FIID, LINE_INDEX, GUBUN, COMMON_YN, RECEIPT_INDEX(ATTACH_FILE 인 경우) 식별자
+    """
+    crops = []
+    for crop in page["crops"]:
+        crops.append({
+            **base,
+            "RECEIPT_INDEX": base.get("RECEIPT_INDEX") or crop.get("RECEIPT_INDEX"),
+            "file_path": crop["file_path"],
+            "DUPLICATE_OF": {
+                "FIID": page.get("FIID"),
+                "LINE_INDEX": page.get("LINE_INDEX"),
+                "RECEIPT_INDEX": crop.get("RECEIPT_INDEX"),
+                "file_path": crop["file_path"],
+            },
+        })
+    logger.info(f"[DEDUP] 중복 페이지 → YOLO 생략, 크롭 {len(crops)}건 재사용 (원본 FIID={page.get('FIID')})")
+    return crops
+
+
+def reuse_duplicate_ocr(duser_input: dict, cropped: dict, json_path: str):
+    """
+    중복 크롭(DUPLICATE_OF)이면 원본 OCR 완료를 기다린 뒤 재사용할 OCR JSON 경로 반환
+    경로가 반환되면 호출측은 Azure OCR 을 건너뛰고 해당 JSON 으로 후처리합니다. (재사용 불가 시 None)
+    대기 시간은 dedup_ocr_wait_sec (작업 그래프는 원본 OCR 작업을 선행 작업으로 연결하고 0 으로 설정)
+    """
+    index = duser_input.get("dedup_index")
+    if index is None or not cropped.get("DUPLICATE_OF"):
+        return None
+    json_path = index.ocr_json_path(cropped["file_path"]) or json_path
+    timeout = duser_input.get("dedup_ocr_wait_sec", DEFAULT_OCR_WAIT_SEC)
+    if not index.wait_ocr(cropped["file_path"], json_path, timeout):
+        return None
+    metrics.incr("dedup_ocr_skipped")
+    logger.info(f"[DEDUP] OCR 재사용: {cropped.get('FIID')}-{cropped.get('LINE_INDEX')}-{cropped.get('RECEIPT_INDEX')} ← {cropped['DUPLICATE_OF']}")
+    return json_path
+
+
+def mark_ocr_result(duser_input: dict, cropped: dict, ok: bool, json_path: str = None):
+    """원본 크롭 OCR 완료 알림 (대기 중인 중복 크롭 깨우기)"""
+    index = duser_input.get("dedup_index")
+    if index is not None and cropped.get("file_path"):
+        index.mark_ocr_done(cropped["file_path"], ok, json_path)
@@ -0,0 +1,294 @@
+import json
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from stage_metrics import metrics, timed
+from image_decode import open_reduced
+from image_dedup import file_sha256
+
+logger = logging.getLogger("ORIENTATION")
+
+# =============================================
+# 방향 보정 (EXIF 회전 + 기울기 보정)
+#   - EXIF Orientation 은 헤더만 읽음 (디코딩 없음)
+#   - 기울기는 SKEW_SIZE 썸네일의 잉크 픽셀 가로 투영(projection profile)이 가장 뾰족한 각도로 추정
+#   - 보정은 원본 해상도에서 1 회 (EXIF 회전만 있으면 transpose, 기울기가 있으면 두 변환을 합친 affine 1 회)
+# =============================================
+EXIF_ORIENTATION_TAG = 0x0112
+EXIF_TRANSPOSE = {
+    2: Image.FLIP_LEFT_RIGHT,
+    3: Image.ROTATE_180,
+    4: Image.FLIP_TOP_BOTTOM,
+    5: Image.TRANSPOSE,
+    6: Image.ROTATE_270,
+    7: Image.TRANSVERSE,
+    8: Image.ROTATE_90,
+}
+SKEW_SIZE = 512            # 기울기 추정용 썸네일 긴 변
+MAX_SKEW = 10.0            # 탐색 각도 범위 (±도)
+COARSE_STEP = 0.5          # 1 차 탐색 간격 (도)
+FINE_STEP = 0.1            # 2 차 탐색 간격 (도, 1 차 최적 각도 ±COARSE_STEP)
+# 보정 기준 : input_images 원본(0 도) 추정값 최대 |-0.8| 도(점수 배율 1.14) / 1 도 이상은 배율 1.04 이하 → 원본은 보정하지 않음
+MIN_SKEW = 1.0             # 이보다 작은 기울기는 보정하지 않음 (재샘플링 손실 > 이득, 원본 영수증 자체의 미세 기울기)
+MIN_GAIN = 1.08            # 최적 각도 투영 점수가 0 도 대비 이 배율 이상일 때만 보정 (사진 배경 등 오검출 방지)
+INK_RADIUS = 7             # 잉크 판정 주변 평균 반경 (썸네일 px, 글자 높이 정도)
+INK_MARGIN = 15            # 주변 평균보다 이 값 이상 어두우면 잉크 (어두운 배경 / 그림자 영역 전체가 잉크로 잡히지 않도록 지역 기준)
+MIN_INK_PIXELS = 200       # 잉크 픽셀이 이보다 적으면 기울기 추정 안 함
+MAX_INK_PIXELS = 20000     # 투영 계산에 쓰는 잉크 픽셀 상한 (초과 시 균등 간격 샘플링)
+FILL_COLOR = (255, 255, 255)
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def exif_orientation(path: str) -> int:
+    """EXIF Orientation 값 (1 ~ 8, 없으면 1) - 헤더만 읽음"""
+    try:
+        with Image.open(path) as img:
+            value = img.getexif().get(EXIF_ORIENTATION_TAG, 1)
+    except OSError:
+        return 1
+    return value if value in EXIF_TRANSPOSE else 1
+
+
+def _projection_scores(xs, ys, angles, height):
+    """
+    각도별 가로 투영 점수 (이미지를 angle 만큼 반시계 회전했을 때 행별 잉크 수 제곱합, 글자 줄이 수평일수록 큼)
+    """
+    radians = np.deg2rad(angles)[:, None]
+    rows = np.rint(ys * np.cos(radians) - xs * np.sin(radians)).astype(np.int64)
+    offset = height                                            # 회전 후 행 좌표 범위 ±height
+    bins = 2 * height + 1
+    index = (rows + offset + np.arange(len(angles))[:, None] * bins).ravel()
+    counts = np.bincount(index, minlength=len(angles) * bins).reshape(len(angles), bins).astype(np.float64)
+    return (counts ** 2).sum(axis=1)
+
+
+def estimate_skew(img: Image.Image) -> float:
+    """
+    기울기 추정 (Image.rotate 와 같은 반시계 방향 보정 각도, 도)
+
+    입력:
+    - img (PIL.Image.Image): EXIF 회전을 적용한 이미지 (긴 변 SKEW_SIZE 로 줄여 계산)
+
+    출력:
+    - float: 보정 각도 (추정 불가 / 기울기 작음 / 신뢰도 부족이면 0.0)
+    """
+    width, height = img.size
+    scale = SKEW_SIZE / max(width, height)
+    small = img.convert("L")
+    if scale < 1:
+        small = small.resize((max(int(width * scale), 1), max(int(height * scale), 1)), Image.BILINEAR, reducing_gap=2.0)
+    gray = np.asarray(small, dtype=np.int16)
+    local_mean = np.asarray(small.filter(ImageFilter.BoxBlur(INK_RADIUS)), dtype=np.int16)
+    ys, xs = np.nonzero(gray < local_mean - INK_MARGIN)
+    if xs.size < MIN_INK_PIXELS:
+        return 0.0
+    if xs.size > MAX_INK_PIXELS:
+        step = xs.size // MAX_INK_PIXELS + 1
+        xs, ys = xs[::step], ys[::step]
+    h, w = gray.shape
+    xs = xs - w / 2
+    ys = ys - h / 2
+    size = int(np.hypot(w, h) / 2) + 1
+
+    coarse = np.arange(-MAX_SKEW, MAX_SKEW + COARSE_STEP / 2, COARSE_STEP)
+    scores = _projection_scores(xs, ys, coarse, size)
+    best = coarse[scores.argmax()]
+    fine = np.arange(best - COARSE_STEP, best + COARSE_STEP + FINE_STEP / 2, FINE_STEP)
+    fine_scores = _projection_scores(xs, ys, fine, size)
+    angle = float(fine[fine_scores.argmax()])
+
+    base = scores[np.abs(coarse).argmin()]
+    if abs(angle) < MIN_SKEW or fine_scores.max() < base * MIN_GAIN:
+        return 0.0
+    return round(angle, 2)
+
+
+def _exif_matrix(orientation, width, height):
+    """EXIF 회전 (transpose) 의 좌표 변환 행렬 (원본 좌표 → 회전 후 좌표) 과 회전 후 크기"""
+    w, h = width, height
+    matrix = {
+        1: ((1, 0, 0), (0, 1, 0)),
+        2: ((-1, 0, w), (0, 1, 0)),
+        3: ((-1, 0, w), (0, -1, h)),
+        4: ((1, 0, 0), (0, -1, h)),
+        5: ((0, 1, 0), (1, 0, 0)),
+        6: ((0, -1, h), (1, 0, 0)),
+        7: ((0, -1, h), (-1, 0, w)),
+        8: ((0, 1, 0), (-1, 0, w)),
+    }[orientation]
+    size = (h, w) if orientation >= 5 else (w, h)
+    return np.vstack([np.array(matrix, dtype=np.float64), (0, 0, 1)]), size
+
+
+def transform_matrix(transform: dict, size: tuple) -> tuple:
+    """
+    방향 보정 전체 좌표 변환 (EXIF 회전 → 중심 기준 skew 회전, 잘리지 않도록 출력 크기 확장)
+
+    출력:
+    - tuple: (3x3 행렬 : 원본 좌표 → 보정 후 좌표, 보정 후 (width, height))
+    """
+    exif, (w, h) = _exif_matrix(transform.get("orientation", 1), *size)
+    radians = np.deg2rad(transform.get("skew", 0.0))
+    cos, sin = np.cos(radians), np.sin(radians)
+    out_w = int(np.ceil(abs(w * cos) + abs(h * sin)))
+    out_h = int(np.ceil(abs(w * sin) + abs(h * cos)))
+    rotate = np.array([
+        (cos, sin, out_w / 2 - (w / 2) * cos - (h / 2) * sin),
+        (-sin, cos, out_h / 2 + (w / 2) * sin - (h / 2) * cos),
+        (0, 0, 1),
+    ])
+    return rotate @ exif, (out_w, out_h)
+
+
+def is_identity(transform: dict) -> bool:
+    return transform.get("orientation", 1) == 1 and not transform.get("skew")
+
+
+def apply_orientation(img: Image.Image, transform: dict) -> Image.Image:
+    """
+    방향 보정 적용 (해상도와 무관하게 같은 transform 사용 가능 - 썸네일 / 원본 공용)
+
+    - 기울기 없음 : transpose (무손실)
+    - 기울기 있음 : EXIF 회전과 skew 회전을 합친 affine 변환 1 회 (cv2.warpAffine, 재샘플링 1 회)
+    """
+    if is_identity(transform):
+        return img
+    if not transform.get("skew"):
+        return img.transpose(EXIF_TRANSPOSE[transform["orientation"]])
+
+    import cv2  # 기울기 보정 시에만 필요 (임포트 비용을 사용 시점으로 미룸)
+
+    matrix, size = transform_matrix(transform, img.size)
+    # 행렬은 픽셀 경계 좌표 기준, OpenCV 는 픽셀 중심 좌표 기준이므로 0.5 px 이동
+    shift = np.array([(1, 0, 0.5), (0, 1, 0.5), (0, 0, 1)])
+    matrix = np.linalg.inv(shift) @ matrix @ shift
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    fill = FILL_COLOR if img.mode == "RGB" else FILL_COLOR[0]
+    warped = cv2.warpAffine(np.asarray(img), matrix[:2], size, flags=cv2.INTER_LINEAR,
+                            borderMode=cv2.BORDER_CONSTANT, borderValue=fill)
+    return Image.fromarray(warped)
+
+
+class OrientationCache:
+    """
+    이미지 해시(sha256) 별 방향 보정 값 캐시 (같은 이미지가 다시 들어오면 EXIF / 기울기 추정 생략)
+
+    - 값 : {"orientation": EXIF Orientation, "skew": 보정 각도}
+    - max_entries 초과 시 가장 오래 사용하지 않은 항목부터 제거
+    - persist_path 를 지정하면 JSON 파일로 저장/로드 (DedupIndex 와 같은 방식)
+    """
+
+    def __init__(self, persist_path: str = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.persist_path = persist_path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if persist_path and os.path.exists(persist_path):
+            self.load()
+
+    @classmethod
+    def from_config(cls, in_params: dict):
+        """in_params 의 orientation_cache_path / orientation_cache_size 설정 사용"""
+        return cls(
+            persist_path=in_params.get("orientation_cache_path"),
+            max_entries=in_params.get("orientation_cache_size", DEFAULT_MAX_ENTRIES),
+        )
+
+    def get(self, key: str):
+        with self._lock:
+            transform = self._entries.get(key)
+            if transform is not None:
+                self._entries.move_to_end(key)
+            return transform
+
+    def put(self, key: str, transform: dict):
+        with self._lock:
+            self._entries[key] = transform
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self):
+        with open(self.persist_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self._entries.update(data)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"[ORIENT] 캐시 로드: {len(self._entries)}건 ({self.persist_path})")
+
+    def save(self):
+        """persist_path 가 있으면 캐시 저장"""
+        if not self.persist_path:
+            return None
+        with self._lock:
+            data = dict(self._entries)
+        os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.persist_path)
+        return self.persist_path
+
+
+# 호출측이 캐시를 넘기지 않으면 프로세스 공용 캐시 사용
+shared_cache = OrientationCache()
+
+
+@timed("orientation")
+def orientation_transform(path: str, thumbnail: Image.Image = None, cache: OrientationCache = None,
+                          deskew: bool = True) -> dict:
+    """
+    이미지 방향 보정 값 계산 (캐시 우선)
+
+    입력:
+    - path (str): 원본 이미지 경로
+    - thumbnail (PIL.Image.Image): 이미 디코딩한 축소 이미지 (EXIF 회전 전, 없으면 SKEW_SIZE 로 축소 디코딩)
+    - cache (OrientationCache): 해시별 캐시 (None 이면 shared_cache)
+    - deskew (bool): False 이면 EXIF 회전만 확인
+
+    출력:
+    - dict: {"orientation": int, "skew": float}
+    """
+    cache = shared_cache if cache is None else cache
+    key = f"{file_sha256(path)}:{int(deskew)}"
+    transform = cache.get(key)
+    if transform is not None:
+        metrics.incr("orientation_cache_hit")
+        return transform
+
+    transform = {"orientation": exif_orientation(path), "skew": 0.0}
+    if deskew:
+        if thumbnail is None:
+            thumbnail, _ = open_reduced(path, SKEW_SIZE, mode="L")
+        transform["skew"] = estimate_skew(apply_orientation(thumbnail, {"orientation": transform["orientation"]}))
+    if transform["orientation"] != 1:
+        metrics.incr("orientation_exif")
+    if transform["skew"]:
+        metrics.incr("orientation_deskew")
+    cache.put(key, transform)
+    return transform
+
+
+def save_oriented(path: str, transform: dict, save_dir: str) -> str:
+    """
+    원본 해상도 방향 보정 후 PNG 저장 (convert_to_png 대신 사용, 파일 이름 동일)
+
+    출력:
+    - str: 보정된 PNG 경로
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    save_path = os.path.join(save_dir, os.path.splitext(os.path.basename(path))[0] + ".png")
+    with Image.open(path) as img:
+        apply_orientation(img.convert("RGB"), transform).save(save_path, "PNG")
+    logger.info(f"[ORIENT] 방향 보정 {transform}: {save_path}")
+    return save_path
@@ -0,0 +1,137 @@
+import logging
+
+from PIL import Image, ImageChops, ImageStat
+
+from stage_metrics import metrics, timed
+
+logger = logging.getLogger("PAGE_PREFILTER")
+
+# =============================================
+# 판정 기준 (input_images 영수증 15장 기준 최소값 대비 여유를 두고 설정)
+#   - 통계는 면적 평균 축소 이미지에서, 배경보다 어두운 내용 영역(content)만 잘라 계산
+#     (A4 스캔 페이지에 작은 영수증 1장이 붙은 경우도 페이지 전체가 아닌 영수증 영역 기준으로 판정)
+#   - 영수증 최소값 : ink 0.06, edge 5.4, 짧은 변 250px, 세로/가로 0.73 ~ 2.64 (명암 범위는 30 까지 있어 엣지와 함께 판정)
+#   - 음성(비영수증) 샘플은 합성 이미지뿐이라 실제 문서 페이지로 검증하기 전까지는 opt-in
+#     (문서는 page_prefilter=True, 사진은 page_prefilter_images=True 로 켠 경우만 적용)
+# =============================================
+STATS_SIZE = 96            # 통계 계산용 축소 크기 (긴 변)
+MIN_SIDE_PX = 64           # 이보다 작은 이미지 / 내용 영역은 로고/아이콘
+MAX_ASPECT = 12.0          # 세로/가로 비율 상한 (아주 긴 영수증 고려)
+MIN_ASPECT = 1 / 8         # 세로/가로 비율 하한 (가로 배너/구분선)
+BLANK_EDGE = 1.0           # 빈 페이지 : 엣지 에너지 + 명암 범위 모두 작음
+BLANK_RANGE = 20
+SPARSE_INK = 0.03          # 표지 : 잉크 비율과 엣지 에너지가 모두 작음
+SPARSE_EDGE = 3.0
+INK_MARGIN = 50            # 배경(밝기 90 분위)보다 이 값 이상 어두우면 잉크로 판단
+CONTENT_MARGIN = 12        # 배경보다 이 값 이상 어두운 축소 픽셀을 내용 영역으로 판단
+
+
+def _percentile(hist, total, q):
+    seen = 0
+    for value, count in enumerate(hist):
+        seen += count
+        if seen >= q * total:
+            return value
+    return 255
+
+
+def _reduce(img: Image.Image) -> tuple:
+    """긴 변 STATS_SIZE 근처로 면적 평균 축소 후 그레이스케일 (reduce 는 정수 배율 박스 평균이라 리샘플링보다 빠름)"""
+    width, height = img.size
+    factor = max(max(width, height) // STATS_SIZE, 1)
+    return (img.reduce(factor) if factor > 1 else img).convert("L"), factor
+
+
+def page_stats(img: Image.Image) -> dict:
+    """
+    축소 이미지 통계 (면적 평균 축소 → 내용 영역만 다시 축소하여 계산)
+
+    출력:
+    - dict: width / height(원본), aspect(세로/가로), content(내용 영역 (x1, y1, x2, y2), 없으면 None),
+            background(밝기 90 분위), contrast(90 분위 - 10 분위), ink(잉크 픽셀 비율), edge(인접 픽셀 평균 밝기 차)
+            (background 외 통계는 내용 영역 기준)
+    """
+    width, height = img.size
+    if img.mode not in ("L", "RGB", "RGBA"):
+        img = img.convert("RGB")
+    small, factor = _reduce(img)
+    background = _percentile(small.histogram(), small.width * small.height, 0.9)
+    box = small.point(lambda v: 255 if v < background - CONTENT_MARGIN else 0).getbbox()
+    content = None
+    if box is not None:
+        content = (box[0] * factor, box[1] * factor, min(box[2] * factor, width), min(box[3] * factor, height))
+        if content != (0, 0, width, height):
+            small, _ = _reduce(img.crop(content))
+
+    w, h = small.size
+    hist = small.histogram()
+    total = w * h
+    dark = _percentile(hist, total, 0.1)
+    ink = sum(hist[:max(background - INK_MARGIN, 0)]) / total
+
+    edge = 0.0
+    if w > 1 and h > 1:
+        dx = ImageStat.Stat(ImageChops.difference(small.crop((1, 0, w, h)), small.crop((0, 0, w - 1, h)))).mean[0]
+        dy = ImageStat.Stat(ImageChops.difference(small.crop((0, 1, w, h)), small.crop((0, 0, w, h - 1)))).mean[0]
+        edge = (dx + dy) / 2
+
+    return {
+        "width": width,
+        "height": height,
+        "aspect": round(height / width, 3) if width else 0.0,
+        "content": content,
+        "background": background,
+        "contrast": background - dark,
+        "ink": round(ink, 4),
+        "edge": round(edge, 2),
+    }
+
+
+@timed("page_prefilter")
+def check_page(img: Image.Image) -> tuple:
+    """
+    영수증이 아닌 것이 확실한 페이지 판정 (YOLO 전 단계)
+    애매한 페이지(본문 텍스트 페이지, 슬라이드 등)는 통과시키고 YOLO 가 판단합니다.
+
+    출력:
+    - tuple: (통과 여부, 제외 사유 또는 None, 통계 dict)
+        제외 사유 : too_small / aspect / blank / sparse
+    """
+    width, height = img.size
+    if min(width, height) < MIN_SIDE_PX:
+        return _reject("too_small", {"width": width, "height": height})
+
+    stats = page_stats(img)
+    content = stats["content"]
+    if not MIN_ASPECT <= stats["aspect"] <= MAX_ASPECT:
+        return _reject("aspect", stats)
+    if content is None or (stats["edge"] < BLANK_EDGE and stats["contrast"] < BLANK_RANGE):
+        return _reject("blank", stats)
+    if min(content[2] - content[0], content[3] - content[1]) < MIN_SIDE_PX:
+        return _reject("sparse", stats)
+    if stats["ink"] < SPARSE_INK and stats["edge"] < SPARSE_EDGE:
+        return _reject("sparse", stats)
+
+    metrics.incr("prefilter_pass")
+    return True, None, stats
+
+
+def _reject(reason, stats):
+    metrics.incr(f"prefilter_reject_{reason}")
+    return False, reason, stats
+
+
+def filter_pages(images: list) -> list:
+    """
+    문서에서 추출한 페이지 이미지 중 영수증 후보만 반환 (병합 전 단계)
+    """
+    kept = []
+    for page_no, img in enumerate(images, 1):
+        ok, reason, stats = check_page(img)
+        if ok:
+            kept.append(img)
+        else:
+            logger.info(f"[PREFILTER] 페이지 {page_no} 제외 ({reason}): {stats}")
+    if len(kept) != len(images):
+        logger.info(f"[PREFILTER] 페이지 {len(images)}개 중 {len(images) - len(kept)}개 제외")
+    return kept
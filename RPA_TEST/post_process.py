@@ -5,8 +5,11 @@ import logging
 import traceback
 from datetime import datetime
 
+from stage_metrics import metrics, timed
+
 logger = logging.getLogger("POST_PROCESS")
 
+@timed("postprocess")
 def post_process_and_save(duser_input: dict, record: dict) -> str:
     """
     Azure OCR 결과 JSON 데이터를 후처리하여 요약(summary) 정보와 항목(item) 리스트를 추출하고, 이들을 하나의 JSON 파일로 저장합니다.
@@ -113,6 +116,7 @@ def post_process_and_save(duser_input: dict, record: dict) -> str:
 
     except Exception as e:
         logger.error(f"[ERROR] 후처리 실패: {e}")
+        metrics.incr("postprocess_failed")
         traceback.print_exc()
 
         error_path = os.path.join(duser_input.get("error_json_dir", "./error_json"), f"fail_{record['FIID']}_{record['LINE_INDEX']}.json")
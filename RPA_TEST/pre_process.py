@@ -4,11 +4,19 @@ import logging
 import traceback
 from urllib.parse import urlparse
 from PIL import Image
-from ultralytics import YOLO
 
 from pathlib import Path
 from loguru import logger
-from playwright.sync_api import sync_playwright, TimeoutError
+
+from stage_metrics import metrics, timed
+from image_dedup import image_fingerprint, dedup_crops, reuse_page_crops
+from page_prefilter import check_page, filter_pages
+from box_postprocess import BOX_DEFAULTS, box_options_from
+from image_decode import open_reduced
+from receipt_detectors import build_detector, crop_detections, scale_detections, FilteredDetector, YoloDetector, CASCADE_MIN_SCORE
+from orientation import apply_orientation, is_identity, orientation_transform, save_oriented
+
+# ultralytics(YOLO), playwright 는 임포트 비용이 커서 실제 사용하는 함수 안에서 임포트
 
 logger = logging.getLogger("PRE_PRE_PROCESS")
 
@@ -17,6 +25,8 @@ def download_r_link_with_sso(url: str, sso_id: str, sso_pw: str, download_dir: s
     SSO 로그인 후 EGSS R 링크에서 파일 다운로드
     :return: 다운로드된 파일 경로 (성공 시) / None (실패 시)
     """
+    from playwright.sync_api import sync_playwright, TimeoutError
+
     try:
         download_path = Path(download_dir)
         download_path.mkdir(parents=True, exist_ok=True)
@@ -56,6 +66,7 @@ def download_r_link_with_sso(url: str, sso_id: str, sso_pw: str, download_dir: s
 # ============================================
 # 📌 DRM 해제 함수
 # ============================================
+@timed("drm_decode")
 def call_drm_decode_api(file_path: str) -> str:
     """
     DRM 해제 API 호출 → 성공 시 해제된 파일 경로 반환, 실패 시 원본 경로 반환
@@ -75,6 +86,7 @@ def call_drm_decode_api(file_path: str) -> str:
         logger.warning(f"[DRM] 해제 실패 또는 DRM 아님 → 원본 유지: {file_path}")
     except Exception as e:
         logger.error(f"[ERROR] DRM 해제 오류: {e}")
+        metrics.incr("drm_decode_failed")
         traceback.print_exc()
 
     logger.info("[종료] call_drm_decode_api")
@@ -162,10 +174,11 @@ def merge_images_vertically(images: list, output_path: str) -> str:
 # ============================================
 # 📌 문서 파일 전체 처리 함수 (DRM + 추출 + 병합)
 # ============================================
-def process_document_file(file_path: str, merged_doc_dir: str) -> str:
+def process_document_file(file_path: str, merged_doc_dir: str, prefilter: bool = False) -> str:
     """
-    문서 파일(PDF, DOCX, PPTX, XLSX)을 DRM 해제 → 이미지 추출 → 병합하여 PNG 저장
+    문서 파일(PDF, DOCX, PPTX, XLSX)을 DRM 해제 → 이미지 추출 → (prefilter 시 빈/비영수증 페이지 제외) → 병합하여 PNG 저장
     병합된 이미지는 merged_doc_dir에 <파일명>_merged.png로 저장됨
+    모든 페이지가 제외되면 필터 결과를 쓰지 않고 전체 페이지를 병합 (YOLO 검출 없음 → E001)
 
     반환값:
     - 병합 이미지 경로 (성공 시)
@@ -188,6 +201,14 @@ def process_document_file(file_path: str, merged_doc_dir: str) -> str:
             logger.warning("❌ 이미지 추출 실패 또는 없음")
             return None
 
+        # 빈 페이지 / 표지 / 로고 등 영수증이 아닌 페이지 제외 (YOLO 입력 축소)
+        if prefilter:
+            kept = filter_pages(images)
+            if kept:
+                images = kept
+            else:
+                logger.warning("영수증 후보 페이지 없음 (전체 페이지 제외) → 필터 없이 전체 페이지 검출")
+
         # 병합 이미지 저장 경로 생성
         os.makedirs(merged_doc_dir, exist_ok=True)
         base_name = Path(file_path).stem
@@ -219,6 +240,7 @@ def validate_file_size(path: str):
         raise ValueError(f"파일 크기가 10MB 이상입니다: {size} bytes")
     logger.info("[종료] validate_file_size")
 
+@timed("download")
 def download_file_from_url(url: str, save_dir: str, is_file_path: bool = False) -> str:
     """
     지정한 URL로부터 파일을 다운로드하여 save_dir에 저장한 후, 저장된 파일 경로를 반환합니다.
@@ -263,9 +285,11 @@ def download_file_from_url(url: str, save_dir: str, is_file_path: bool = False)
 
     except Exception as e:
         logger.error(f"[ERROR] 파일 다운로드 실패: {url} - {e}")
+        metrics.incr("download_failed")
         traceback.print_exc()
         return None
 
+@timed("convert")
 def convert_to_png(input_path: str, save_dir: str) -> str:
     """
     주어진 이미지 파일(input_path)을 PNG 형식으로 변환하여 save_dir 디렉토리에 저장하고, 변환된 PNG 파일 경로를 반환합니다.
@@ -286,8 +310,9 @@ def convert_to_png(input_path: str, save_dir: str) -> str:
     logger.info("[종료] convert_to_png")
     return save_path
 
-def crop_receipts_with_yolo(
-    model: YOLO,
+@timed("yolo_crop")
+def crop_receipts(
+    detector: "ReceiptDetector",
     png_path: str,
     file_type: str,
     base_filename: str,
@@ -297,14 +322,18 @@ def crop_receipts_with_yolo(
     gubun: str,
     receipt_index: int or None,
     common_yn: int,
-    cropped_dir: str
+    cropped_dir: str,
+    warp: bool = False,
+    detect_img: Image.Image = None,
+    detect_scale: tuple = None,
+    region_source: str = None
 ) -> list:
     """
-    입력 이미지를 대상으로 YOLO 모델을 사용하여 영수증 영역을 검출하고 잘라낸 후, 잘라낸 이미지들의 정보를 리스트로 반환합니다.
+    입력 이미지를 대상으로 검출 백엔드(YOLO / contour / cascade)로 영수증 영역을 검출하고 잘라낸 후, 잘라낸 이미지들의 정보를 리스트로 반환합니다.
     file_type에 따라 처리 방식이 다르며, ATTACH_FILE의 경우 한 이미지당 하나의 영수증만 처리하고, FILE_PATH의 경우 여러 영수증을 처리합니다.
 
     입력:
-    - model (YOLO): YOLO 모델 객체.
+    - detector (ReceiptDetector): receipt_detectors.build_detector() 로 만든 검출 백엔드.
     - png_path (str): 처리 대상 이미지 파일 (PNG) 경로.
     - file_type (str): "ATTACH_FILE" 또는 "FILE_PATH" 중 하나로, 첨부 파일인지 경로 파일인지 구분.
     - base_filename (str): 출력 파일 이름의 기본 (확장자 및 인덱스 제외).
@@ -315,17 +344,23 @@ def crop_receipts_with_yolo(
     - receipt_index (int 또는 None): ATTACH_FILE의 경우 영수증 순번 (일반적으로 1), FILE_PATH의 경우 None (자동 결정됨).
     - common_yn (int): 첨부 파일 여부 플래그 (ATTACH_FILE은 0, FILE_PATH는 1).
     - cropped_dir (str): 잘라낸 이미지 파일을 저장할 디렉토리 경로.
+    - warp (bool): contour 검출 결과(4각형)를 원근 보정하여 자를지 여부 (기본값 : False, 사각 영역 자르기).
+    - detect_img (PIL.Image.Image): 검출용 축소 이미지 (선택, 없으면 original_img 로 검출). 크롭은 항상 original_img 에서 수행.
+    - detect_scale (tuple): original_img / detect_img 배율 (sx, sy)
+    - region_source (str): 지정하면 크롭 영역만 이 파일에서 원본 해상도로 디코딩 (original_img 전체를 디코딩하지 않음)
 
     출력:
     - list: 검출/크롭 결과 딕셔너리들의 리스트. 각 딕셔너리는 성공 시 "file_path" 및 입력 식별자(FIID, LINE_INDEX 등)를 포함하고, 검출 실패나 오류 시 "RESULT_CODE"와 "RESULT_MESSAGE"를 포함합니다.
     """
-    logger.info("[시작] crop_receipts_with_yolo")
+    logger.info(f"[시작] crop_receipts ({detector.name})")
     results = []
     try:
-        yolo_results = model(png_path)
-        boxes = yolo_results[0].boxes
+        if detect_img is not None:
+            detections = scale_detections(detector(detect_img), detect_scale, original_img.size)
+        else:
+            detections = detector(original_img, png_path)
 
-        if boxes is None or len(boxes) == 0:
+        if not detections:
             logger.warning("YOLO 탐지 결과 없음")
             results.append({
                 "FIID": fiid, "LINE_INDEX": line_index, "GUBUN": gubun,
@@ -333,26 +368,24 @@ def crop_receipts_with_yolo(
                 "RESULT_CODE": "E001",
                 "RESULT_MESSAGE": "YOLO 탐지 결과 없음"
             })
-            logger.info("[종료] crop_receipts_with_yolo")
+            logger.info("[종료] crop_receipts")
             return results
 
         os.makedirs(cropped_dir, exist_ok=True)
 
         if file_type == "ATTACH_FILE":
-            if len(boxes) > 1:
-                logger.warning(f"YOLO 결과 {len(boxes)}개 발견 (ATTACH_FILE는 1개만 가능)")
+            if len(detections) > 1:
+                logger.warning(f"YOLO 결과 {len(detections)}개 발견 (ATTACH_FILE는 1개만 가능)")
                 results.append({
                     "FIID": fiid, "LINE_INDEX": line_index, "GUBUN": gubun,
                     "RECEIPT_INDEX": None, "COMMON_YN": common_yn,
                     "RESULT_CODE": "E002",
-                    "RESULT_MESSAGE": f"YOLO 결과 {len(boxes)}개 발견 (ATTACH_FILE는 1개만 가능)"
+                    "RESULT_MESSAGE": f"YOLO 결과 {len(detections)}개 발견 (ATTACH_FILE는 1개만 가능)"
                 })
-                logger.info("[종료] crop_receipts_with_yolo")
+                logger.info("[종료] crop_receipts")
                 return results
 
-            box_coords = boxes[0].xyxy[0].cpu().numpy()
-            x1, y1, x2, y2 = map(int, box_coords)
-            cropped_img = original_img.crop((x1, y1, x2, y2))
+            cropped_img = crop_detections(original_img, detections[:1], warp, region_source)[0]
             cropped_path = os.path.join(cropped_dir, f"{base_filename}_receipt.png")
             cropped_img.save(cropped_path)
             validate_file_size(cropped_path)  # 크롭 후 크기 체크
@@ -365,10 +398,8 @@ def crop_receipts_with_yolo(
             })
 
         elif file_type == "FILE_PATH":
-            for idx, box in enumerate(boxes, 1):
-                box_coords = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = map(int, box_coords)
-                cropped_img = original_img.crop((x1, y1, x2, y2))
+            cropped_imgs = crop_detections(original_img, detections, warp, region_source)
+            for idx, cropped_img in enumerate(cropped_imgs, 1):
                 cropped_path = os.path.join(cropped_dir, f"{base_filename}_r{idx}.png")
                 cropped_img.save(cropped_path)
                 validate_file_size(cropped_path)
@@ -382,16 +413,55 @@ def crop_receipts_with_yolo(
 
     except Exception as e:
         logger.error(f"[ERROR] YOLO 크롭 오류: {e}")
+        metrics.incr("yolo_crop_failed")
         traceback.print_exc()
-    logger.info("[종료] crop_receipts_with_yolo")
+    logger.info("[종료] crop_receipts")
     return results
 
+def crop_receipts_with_yolo(model: "YOLO", png_path: str, file_type: str, base_filename: str,
+                            original_img: Image.Image, fiid: str, line_index: int, gubun: str,
+                            receipt_index: int or None, common_yn: int, cropped_dir: str) -> list:
+    """
+    YOLO 모델로 영수증 검출/크롭 (기존 호출 호환용, crop_receipts 에 YoloDetector 를 넘겨 실행)
+    검출 박스는 기본 옵션으로 후처리 (작은 박스 제거 + 중복 박스 병합)
+    """
+    return crop_receipts(
+        detector=FilteredDetector(YoloDetector(model=model), **BOX_DEFAULTS),
+        png_path=png_path,
+        file_type=file_type,
+        base_filename=base_filename,
+        original_img=original_img,
+        fiid=fiid,
+        line_index=line_index,
+        gubun=gubun,
+        receipt_index=receipt_index,
+        common_yn=common_yn,
+        cropped_dir=cropped_dir
+    )
+
 def run_pre_pre_process(in_params: dict, db_record: dict) -> list:
     """
     전처리 수행: 이미지/문서 다운로드 → PNG 변환 또는 병합 → YOLO 크롭 → 결과 리스트 반환
 
     입력:
     - in_params: 설정값 (경로, YOLO 모델 경로 등 포함)
+      detector : 검출 백엔드 yolo(기본) / onnx / contour / cascade (실험 기능, contour 를 먼저 실행하고 score 가
+      detector_min_score(기본 CASCADE_MIN_SCORE 0.85) 미만이면 YOLO 실행), detector_warp=True 이면 contour 4각형을 원근 보정하여 자르기
+      yolo_model_path 가 .onnx 이면 yolo / cascade 도 ONNX Runtime 으로 추론 (onnx_threads : 세션 스레드 수)
+      detector_tiled(기본 True) 이면 문서 병합 이미지는 겹치는 타일로 나눠 검출 (detector_tile_options : TiledDetector 옵션)
+      검출 박스는 신뢰도 / 면적 필터 후 겹치는 박스를 병합 (box_min_score, box_min_area_ratio, box_iou, box_containment,
+      box_top_k / box_postprocess=False 이면 검출 결과를 그대로 사용)
+      detect_max_side(기본 1280) : JPEG 원본은 긴 변이 이 값 이상 남는 1/2~1/8 배율로 축소 디코딩해 검출하고, 크롭만 원본 해상도
+      (None 이면 원본 해상도로 검출)
+      roi_decode(기본 True) : 축소 디코딩으로 검출한 JPEG 는 PNG 로 변환하지 않고 원본에서 바로 크롭
+      (JPEG 원본은 크롭 시 1 회 전체 디코딩, PNG 인코딩 / 재디코딩만 생략)
+      orientation(기본 True) : 사진은 EXIF 회전 + 기울기 보정 후 검출 (orientation_deskew=False 이면 EXIF 회전만,
+      orientation_cache(OrientationCache) 가 없으면 프로세스 공용 캐시 사용)
+      dedup_index(DedupIndex) 가 있으면 중복 페이지는 YOLO 를 생략하고, 중복 크롭에는 DUPLICATE_OF 를 표시
+      page_prefilter(기본 False) : 문서(PDF / DOCX / PPTX / XLSX)의 빈 페이지 / 표지 / 로고 페이지를 YOLO 전에 제외
+      (전체 페이지가 제외되면 필터 없이 검출하여 기존과 같이 E001)
+      page_prefilter_images(기본 False) : 사진(ATTACH_FILE / 단일 이미지 FILE_PATH)에도 전처리 필터 적용 (제외 시 E003)
+      (필터 기준값이 input_images 와 합성 음성 샘플로만 조정되어 실제 문서 페이지 검증 전까지 기본 꺼짐)
     - db_record: DB에서 가져온 단일 레코드 (FIID, GUBUN 등 포함)
 
     출력:
@@ -400,9 +470,25 @@ def run_pre_pre_process(in_params: dict, db_record: dict) -> list:
     logger.info("[시작] run_pre_pre_process")
     try:
         download_dir = in_params["download_dir"]
-        model_path = in_params["yolo_model_path"]
+        model_path = in_params.get("yolo_model_path")
         merged_doc_dir = in_params.get("merged_doc_dir", os.path.join(download_dir, "document_merged"))
-        model = YOLO(model_path)
+        dedup_index = in_params.get("dedup_index")
+        prefilter = in_params.get("page_prefilter", False)
+        prefilter_images = prefilter and in_params.get("page_prefilter_images", False)
+        roi_decode = in_params.get("roi_decode", True)
+        orient = in_params.get("orientation", True)
+        deskew = in_params.get("orientation_deskew", True)
+        detector_options = dict(
+            name=in_params.get("detector", "yolo"),
+            model_path=model_path,
+            min_score=in_params.get("detector_min_score", CASCADE_MIN_SCORE),
+            onnx_options={"threads": in_params.get("onnx_threads")},
+            box_options=box_options_from(in_params),
+        )
+        detector = build_detector(**detector_options)
+        # 문서 병합 이미지는 세로로 매우 길어 타일 단위로 검출
+        doc_detector = (build_detector(**detector_options, tile_options=in_params.get("detector_tile_options", {}))
+                        if in_params.get("detector_tiled", True) else detector)
 
         fiid = db_record["FIID"]
         line_index = db_record["LINE_INDEX"]
@@ -423,20 +509,62 @@ def run_pre_pre_process(in_params: dict, db_record: dict) -> list:
                 continue
 
             ext = os.path.splitext(orig_path)[1].lower()
-            if ext in [".pdf", ".docx", ".pptx", ".xlsx"]:
-                merged_path = process_document_file(orig_path, merged_doc_dir)
+            is_document = ext in [".pdf", ".docx", ".pptx", ".xlsx"]
+            if is_document:
+                merged_path = process_document_file(orig_path, merged_doc_dir, prefilter=prefilter)
                 if not merged_path:
                     logger.warning(f"[{file_type}] 문서 처리 실패 또는 이미지 없음")
                     continue
                 png_path = convert_to_png(merged_path, download_dir)
+                detect_img, detect_scale = None, None
             else:
-                png_path = convert_to_png(orig_path, download_dir)
-
+                # JPEG 원본은 검출용으로 축소 디코딩 (YOLO 입력 640 이므로 원본 해상도 불필요)
+                detect_img, detect_scale = open_reduced(orig_path, in_params.get("detect_max_side", 1280), reduced_only=True)
+                transform = orientation_transform(orig_path, detect_img, in_params.get("orientation_cache"), deskew) if orient else None
+                if transform is not None and not is_identity(transform):
+                    # 회전 / 기울어진 사진은 원본 해상도에서 1 회 보정하여 PNG 저장 (convert_to_png 대체), 검출용 축소 이미지도 같은 보정
+                    png_path = save_oriented(orig_path, transform, download_dir)
+                    if detect_img is not None:
+                        detect_img = apply_orientation(detect_img, transform)
+                        with Image.open(png_path) as oriented:
+                            detect_scale = (oriented.width / detect_img.width, oriented.height / detect_img.height)
+                elif detect_img is not None and roi_decode:
+                    # 축소 디코딩한 JPEG 는 PNG 변환(원본 전체 디코딩 + 인코딩) 없이 크롭 영역만 원본에서 디코딩
+                    png_path = orig_path
+                else:
+                    png_path = convert_to_png(orig_path, download_dir)
+
+            # original_img 는 크기 확인 / 원본 해상도 크롭용으로만 열고, 필터 / 지문은 축소 이미지가 있으면 축소 이미지 사용
             with Image.open(png_path) as original_img:
+                page_img = detect_img if detect_img is not None else original_img
+                # 빈 페이지 / 로고 등 영수증이 아닌 것이 확실한 이미지는 YOLO 생략
+                # (문서는 process_document_file 에서 페이지 단위로 이미 필터, 사진은 page_prefilter_images 로 켠 경우만)
+                if prefilter_images and not is_document:
+                    ok, reason, stats = check_page(page_img)
+                    if not ok:
+                        logger.warning(f"[{file_type}] 전처리 필터 제외 ({reason}): {stats}")
+                        results.append({
+                            "FIID": fiid, "LINE_INDEX": line_index, "GUBUN": gubun,
+                            "RECEIPT_INDEX": None, "COMMON_YN": common_yn,
+                            "RESULT_CODE": "E003",
+                            "RESULT_MESSAGE": f"영수증 아님 (전처리 필터: {reason})"
+                        })
+                        continue
+
+                # 같은 페이지를 이미 처리했으면 크롭 결과를 자기 식별자로 재사용 (YOLO 생략)
+                fingerprint = image_fingerprint(png_path, page_img) if dedup_index else None
+                page = dedup_index.find_page(fingerprint, file_type) if dedup_index else None
+                if page is not None:
+                    results.extend(reuse_page_crops(page, {
+                        "FIID": fiid, "LINE_INDEX": line_index, "GUBUN": gubun,
+                        "RECEIPT_INDEX": receipt_index, "COMMON_YN": common_yn,
+                    }))
+                    continue
+
                 base_filename = os.path.splitext(os.path.basename(png_path))[0]
                 cropped_dir = os.path.join(download_dir, "cropped")
-                result = crop_receipts_with_yolo(
-                    model=model,
+                result = crop_receipts(
+                    detector=doc_detector if is_document else detector,
                     png_path=png_path,
                     file_type=file_type,
                     base_filename=base_filename,
@@ -446,8 +574,15 @@ def run_pre_pre_process(in_params: dict, db_record: dict) -> list:
                     gubun=gubun,
                     receipt_index=receipt_index,
                     common_yn=common_yn,
-                    cropped_dir=cropped_dir
+                    cropped_dir=cropped_dir,
+                    warp=in_params.get("detector_warp", False),
+                    detect_img=detect_img,
+                    detect_scale=detect_scale,
+                    region_source=png_path if detect_img is not None and roi_decode else None
                 )
+                if dedup_index:
+                    result = dedup_crops(dedup_index, result)
+                    dedup_index.add_page(fingerprint, file_type, db_record, result)
                 results.extend(result)
 
         logger.info("[종료] run_pre_pre_process")
@@ -0,0 +1,182 @@
+import os
+import re
+import time
+import heapq
+import logging
+import threading
+from itertools import count
+
+from stage_metrics import metrics
+
+logger = logging.getLogger("SCHEDULER")
+
+# 우선순위 클래스 (앞쪽일수록 먼저 실행)
+#   - attach    : ATTACH_FILE (COMMON_YN=0) - 영수증 1장, 빠르게 끝나는 작업
+#   - file_path : FILE_PATH (COMMON_YN=1) - 여러 페이지 문서, 오래 걸리는 작업
+PRIORITY_CLASSES = ("attach", "file_path")
+
+# 클래스별 동시 실행 상한 (대형 문서가 워커를 모두 점유하지 않도록 제한)
+DEFAULT_CLASS_LIMITS = {"attach": None, "file_path": 2}
+DEFAULT_MAX_WORKERS = 8
+
+DOC_EXTENSIONS = (".pdf", ".docx", ".pptx", ".xlsx")
+DOC_PAGE_GUESS = 5             # 다운로드 전이라 페이지 수를 알 수 없는 문서의 추정 페이지 수
+UNKNOWN_SIZE_BYTES = 512 * 1024
+PDF_SCAN_LIMIT = 50 * 1024 * 1024
+_PDF_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![a-z])")
+
+
+def classify_item(item: dict) -> str:
+    """
+    레코드/아이템의 우선순위 클래스
+    - 아이템(전처리 후) : COMMON_YN 0 → attach, 1 → file_path
+    - 레코드(전처리 전) : FILE_PATH 가 있으면 file_path, 없으면 attach
+    """
+    common_yn = item.get("COMMON_YN")
+    if common_yn is not None:
+        return "attach" if str(common_yn) in ("0", "N") else "file_path"
+    return "file_path" if item.get("FILE_PATH") else "attach"
+
+
+def _count_pdf_pages(path: str) -> int:
+    if os.path.getsize(path) > PDF_SCAN_LIMIT:
+        return DOC_PAGE_GUESS
+    with open(path, "rb") as f:
+        return max(len(_PDF_PAGE_PATTERN.findall(f.read())), 1)
+
+
+def estimate_cost(item: dict) -> float:
+    """
+    작업 비용 추정 (shortest-job-first 정렬 키) = 파일 크기(MB) x 페이지 수
+
+    - 로컬 파일(file_path)이 있으면 실제 크기, PDF 는 페이지 수까지 확인
+    - 다운로드 전 레코드는 URL 확장자로 문서 여부만 판단 (PAGE_COUNT 필드가 있으면 우선 사용)
+    """
+    path = item.get("file_path")
+    pages = item.get("PAGE_COUNT")
+    size = UNKNOWN_SIZE_BYTES
+    try:
+        if path and os.path.exists(path):
+            size = os.path.getsize(path)
+            if pages is None and path.lower().endswith(".pdf"):
+                pages = _count_pdf_pages(path)
+        elif pages is None:
+            url = (item.get("FILE_PATH") or item.get("ATTACH_FILE") or "").split("?")[0].split("@")[0]
+            if url.lower().endswith(DOC_EXTENSIONS):
+                pages = DOC_PAGE_GUESS
+    except OSError as e:
+        logger.debug(f"[SCHED] 비용 추정 실패 - 기본값 사용: {e}")
+    return (size / (1024 * 1024)) * max(int(pages or 1), 1)
+
+
+class PriorityScheduler:
+    """
+    우선순위 클래스 + SJF(추정 비용 오름차순) + 클래스별 동시 실행 상한을 적용한 스레드 실행기
+    (ATTACH_FILE 단건 영수증이 대형 FILE_PATH 문서 뒤에서 대기하지 않도록 함)
+    idp_utils.run_in_multi_thread 와 같은 형태로 호출하며, 결과는 입력 순서대로 반환합니다.
+
+    사용 예:
+        scheduler = PriorityScheduler.from_config(duser_input)
+        results = scheduler.run(_adapter_execute_worker, func_params_list, item_key="idp_item")
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, class_limits=None,
+                 classify=classify_item, estimate=estimate_cost):
+        """
+        Args:
+            max_workers (int): 전체 워커 스레드 수
+            class_limits (dict): 클래스별 동시 실행 상한 (None 이면 상한 없음)
+            classify (callable): item -> 클래스명
+            estimate (callable): item -> 추정 비용
+        """
+        self.max_workers = max(int(max_workers), 1)
+        self.class_limits = {
+            c: (None if limit is None else max(int(limit), 1))
+            for c, limit in {**DEFAULT_CLASS_LIMITS, **(class_limits or {})}.items()
+        }
+        self.classify = classify
+        self.estimate = estimate
+
+    @classmethod
+    def from_config(cls, duser_input: dict):
+        """duser_input 의 scheduler_max_workers / scheduler_class_limits 설정 사용"""
+        return cls(
+            max_workers=duser_input.get("scheduler_max_workers", DEFAULT_MAX_WORKERS),
+            class_limits=duser_input.get("scheduler_class_limits"),
+        )
+
+    def _priority(self, class_name):
+        return PRIORITY_CLASSES.index(class_name) if class_name in PRIORITY_CLASSES else len(PRIORITY_CLASSES)
+
+    def run(self, func, func_params_list: list, item_key: str = None) -> list:
+        """
+        Args:
+            func (callable): 작업 함수 (params 1개 인자)
+            func_params_list (list): 작업별 params
+            item_key (str): params 에서 분류/비용 추정에 사용할 항목 키 (None 이면 params 자체)
+
+        Returns:
+            list: 입력 순서와 같은 순서의 결과 (예외 발생 작업은 None)
+        """
+        results = [None] * len(func_params_list)
+        if not func_params_list:
+            return results
+
+        heaps = {}
+        seq = count()
+        for index, params in enumerate(func_params_list):
+            item = params.get(item_key, {}) if item_key else params
+            class_name = self.classify(item)
+            heapq.heappush(heaps.setdefault(class_name, []), (self.estimate(item), next(seq), index))
+        running = {class_name: 0 for class_name in heaps}
+        cond = threading.Condition()
+        enqueued_at = time.perf_counter()
+
+        logger.info(
+            f"[SCHED] {len(func_params_list)}건 스케줄링 (워커 {self.max_workers}) - "
+            + ", ".join(f"{c}={len(h)}" for c, h in heaps.items())
+        )
+
+        def _next_task():
+            # 실행 가능한(상한 미만) 클래스 중 우선순위가 가장 높은 클래스의 최소 비용 작업
+            # 상한은 다른 클래스 작업이 대기 중일 때만 적용 (남은 작업이 한 클래스뿐이면 워커를 놀리지 않음)
+            pending = [c for c, h in heaps.items() if h]
+            candidates = [
+                (self._priority(c), heaps[c][0][0], c) for c in pending
+                if len(pending) == 1 or self.class_limits.get(c) is None or running[c] < self.class_limits[c]
+            ]
+            if not candidates:
+                return None
+            _, _, class_name = min(candidates)
+            running[class_name] += 1
+            return class_name, heapq.heappop(heaps[class_name])[2]
+
+        def _worker():
+            while True:
+                with cond:
+                    task = _next_task()
+                    while task is None:
+                        if not any(heaps.values()):
+                            return
+                        cond.wait()
+                        task = _next_task()
+                class_name, index = task
+                metrics.record(f"queue_wait_{class_name}", time.perf_counter() - enqueued_at)
+                try:
+                    results[index] = func(func_params_list[index])
+                except Exception as e:
+                    logger.error(f"[SCHED] 작업 실패 ({class_name}, index={index}): {e}", exc_info=True)
+                finally:
+                    with cond:
+                        running[class_name] -= 1
+                        cond.notify_all()
+
+        threads = [
+            threading.Thread(target=_worker, name=f"sched-{n}", daemon=True)
+            for n in range(min(self.max_workers, len(func_params_list)))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
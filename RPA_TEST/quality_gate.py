@@ -0,0 +1,185 @@
+import os
+import logging
+import threading
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+from stage_metrics import metrics, timed
+
+logger = logging.getLogger("QUALITY_GATE")
+
+# =============================================
+# OCR 전 크롭 품질 판정 (Azure 호출 전 단계)
+#   - sharpness : 라플라시안 표준편차 / 명암 범위 (밝기 / 대비와 무관한 선명도)
+#   - contrast  : 밝기 95 분위 - 5 분위, brightness : 밝기 중앙값
+#   - scale     : 짧은 변 / AZURE_MIN_SIDE (preprocess_image_for_azure 의 최소 50px 기준)
+# 기준값은 input_images 15장 기준 (원본 sharpness 0.11 이상, 가우시안 블러 sigma 2 적용 시 대부분 0.03 이하)
+# 제외(reject)는 검증 전까지 opt-in (quality_gate_reject=True) : 기본은 보정만 하고 모두 OCR
+# =============================================
+AZURE_MIN_SIDE = 50
+AZURE_MAX_SIDE = 10000         # Azure 최대 크기 (확대 시 긴 변 상한)
+THUMB_SIZE = 1024              # 통계 계산용 축소 크기 (긴 변)
+QUALITY_DEFAULTS = {
+    "enhance_side": 4 * AZURE_MIN_SIDE,  # 짧은 변이 이보다 작으면 이 크기로 확대 (AZURE_MIN_SIDE 미만 포함)
+    "reject_sharpness": 0.02,          # 이보다 흐리면 제외
+    "enhance_sharpness": 0.06,         # 이보다 흐리면 선명화
+    "reject_contrast": 8,              # 명암 범위가 이보다 작으면 제외 (빈 / 검은 이미지)
+    "enhance_contrast": 60,            # 명암 범위가 이보다 작으면 대비 보정
+    "enhance_brightness": 70,          # 밝기 중앙값이 이보다 어두우면 대비 보정
+}
+REJECT_CODE = "E004"
+ENHANCED_DIR = "enhanced"
+
+
+def crop_quality(img: Image.Image) -> dict:
+    """
+    크롭 품질 통계 (긴 변 THUMB_SIZE 로 줄인 그레이 스케일에서 numpy 로 계산)
+
+    출력:
+    - dict: width / height(원본), scale, sharpness, contrast, brightness
+    """
+    width, height = img.size
+    gray = img.convert("L")
+    factor = THUMB_SIZE / max(width, height)
+    if factor < 1:
+        gray = gray.resize((max(int(width * factor), 1), max(int(height * factor), 1)), Image.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(gray, dtype=np.float32)
+    low, median, high = np.percentile(pixels, (5, 50, 95))
+    contrast = float(high - low)
+    sharpness = 0.0
+    if pixels.shape[0] > 2 and pixels.shape[1] > 2 and contrast > 0:
+        laplacian = (4 * pixels[1:-1, 1:-1] - pixels[:-2, 1:-1] - pixels[2:, 1:-1]
+                     - pixels[1:-1, :-2] - pixels[1:-1, 2:])
+        sharpness = float(laplacian.std()) / contrast
+    return {
+        "width": width,
+        "height": height,
+        "scale": round(min(width, height) / AZURE_MIN_SIDE, 2),
+        "sharpness": round(sharpness, 4),
+        "contrast": round(contrast, 1),
+        "brightness": round(float(median), 1),
+    }
+
+
+def assess_quality(stats: dict, options: dict = None) -> tuple:
+    """
+    품질 통계 → 처리 방식
+
+    출력:
+    - tuple: (decision, 사유 리스트)
+        decision : pass / enhance / reject (options["reject"] 가 True 일 때만)
+        사유 : blurry / blank (제외), low_resolution / soft / low_contrast / dark (보정)
+    """
+    options = {**QUALITY_DEFAULTS, **(options or {})}
+    min_side = min(stats["width"], stats["height"])
+    if options.get("reject"):
+        if stats["contrast"] < options["reject_contrast"]:
+            return "reject", ["blank"]
+        if stats["sharpness"] < options["reject_sharpness"]:
+            return "reject", ["blurry"]
+
+    enhances = []
+    if min_side < options["enhance_side"]:
+        enhances.append("low_resolution")
+    if stats["sharpness"] < options["enhance_sharpness"]:
+        enhances.append("soft")
+    if stats["contrast"] < options["enhance_contrast"]:
+        enhances.append("low_contrast")
+    if stats["brightness"] < options["enhance_brightness"]:
+        enhances.append("dark")
+    return ("enhance", enhances) if enhances else ("pass", [])
+
+
+def enhance_crop(img: Image.Image, reasons: list, options: dict = None) -> Image.Image:
+    """
+    보정 사유별 처리 : 확대(low_resolution) → 대비 보정(low_contrast / dark) → 선명화(soft)
+    확대 배율은 긴 변이 AZURE_MAX_SIDE 를 넘지 않도록 제한 (가는 띠 모양 크롭)
+    """
+    options = {**QUALITY_DEFAULTS, **(options or {})}
+    img = img.convert("RGB")
+    if "low_resolution" in reasons:
+        factor = min(options["enhance_side"] / min(img.size), AZURE_MAX_SIDE / max(img.size))
+        img = img.resize((round(img.width * factor), round(img.height * factor)), Image.LANCZOS)
+    if "low_contrast" in reasons or "dark" in reasons:
+        img = ImageOps.autocontrast(img, cutoff=1)
+    if "soft" in reasons:
+        img = img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+    return img
+
+
+def quality_options_from(in_params: dict) -> dict:
+    """
+    in_params 에서 품질 판정 옵션 읽기 (quality_gate=False 이면 None : 판정 안 함)
+    키 : quality_enhance_side / quality_reject_sharpness / ... (QUALITY_DEFAULTS 키에 quality_ 접두사)
+         quality_gate_reject (기본 False : 제외 없이 보정만)
+    """
+    if not in_params.get("quality_gate", True):
+        return None
+    options = {key: in_params.get(f"quality_{key}", default) for key, default in QUALITY_DEFAULTS.items()}
+    options["reject"] = in_params.get("quality_gate_reject", False)
+    return options
+
+
+@timed("quality_gate")
+def gate_crop(cropped: dict, options: dict = None) -> dict:
+    """
+    Azure OCR 전 크롭 품질 판정 및 보정
+
+    입력:
+    - cropped (dict): run_pre_pre_process() 결과 아이템 (file_path 포함)
+    - options (dict): QUALITY_DEFAULTS 덮어쓸 기준값
+
+    출력:
+    - dict: {"decision": pass / enhance / reject, "reasons": list, "stats": dict,
+             "file_path": OCR 에 보낼 이미지 경로 (보정 시 같은 이름으로 enhanced 폴더에 저장, OCR JSON 이름 유지)}
+    """
+    file_path = cropped["file_path"]
+    with Image.open(file_path) as img:
+        stats = crop_quality(img)
+        decision, reasons = assess_quality(stats, options)
+        if decision == "enhance":
+            enhanced_dir = os.path.join(os.path.dirname(file_path), ENHANCED_DIR)
+            os.makedirs(enhanced_dir, exist_ok=True)
+            enhanced_path = os.path.join(enhanced_dir, os.path.basename(file_path))
+            # 중복 크롭이 같은 원본 파일을 동시에 보정할 수 있어 임시 파일에 저장 후 교체
+            root, ext = os.path.splitext(enhanced_path)
+            tmp_path = f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+            enhance_crop(img, reasons, options).save(tmp_path)
+            os.replace(tmp_path, enhanced_path)
+            file_path = enhanced_path
+
+    metrics.incr(f"quality_{decision}")
+    if decision == "reject":
+        metrics.incr("azure_calls_avoided")
+        logger.warning(f"[QUALITY] OCR 제외 {reasons}: {cropped['file_path']} {stats}")
+    elif decision == "enhance":
+        logger.info(f"[QUALITY] 보정 후 OCR {reasons}: {file_path}")
+    return {"decision": decision, "reasons": reasons, "stats": stats, "file_path": file_path}
+
+
+def reject_result(cropped: dict, gate: dict) -> dict:
+    """품질 미달 크롭의 OCR 실패 결과 (run_azure_ocr 실패 결과와 같은 형식)"""
+    return {
+        "FIID": cropped.get("FIID"),
+        "LINE_INDEX": cropped.get("LINE_INDEX"),
+        "RECEIPT_INDEX": cropped.get("RECEIPT_INDEX"),
+        "COMMON_YN": cropped.get("COMMON_YN"),
+        "GUBUN": cropped.get("GUBUN"),
+        "RESULT_CODE": REJECT_CODE,
+        "RESULT_MESSAGE": f"이미지 품질 미달 ({', '.join(gate['reasons'])})",
+    }
+
+
+def quality_summary() -> dict:
+    """지금까지의 품질 판정 건수와 생략한 Azure 호출 수"""
+    counters = metrics.to_dict()["counters"]
+    checked = sum(counters.get(f"quality_{d}", 0) for d in ("pass", "enhance", "reject"))
+    return {
+        "checked": checked,
+        "pass": counters.get("quality_pass", 0),
+        "enhance": counters.get("quality_enhance", 0),
+        "reject": counters.get("quality_reject", 0),
+        "azure_calls_avoided": counters.get("azure_calls_avoided", 0),
+        "avoided_ratio": round(counters.get("azure_calls_avoided", 0) / checked, 4) if checked else 0.0,
+    }
@@ -0,0 +1,130 @@
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from post_process import post_process_and_save
+from db_master import insert_postprocessed_result
+
+logger = logging.getLogger("REPLAY")
+
+MANIFEST_FILENAME = "idp_items.json"
+
+# 매니페스트에 남길 아이템 키 (전처리/OCR 산출물 경로 + 식별자)
+MANIFEST_KEYS = (
+    "item_seq", "FIID", "LINE_INDEX", "RECEIPT_INDEX", "COMMON_YN", "GUBUN",
+    "file_path", "source_url", "ATTACH_FILE", "json_path", "RESULT_CODE", "RESULT_MESSAGE", "DUPLICATE_OF",
+    "DB_RESULT_CODE",
+)
+
+
+def ocr_json_path_for(idp_item: dict, azure_dir: str) -> str:
+    """
+    아이템의 OCR 결과 JSON 경로 (run_azure_ocr 저장 규칙: <크롭 파일명>.ocr.json)
+    """
+    base_name = Path(idp_item.get("file_path") or "").stem
+    if not base_name:
+        base_name = f"{idp_item.get('FIID')}_{idp_item.get('LINE_INDEX')}_{idp_item.get('RECEIPT_INDEX')}"
+    return os.path.join(azure_dir, f"{base_name}.ocr.json")
+
+
+def save_idp_manifest(idp_items: list, azure_dir: str, manifest_path: str = None) -> str:
+    """
+    OCR 대상 아이템 목록(idp_items)을 매니페스트로 저장 (재생 모드 입력)
+
+    입력:
+    - idp_items (list): generate_idp_items() 결과 또는 레코드별 크롭 결과 리스트
+    - azure_dir (str): OCR 결과 JSON 폴더 (아이템별 json_path 계산에 사용)
+    - manifest_path (str): 저장 경로 (기본값 : azure_dir/idp_items.json)
+
+    출력:
+    - str: 저장된 매니페스트 경로
+    """
+    manifest_path = manifest_path or os.path.join(azure_dir, MANIFEST_FILENAME)
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+
+    items = []
+    for idp_item in idp_items:
+        item = {key: idp_item.get(key) for key in MANIFEST_KEYS if key in idp_item}
+        item.setdefault("json_path", ocr_json_path_for(idp_item, azure_dir))
+        items.append(item)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "azure_dir": azure_dir,
+            "idp_items": items,
+        }, f, ensure_ascii=False, indent=2, default=str)
+
+    logger.info(f"[완료] 매니페스트 저장: {manifest_path} ({len(items)}건)")
+    return manifest_path
+
+
+def load_replay_items(manifest_path: str, ocr_json_dir: str = None, include_succeeded: bool = False) -> list:
+    """
+    매니페스트를 읽어 재생 대상 아이템 목록 반환
+
+    입력:
+    - manifest_path (str): save_idp_manifest() 로 저장한 매니페스트 경로
+    - ocr_json_dir (str): OCR JSON 폴더를 옮긴 경우 새 위치 (json_path 의 파일명만 사용)
+    - include_succeeded (bool): True 이면 DB 저장까지 성공한 아이템(DB_RESULT_CODE 200)도 포함 (기본값 : False)
+
+    출력:
+    - list: json_path 가 확정된 아이템 리스트 (전처리 실패 아이템, 기본값에서는 성공 아이템 제외)
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    items, succeeded = [], 0
+    for idp_item in manifest.get("idp_items", []):
+        if str(idp_item.get("RESULT_CODE", "200")) != "200":
+            continue
+        if str(idp_item.get("DB_RESULT_CODE")) == "200" and not include_succeeded:
+            succeeded += 1
+            continue
+        json_path = idp_item.get("json_path") or ocr_json_path_for(idp_item, manifest.get("azure_dir", "."))
+        if ocr_json_dir:
+            json_path = os.path.join(ocr_json_dir, os.path.basename(json_path))
+        items.append({**idp_item, "json_path": json_path})
+
+    logger.info(f"[완료] 재생 대상 {len(items)}건 로드 (성공 아이템 {succeeded}건 제외): {manifest_path}")
+    return items
+
+
+def replay_worker(idp_item: dict, duser_input: dict) -> dict:
+    """
+    저장된 OCR JSON 으로 후처리 → DB 저장만 수행 (전처리/OCR 생략)
+    같은 영수증의 기존 DB 행은 삭제 후 입력하므로 여러 번 재생해도 행이 중복되지 않습니다.
+
+    입력:
+    - idp_item (dict): load_replay_items() 결과 아이템 (json_path 포함)
+    - duser_input (dict): 후처리/DB 설정 (postprocess_output_dir, sqlalchemy_conn 등)
+
+    출력:
+    - dict: has_error, error_message 를 갱신한 idp_item
+    """
+    fiid = idp_item.get("FIID")
+    line_idx = idp_item.get("LINE_INDEX")
+    rcp_idx = idp_item.get("RECEIPT_INDEX")
+    try:
+        json_path = idp_item["json_path"]
+        if not os.path.exists(json_path):
+            raise FileNotFoundError(f"OCR JSON 없음: {json_path}")
+
+        post_json_path = post_process_and_save(
+            duser_input,
+            {**idp_item, "ATTACH_FILE": idp_item.get("ATTACH_FILE") or idp_item.get("source_url")}
+        )
+        db_result_code = insert_postprocessed_result(post_json_path, duser_input, replace=True)
+        if db_result_code is None:
+            raise RuntimeError(f"DB 저장 실패: {post_json_path}")
+
+        idp_item["DB_RESULT_CODE"] = db_result_code
+        idp_item["has_error"] = db_result_code != "200"
+        idp_item["error_message"] = None if db_result_code == "200" else f"후처리 결과 코드 {db_result_code}"
+    except Exception as e:
+        logger.error(f"[ERROR] 재생 실패 item={fiid}-{line_idx}-{rcp_idx}: {e}")
+        idp_item["has_error"] = True
+        idp_item["error_message"] = str(e)
+    return idp_item
@@ -0,0 +1,172 @@
+import random
+import logging
+import threading
+from collections import deque
+
+from stage_metrics import metrics
+
+logger = logging.getLogger("TASK_GRAPH")
+
+
+class Task:
+    """
+    그래프 노드 (함수 + 선행 작업)
+    선행 작업이 모두 끝나면 실행 가능 상태가 되며, 결과/예외는 result / error 에 저장됩니다.
+    """
+
+    def __init__(self, func, args, kwargs, deps, name):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.deps = list(deps)
+        self.name = name or getattr(func, "__name__", "task")
+        self.result = None
+        self.error = None
+        self.done = False
+        self._waiting = 0
+        self._dependents = []
+
+    def __repr__(self):
+        return f"Task({self.name}, done={self.done})"
+
+
+class TaskGraph:
+    """
+    work-stealing 방식의 작업 그래프 실행기
+
+    - 워커마다 deque 를 두고, 자기 deque 는 뒤(LIFO)에서, 다른 워커 deque 는 앞(FIFO)에서 가져옵니다(steal).
+    - 그래프 밖에서 추가한 작업은 공용 대기열에 넣어 추가한 순서(우선순위 순)대로 실행합니다.
+    - 실행 중인 작업 안에서 submit() 으로 하위 작업을 동적으로 추가할 수 있습니다.
+      (예: 레코드 전처리 작업이 크롭 개수만큼 OCR 작업을 만들고, 모든 OCR 작업에 의존하는 집계 작업 추가)
+    - 선행 작업이 실패하면 의존 작업은 실행하지 않고 같은 예외로 실패 처리합니다.
+    - 작업에서 BaseException(KeyboardInterrupt, SystemExit 등)이 발생하면 작업을 실패 처리하고,
+      남은 작업은 시작하지 않고 run() 이 같은 예외를 다시 발생시킵니다.
+
+    사용 예:
+        graph = TaskGraph(max_workers=8)
+        pre = graph.submit(run_pre, record)
+        graph.run()
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max(int(max_workers), 1)
+        self._queues = [deque() for _ in range(self.max_workers)]
+        self._cond = threading.Condition()
+        self._injector = deque()
+        self._local = threading.local()
+        self._pending = 0
+        self._fatal = None
+        self.tasks = []
+        self.steals = 0
+
+    def submit(self, func, *args, deps=(), name=None, **kwargs) -> Task:
+        """
+        작업 추가 (run() 전 또는 실행 중인 작업 안에서 호출)
+
+        Args:
+            func (callable): 실행 함수
+            deps (iterable[Task]): 선행 작업 (모두 완료 후 실행)
+            name (str): 로그/메트릭용 작업 이름 (기본값 : 함수명)
+
+        Returns:
+            Task: 추가된 작업
+        """
+        task = Task(func, args, kwargs, deps, name)
+        with self._cond:
+            self.tasks.append(task)
+            self._pending += 1
+            for dep in task.deps:
+                if not dep.done:
+                    task._waiting += 1
+                    dep._dependents.append(task)
+            if task._waiting == 0:
+                self._push(task)
+        return task
+
+    def _push(self, task):
+        # 워커 안에서 만든 작업은 자기 deque 로, 외부에서 만든 작업은 공용 대기열로 (cond 보유 상태에서 호출)
+        worker_id = getattr(self._local, "worker_id", None)
+        if worker_id is None:
+            self._injector.append(task)
+        else:
+            self._queues[worker_id].append(task)
+        self._cond.notify()
+
+    def _take(self, worker_id):
+        own = self._queues[worker_id]
+        if own:
+            return own.pop()
+        if self._injector:
+            return self._injector.popleft()
+        victims = [q for q in self._queues if q]
+        if victims:
+            self.steals += 1
+            return random.choice(victims).popleft()
+        return None
+
+    def _finish(self, task):
+        with self._cond:
+            task.done = True
+            self._pending -= 1
+            for dependent in task._dependents:
+                dependent._waiting -= 1
+                if dependent._waiting == 0:
+                    self._push(dependent)
+            self._cond.notify_all()
+
+    def _worker(self, worker_id):
+        self._local.worker_id = worker_id
+        while True:
+            with self._cond:
+                while True:
+                    if self._fatal is not None:
+                        return
+                    task = self._take(worker_id)
+                    if task is not None:
+                        break
+                    if self._pending == 0:
+                        return
+                    self._cond.wait()
+
+            failed = next((dep for dep in task.deps if dep.error is not None), None)
+            if failed is not None:
+                task.error = failed.error
+            else:
+                try:
+                    with metrics.timer(f"task_{task.name}"):
+                        task.result = task.func(*task.args, **task.kwargs)
+                except Exception as e:
+                    logger.error(f"[GRAPH] 작업 실패 ({task.name}): {e}", exc_info=True)
+                    task.error = e
+                except BaseException as e:
+                    # 작업을 실패 처리하고 대기 중인 워커를 깨운 뒤 전파 (run() 이 무한 대기하지 않도록)
+                    logger.error(f"[GRAPH] 작업 중단 ({task.name}): {e!r}")
+                    task.error = e
+                    with self._cond:
+                        self._fatal = e
+                    self._finish(task)
+                    raise
+            self._finish(task)
+
+    def run(self):
+        """
+        모든 작업(실행 중 추가된 작업 포함)이 끝날 때까지 실행
+
+        Returns:
+            list[Task]: 추가된 전체 작업
+
+        Raises:
+            BaseException: 작업에서 발생한 KeyboardInterrupt / SystemExit 등 (Exception 은 task.error 에만 저장)
+        """
+        threads = [
+            threading.Thread(target=self._worker, args=(n,), name=f"graph-{n}", daemon=True)
+            for n in range(self.max_workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if self._fatal is not None:
+            raise self._fatal
+        logger.info(f"[GRAPH] 작업 {len(self.tasks)}건 완료 (steal {self.steals}회)")
+        return self.tasks
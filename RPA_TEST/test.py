@@ -1,3 +1,7 @@
+from replay import save_idp_manifest
+from priority_scheduler import PriorityScheduler
+from image_dedup import DedupIndex, reuse_duplicate_ocr, mark_ocr_result
+
 # --- 어댑터: 회사 스레드 유틸용 (_adapter_execute_worker) ---
 def _adapter_execute_worker(params: dict) -> dict:
     """
@@ -31,6 +35,10 @@ def execute(duser_input: dict) -> str:
 
     duser_input = das_process_setup(duser_input)
 
+    # 배치 단위 이미지 중복 인덱스 (전처리에서 중복 표시, execute_worker 에서 OCR 재사용)
+    dedup_index = DedupIndex.from_config(duser_input) if duser_input.get("dedup", True) else None
+    duser_input["dedup_index"] = dedup_index
+
     # 2) DB에서 대상 레코드 조회 (원본 유지)
     try:
         data_records = query_data_by_date(duser_input)
@@ -70,16 +78,30 @@ def execute(duser_input: dict) -> str:
         logger.info("📭 생성된 OCR 대상 아이템이 없습니다.")
         return json.dumps(ret, ensure_ascii=False, indent=2)
 
+    # 재생 모드(execute_replay) 입력 매니페스트 저장 (OCR JSON 경로는 execute_worker 와 같은 규칙)
+    try:
+        azure_dir = duser_input.get("idp_azure_dir") or os.path.join(duser_input["idp_workspace_dir"], "Azure")
+        save_idp_manifest(idp_items, azure_dir, duser_input.get("replay_manifest_path"))
+    except Exception:
+        logger.exception("[WARN] idp_items 매니페스트 저장 실패 - 계속 진행")
+
     # 4) (멀티스레드) 아이템 단위 워커 실행: OCR → 후처리 → DB
+    #    ATTACH_FILE(COMMON_YN=0) 아이템 우선, 같은 클래스는 크롭 파일 크기가 작은 순 (FILE_PATH 동시 실행 상한 적용)
     func_params_list = [
         {"idp_item": idp_item, "duser_input": duser_input}
         for idp_item in idp_items
     ]
 
-    results = idp_utils.run_in_multi_thread(
-        func=_adapter_execute_worker,
-        func_params_list=func_params_list,
+    results = PriorityScheduler.from_config(duser_input).run(
+        _adapter_execute_worker,
+        func_params_list,
+        item_key="idp_item",
     )
+    results = [r if r is not None else {**p["idp_item"], "has_error": True, "error_message": "워커 예외"}
+               for r, p in zip(results, func_params_list)]
+
+    if dedup_index is not None:
+        dedup_index.save()
 
     # 5) 결과 집계 후 반환
     ret = {
@@ -135,8 +157,21 @@ def execute_worker(idp_item: dict, duser_input: dict) -> dict:
         if run_azure_ocr is None:
             raise RuntimeError("run_azure_ocr 함수 import 실패")
 
-        ocr_in = {**idp_item}  # 필요 시 필드 축약/확장 가능
-        ocr_out = run_azure_ocr(duser_input, ocr_in)
+        # 중복 크롭(DUPLICATE_OF)은 원본 OCR 결과 재사용 (Azure 호출 생략)
+        azure_dir = duser_input.get("idp_azure_dir") or os.path.join(duser_input["idp_workspace_dir"], "Azure")
+        expected_json_path = os.path.join(azure_dir, f"{Path(idp_item.get('file_path') or '').stem}.ocr.json")
+        reused_json_path = reuse_duplicate_ocr(duser_input, idp_item, expected_json_path)
+
+        if reused_json_path:
+            ocr_out = {}
+        else:
+            ocr_in = {**idp_item}  # 필요 시 필드 축약/확장 가능
+            ocr_ok = False
+            try:
+                ocr_out = run_azure_ocr(duser_input, ocr_in)
+                ocr_ok = not (isinstance(ocr_out, dict) and str(ocr_out.get("RESULT_CODE")) in ("AZURE_ERR", "500"))
+            finally:
+                mark_ocr_result(duser_input, idp_item, ocr_ok, expected_json_path)
 
         if isinstance(ocr_out, dict) and str(ocr_out.get("RESULT_CODE")) in ("AZURE_ERR", "500"):
             msg = ocr_out.get("RESULT_MESSAGE", "Azure OCR 실패")
@@ -167,7 +202,7 @@ def execute_worker(idp_item: dict, duser_input: dict) -> dict:
             base_name = Path(idp_item.get("file_path") or "").stem or f"{fiid}_{line_idx}_{rcp_idx}"
         except Exception:
             base_name = f"{fiid}_{line_idx}_{rcp_idx}"
-        ocr_json_path = os.path.join(azure_dir, f"{base_name}.ocr.json")
+        ocr_json_path = reused_json_path or os.path.join(azure_dir, f"{base_name}.ocr.json")
 
         post_json_path = post_process_and_save(
             {**duser_input, "idp_postprocess_dir": duser_input.get("idp_postprocess_dir")},
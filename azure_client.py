@@ -1,9 +1,11 @@
 import os
-from azure.ai.formrecognizer import DocumentAnalysisClient
-from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
-from utils import setup_logger, ensure_dir, save_json
-from datetime import datetime
+from utils import setup_logger, ensure_dir, save_json, lazy_import
+from stage_metrics import metrics, stage_timer
+
+# Azure SDK 는 클라이언트 생성 시 로드
+formrecognizer = lazy_import('azure.ai.formrecognizer')
+azure_credentials = lazy_import('azure.core.credentials')
 
 # .env 파일 로드
 load_dotenv()
@@ -22,9 +24,9 @@ class AzureReceiptClient:
     def __init__(self):
         """Azure Form Recognizer 클라이언트 초기회"""
         try:
-            self.client = DocumentAnalysisClient(
+            self.client = formrecognizer.DocumentAnalysisClient(
                 endpoint=ENDPOINT,
-                credential=AzureKeyCredential(KEY)
+                credential=azure_credentials.AzureKeyCredential(KEY)
             )
             success_logger.info("[성공] Azure 클라이언트 초기화 완료")
         except Exception as e:
@@ -43,14 +45,15 @@ class AzureReceiptClient:
         """
         try:
             with open(image_path, "rb") as f:
-                poller = self.client.begin_analyze_document("prebuilt-receipt", document=f)
-                start_time = datetime.now()
-                result = poller.result()
-                elpased = (datetime.now() - start_time).total_seconds()
+                with stage_timer("ocr_submit"):
+                    poller = self.client.begin_analyze_document("prebuilt-receipt", document=f)
+                with stage_timer("ocr_poll") as span:
+                    result = poller.result()
                 success_logger.info(f"[성공] 분석 완료 : {image_path}")
-                success_logger.info(f"[정보] 분석 소요 시간: {elpased:.2f}초")
+                success_logger.info(f"[정보] 분석 소요 시간: {span['elapsed']:.2f}초")
                 return result.to_dict()
         except Exception as e:
+            metrics.incr("ocr_failed")
             fail_logger.error(f"[실패] 분석 실패: {image_path} - {e}")
             return None
     
@@ -0,0 +1,189 @@
+"""
+영수증 검출 백엔드(receipt_detectors) 속도 / 크롭 일치도 벤치마크
+
+- 백엔드별 이미지당 검출 시간 (이미지는 미리 디코딩, 검출 시간만 측정)
+- YOLO 대비 크롭 일치도 : 검출 박스를 IoU 기준으로 1:1 매칭하여 YOLO 박스 중 일치 비율(재현율),
+  검출 박스 중 일치 비율(정밀도), 평균 IoU
+- cascade : contour 결과 채택 비율과, 채택된 이미지에서의 YOLO 일치도 (나머지 이미지는 YOLO 결과 그대로)
+
+YOLO 기준 박스는 --yolo-model 로 직접 검출하거나, --save-reference 로 저장해 둔 JSON 을 --reference 로 읽습니다.
+(ultralytics 가 없는 환경에서도 contour / cascade 채택분의 일치도 측정 가능)
+둘 다 없으면 contour 속도/검출 통계만 출력합니다.
+
+실행:
+    python benchmarks/bench_detectors.py --yolo-model ./yolo/best.pt --repeat 5 --save-reference yolo_boxes.json
+    python benchmarks/bench_detectors.py --reference yolo_boxes.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from receipt_detectors import build_detector, CASCADE_MIN_SCORE
+from stage_metrics import metrics
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+def iou(a, b):
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(ix2 - ix1, 0) * max(iy2 - iy1, 0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match(boxes, reference, threshold):
+    """IoU 내림차순 탐욕 매칭 → (매칭 수, 매칭 IoU 리스트)"""
+    pairs = sorted(
+        ((iou(b, r), i, j) for i, b in enumerate(boxes) for j, r in enumerate(reference)),
+        reverse=True,
+    )
+    used_b, used_r, ious = set(), set(), []
+    for value, i, j in pairs:
+        if value < threshold or i in used_b or j in used_r:
+            continue
+        used_b.add(i)
+        used_r.add(j)
+        ious.append(value)
+    return len(ious), ious
+
+
+def agreement(results, reference, threshold, images=None):
+    """
+    YOLO 기준 박스 대비 일치도
+
+    Returns:
+        dict: reference / found / matched 박스 수, 평균 IoU
+    """
+    total_ref = total_found = matched = 0
+    all_ious = []
+    for image_name, ref_boxes in reference.items():
+        if image_name not in results or (images is not None and image_name not in images):
+            continue
+        boxes = [d["box"] for d in results[image_name]]
+        count, ious = match(boxes, ref_boxes, threshold)
+        total_ref += len(ref_boxes)
+        total_found += len(boxes)
+        matched += count
+        all_ious += ious
+    return {
+        "reference": total_ref,
+        "found": total_found,
+        "matched": matched,
+        "mean_iou": statistics.mean(all_ious) if all_ious else 0.0,
+    }
+
+
+def print_agreement(label, stats, threshold):
+    print(f"[{label:16s}] YOLO 대비 재현율 {stats['matched']}/{stats['reference']}, "
+          f"정밀도 {stats['matched']}/{stats['found']} (IoU>={threshold}), 평균 IoU {stats['mean_iou']:.3f}")
+
+
+def load_images(path):
+    images = []
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image_path = os.path.join(path, name)
+            with Image.open(image_path) as img:
+                images.append((name, image_path, img.convert("RGB")))
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영수증 검출 백엔드 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--yolo-model", default=None, help="YOLO 모델(.pt) 경로")
+    parser.add_argument("--min-score", type=float, default=CASCADE_MIN_SCORE, help="cascade contour 채택 최소 score")
+    parser.add_argument("--iou", type=float, default=0.5, help="일치 판정 IoU")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--reference", default=None, help="저장해 둔 YOLO 검출 박스 JSON (--save-reference 결과)")
+    parser.add_argument("--save-reference", default=None, help="YOLO 검출 박스를 JSON 으로 저장")
+    args = parser.parse_args()
+
+    backends = ["contour"]
+    if args.yolo_model:
+        try:
+            import ultralytics  # noqa: F401
+            backends = ["yolo", "contour", "cascade"]
+        except ImportError:
+            print("ultralytics 미설치 → contour 만 측정합니다.")
+    elif not args.reference:
+        print("--yolo-model / --reference 미지정 → contour 만 측정합니다. (일치도 비교 불가)")
+
+    images = load_images(args.images)
+    detectors = {
+        name: build_detector(name, model_path=args.yolo_model, min_score=args.min_score)
+        for name in backends
+    }
+
+    results = {name: {} for name in backends}
+    timings = {name: [] for name in backends}
+    for name, detector in detectors.items():
+        detector(images[0][2], images[0][1])  # 모델 로드 / 워밍업
+        metrics.reset()
+        for image_name, image_path, img in images:
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                detections = detector(img, image_path)
+                samples.append(time.perf_counter() - start)
+            timings[name].append(statistics.median(samples) * 1000)
+            results[name][image_name] = detections
+        if name == "cascade":
+            counters = metrics.to_dict()["counters"]
+            primary = counters.get("cascade_primary", 0)
+            print(f"cascade contour 채택: {primary}/{primary + counters.get('cascade_fallback', 0)} 회")
+
+    print()
+    print(f"{'이미지':22s} " + " ".join(f"{n + '(개/score)':>20s}" for n in backends))
+    for image_name, _, _ in images:
+        cells = []
+        for name in backends:
+            dets = results[name][image_name]
+            top = f"{dets[0]['score']:.2f}" if dets else "-"
+            cells.append(f"{len(dets):>14d} / {top:>4s}")
+        print(f"{image_name:22s} " + " ".join(cells))
+
+    print()
+    for name in backends:
+        found = sum(1 for dets in results[name].values() if dets)
+        print(f"[{name:8s}] 검출 시간 중앙값 {statistics.median(timings[name]):7.1f} ms, "
+              f"최대 {max(timings[name]):7.1f} ms / 이미지, 검출 이미지 {found}/{len(images)}")
+
+    reference = None
+    if "yolo" in backends:
+        reference = {image_name: [list(d["box"]) for d in dets] for image_name, dets in results["yolo"].items()}
+        if args.save_reference:
+            with open(args.save_reference, "w", encoding="utf-8") as f:
+                json.dump(reference, f, ensure_ascii=False, indent=2)
+            print(f"YOLO 기준 박스 저장: {args.save_reference}")
+    elif args.reference:
+        with open(args.reference, encoding="utf-8") as f:
+            reference = json.load(f)
+    if reference is None:
+        return
+
+    # cascade 가 contour 결과를 채택하는 이미지 (CascadeDetector 와 같은 조건, 나머지는 YOLO 결과와 동일)
+    accepted = {
+        image_name for image_name, dets in results["contour"].items()
+        if dets and min(d["score"] for d in dets) >= args.min_score
+    }
+    print()
+    print_agreement("contour", agreement(results["contour"], reference, args.iou), args.iou)
+    print_agreement(f"cascade 채택 {len(accepted)}장",
+                    agreement(results["contour"], reference, args.iou, images=accepted), args.iou)
+    if "cascade" in results:
+        print_agreement("cascade", agreement(results["cascade"], reference, args.iou), args.iou)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+전체 파이프라인(RPA_TEST) 엔드투엔드 처리량 벤치마크
+
+실 Azure / HANA DB 없이 extractor 의 레코드 처리 흐름을 그대로 실행합니다.
+    - 이미지 서버   : input_images/ 를 로컬 HTTP 로 제공 (ATTACH_FILE / FILE_PATH URL)
+    - 가짜 Azure    : Form Recognizer REST 프로토콜(analyze → Operation-Location → polling) 흉내,
+                      results/json 의 OCR 결과를 재생 (지연 / 제출 오류율 / 분석 실패율 설정)
+    - DB            : SQLite (LDCOM_CARDFILE_LOG 에 합성 레코드 N건 적재 후 query_data_by_date 로 조회)
+    - 지표          : stage_metrics 스테이지별 p50/p95/p99, 문서/초, 1k 페이지당 비용
+
+드라이버:
+    - stages    (기본) : extractor.execute_worker 와 같은 순서로 RPA_TEST 스테이지 함수를 호출
+                         (--yolo-model 미지정 시 YOLO 대신 변환 이미지 전체를 영수증 1장으로 사용)
+    - extractor        : extractor.execute_worker 를 직접 호출 (배포 런타임에서 extractor 임포트 가능 시)
+
+실행:
+    python benchmarks/bench_e2e.py --records 200 --workers 8 --azure-latency 0.8 --azure-error-rate 0.02
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "RPA_TEST"))
+
+from stage_metrics import metrics, stage_timer
+
+TARGET_DATE = "2025-09-03"
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+# =============================================
+# SDK to_dict() 형식 → REST analyzeResult 형식 변환 (가짜 Azure 응답용)
+# =============================================
+REST_FIELD_TYPES = {"float": "number", "list": "array", "dictionary": "object"}
+REST_VALUE_KEYS = {
+    "string": "valueString", "date": "valueDate", "time": "valueTime", "phoneNumber": "valuePhoneNumber",
+    "float": "valueNumber", "integer": "valueInteger", "selectionMark": "valueSelectionMark",
+    "countryRegion": "valueCountryRegion", "signature": "valueSignature", "currency": "valueCurrency",
+    "address": "valueAddress", "boolean": "valueBoolean", "list": "valueArray", "dictionary": "valueObject",
+}
+
+
+def _camel(key):
+    head, *rest = key.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def _to_rest_field(field):
+    value_type = field.get("value_type")
+    value = field.get("value")
+    out = {"type": REST_FIELD_TYPES.get(value_type, value_type)}
+    for key in ("content", "bounding_regions", "spans", "confidence"):
+        if field.get(key) is not None:
+            out[_camel(key)] = _to_rest(field[key])
+    if value is None:
+        return out
+    if value_type == "list":
+        value = [_to_rest_field(item) for item in value]
+    elif value_type == "dictionary":
+        value = {name: _to_rest_field(item) for name, item in value.items()}
+    elif value_type == "currency":
+        value = {"amount": value.get("amount"), "currencySymbol": value.get("symbol"), "currencyCode": value.get("code")}
+    elif isinstance(value, dict):
+        value = _to_rest(value)
+    out[REST_VALUE_KEYS.get(value_type, "valueString")] = value
+    return out
+
+
+def _to_rest(obj):
+    if isinstance(obj, list):
+        return [_to_rest(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, value in obj.items():
+        if key == "polygon" and value and isinstance(value[0], dict):
+            out[key] = [coord for point in value for coord in (point["x"], point["y"])]
+        elif key == "fields":
+            out[key] = {name: _to_rest_field(field) for name, field in value.items()}
+        else:
+            out[_camel(key)] = _to_rest(value)
+    return out
+
+
+def load_payloads(json_dir):
+    """results/json 에서 OCR 원본 결과만 읽어 REST analyzeResult 형식으로 반환"""
+    payloads = []
+    for path in sorted(Path(json_dir).glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if "analyzeResult" in data:
+            payloads.append(data["analyzeResult"])
+        elif "pages" in data:
+            payloads.append(_to_rest(data))
+    return payloads
+
+
+# =============================================
+# 가짜 Azure Form Recognizer
+# =============================================
+class FakeAzure:
+    """
+    REST 프로토콜만 흉내내는 OCR 서버 (결과는 재생 payload 순환)
+
+    - POST .../documentModels/{model}:analyze  → submit_error_rate 확률로 429, 아니면 202 + Operation-Location
+    - GET  .../analyzeResults/{id}              → latency 경과 전 running, 이후 succeeded
+                                                  (fail_rate 확률로 failed, 과금은 됨)
+    """
+
+    def __init__(self, payloads, latency=0.8, jitter=0.3, submit_error_rate=0.0, fail_rate=0.0, seed=0):
+        self.payloads = itertools.cycle(payloads)
+        self.latency = latency
+        self.jitter = jitter
+        self.submit_error_rate = submit_error_rate
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.operations = {}
+        self.stats = {"submitted": 0, "throttled": 0, "billed_pages": 0, "failed": 0}
+
+    def submit(self):
+        with self.lock:
+            if self.random.random() < self.submit_error_rate:
+                self.stats["throttled"] += 1
+                return None
+            result_id = uuid.uuid4().hex
+            delay = max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0)
+            failed = self.random.random() < self.fail_rate
+            payload = next(self.payloads)
+            self.operations[result_id] = (time.monotonic() + delay, failed, payload)
+            self.stats["submitted"] += 1
+            self.stats["billed_pages"] += len(payload.get("pages") or [None])
+            self.stats["failed"] += failed
+            return result_id
+
+    def poll(self, result_id):
+        with self.lock:
+            ready_at, failed, payload = self.operations.get(result_id, (None, None, None))
+        now = datetime.now(timezone.utc).isoformat()
+        body = {"createdDateTime": now, "lastUpdatedDateTime": now}
+        if ready_at is None:
+            return None
+        if time.monotonic() < ready_at:
+            body["status"] = "running"
+        elif failed:
+            body.update(status="failed", error={"code": "InternalServerError", "message": "fake analyze failure"})
+        else:
+            body.update(status="succeeded", analyzeResult=payload)
+        return body
+
+    def handler(self, poll_interval):
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body=None, headers=None):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                path, _, query = self.path.partition("?")
+                if not path.endswith(":analyze"):
+                    self._send(404, {"error": {"code": "NotFound", "message": path}})
+                    return
+                result_id = fake.submit()
+                if result_id is None:
+                    self._send(429, {"error": {"code": "429", "message": "Rate limit exceeded (fake)"}},
+                               {"Retry-After": "1"})
+                    return
+                location = f"http://{self.headers['Host']}{path[:-len(':analyze')]}/analyzeResults/{result_id}?{query}"
+                self._send(202, None, {"Operation-Location": location, "Retry-After": str(poll_interval)})
+
+            def do_GET(self):
+                result_id = self.path.partition("?")[0].rsplit("/", 1)[-1]
+                body = fake.poll(result_id)
+                if body is None:
+                    self._send(404, {"error": {"code": "NotFound", "message": result_id}})
+                else:
+                    self._send(200, body, {"Retry-After": str(poll_interval)})
+
+            def log_message(self, format, *args):
+                pass
+
+        return _Handler
+
+
+def start_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _QuietImageHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+# =============================================
+# SQLite DB
+# =============================================
+SUMM_COLUMNS = ("FIID", "GUBUN", "LINE_INDEX", "RECEIPT_INDEX", "COMMON_YN", "ATTACH_FILE", "COUNTRY",
+                "RECEIPT_TYPE", "MERCHANT_NAME", "MERCHANT_PHONE_NO", "DELIVERY_ADDR", "TRANSACTION_DATE",
+                "TRANSACTION_TIME", "TOTAL_AMOUNT", "SUMTOTAL_AMOUNT", "TAX_AMOUNT", "BIZ_NO",
+                "RESULT_CODE", "RESULT_MESSAGE", "CREATE_DATE", "UPDATE_DATE")
+ITEM_COLUMNS = ("FIID", "LINE_INDEX", "RECEIPT_INDEX", "ITEM_INDEX", "ITEM_NAME", "ITEM_QTY", "ITEM_UNIT_PRICE",
+                "ITEM_TOTAL_PRICE", "CONTENTS", "COMMON_YN", "CREATE_DATE", "UPDATE_DATE")
+
+
+def create_database(db_path, image_base_url, image_names, records, file_path_ratio, seed=0):
+    """SQLite 스키마 생성 + 합성 레코드 적재 (FILE_PATH 는 file_path_ratio 비율로만 채움)"""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    rnd = random.Random(seed)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE LDCOM_CARDFILE_LOG (FIID TEXT, SEQ INTEGER, GUBUN TEXT, "
+                          "ATTACH_FILE TEXT, FILE_PATH TEXT, LOAD_DATE TEXT)"))
+        conn.execute(text(f"CREATE TABLE RPA_CCR_LINE_SUMM ({', '.join(f'{c} TEXT' for c in SUMM_COLUMNS)})"))
+        conn.execute(text(f"CREATE TABLE RPA_CCR_LINE_ITEMS ({', '.join(f'{c} TEXT' for c in ITEM_COLUMNS)})"))
+        rows = []
+        for i in range(records):
+            # 레코드마다 다른 URL (다운로드 파일명이 레코드 폴더 안에서만 겹치도록)
+            attach = f"{image_base_url}/{rnd.choice(image_names)}?r={i}"
+            file_path = f"{image_base_url}/{rnd.choice(image_names)}?r={i}" if rnd.random() < file_path_ratio else None
+            rows.append({"FIID": f"BENCH{i:06d}", "SEQ": 1, "GUBUN": rnd.choice("YN"),
+                         "ATTACH_FILE": attach, "FILE_PATH": file_path, "LOAD_DATE": TARGET_DATE})
+        conn.execute(text("INSERT INTO LDCOM_CARDFILE_LOG VALUES (:FIID, :SEQ, :GUBUN, :ATTACH_FILE, :FILE_PATH, :LOAD_DATE)"), rows)
+    return engine
+
+
+# =============================================
+# 레코드 처리 (extractor.execute_worker 와 동일한 단계 순서)
+# =============================================
+def passthrough_pre_process(in_params, record):
+    """YOLO 없이 다운로드 → PNG 변환 후 이미지 전체를 영수증 1장으로 사용"""
+    from pre_process import download_file_from_url, convert_to_png
+
+    results = []
+    for file_type in ("ATTACH_FILE", "FILE_PATH"):
+        url = record.get(file_type)
+        if not url:
+            continue
+        download_dir = os.path.join(in_params["download_dir"], f"{record['FIID']}_{file_type}")
+        orig_path = download_file_from_url(url, download_dir, is_file_path=(file_type == "FILE_PATH"))
+        if not orig_path:
+            continue
+        results.append({
+            "FIID": record["FIID"], "LINE_INDEX": record["LINE_INDEX"], "GUBUN": record["GUBUN"],
+            "RECEIPT_INDEX": 1, "COMMON_YN": 0 if file_type == "ATTACH_FILE" else 1,
+            "file_path": convert_to_png(orig_path, download_dir),
+            "source_url": url,
+        })
+    return results
+
+
+def process_record(record, duser_input, pre_process_func):
+    from doc_process import run_azure_ocr
+    from post_process import post_process_and_save
+    from db_master import insert_postprocessed_result
+
+    with stage_timer("record_total"):
+        for cropped in pre_process_func(duser_input, record):
+            if "RESULT_CODE" in cropped:
+                metrics.incr("crop_failed")
+                continue
+            metrics.incr("pages")
+            ocr_result = run_azure_ocr(duser_input, cropped)
+            if ocr_result.get("RESULT_CODE") == "AZURE_ERR":
+                continue
+            json_path = os.path.join(
+                duser_input["ocr_json_dir"],
+                f"{os.path.splitext(os.path.basename(cropped['file_path']))[0]}.ocr.json"
+            )
+            post_json_path = post_process_and_save(
+                duser_input, {**cropped, "json_path": json_path, "ATTACH_FILE": cropped.get("source_url")}
+            )
+            insert_postprocessed_result(post_json_path, duser_input)
+            metrics.incr("pages_succeeded")
+
+
+# =============================================
+# 실행
+# =============================================
+def main():
+    parser = argparse.ArgumentParser(description="RPA_TEST 엔드투엔드 처리량 벤치마크 (가짜 Azure + SQLite)")
+    parser.add_argument("--records", type=int, default=100, help="합성 레코드 수")
+    parser.add_argument("--workers", type=int, default=8, help="레코드 처리 스레드 수")
+    parser.add_argument("--image-dir", default=str(ROOT / "input_images"))
+    parser.add_argument("--json-dir", default=str(ROOT / "results" / "json"), help="재생할 OCR 결과 폴더")
+    parser.add_argument("--file-path-ratio", type=float, default=0.3, help="FILE_PATH 도 채울 레코드 비율")
+    parser.add_argument("--azure-latency", type=float, default=0.8, help="분석 완료까지 평균 지연(초)")
+    parser.add_argument("--azure-jitter", type=float, default=0.3, help="지연 편차(초, 균등 분포)")
+    parser.add_argument("--azure-poll-interval", type=float, default=0.2, help="Retry-After 로 알려줄 polling 간격(초)")
+    parser.add_argument("--azure-error-rate", type=float, default=0.0, help="제출 단계 429 비율 (미과금)")
+    parser.add_argument("--azure-fail-rate", type=float, default=0.0, help="분석 실패 비율 (과금)")
+    parser.add_argument("--price-per-1k", type=float, default=10.0, help="1,000 페이지당 OCR 단가 (USD)")
+    parser.add_argument("--yolo-model", default=None, help="YOLO 모델 경로 (지정 시 run_pre_pre_process 사용)")
+    parser.add_argument("--driver", choices=("stages", "extractor"), default="stages")
+    parser.add_argument("--work-dir", default=None, help="작업 폴더 (기본값 : 임시 폴더, 종료 시 삭제)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    image_names = sorted(p.name for p in Path(args.image_dir).iterdir() if p.suffix.lower() in IMAGE_EXTS)
+    payloads = load_payloads(args.json_dir)
+    if not image_names or not payloads:
+        print(f"입력 이미지({args.image_dir}) 또는 OCR 결과({args.json_dir})가 없습니다.")
+        return
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="bench_e2e_")
+    os.makedirs(work_dir, exist_ok=True)
+
+    fake = FakeAzure(payloads, args.azure_latency, args.azure_jitter, args.azure_error_rate, args.azure_fail_rate)
+    image_server, image_url = start_server(partial(_QuietImageHandler, directory=args.image_dir))
+    azure_server, azure_url = start_server(fake.handler(args.azure_poll_interval))
+
+    try:
+        engine = create_database(os.path.join(work_dir, "bench.db"), image_url, image_names,
+                                 args.records, args.file_path_ratio)
+        local = threading.local()
+
+        def thread_conn():
+            # SQLite 연결은 스레드별로 사용
+            if not hasattr(local, "conn"):
+                local.conn = engine.connect()
+            return local.conn
+
+        duser_input = {
+            "target_date": TARGET_DATE,
+            "azure_endpoint": azure_url,
+            "azure_key": "fake-key",
+            "download_dir": os.path.join(work_dir, "download"),
+            "yolo_model_path": args.yolo_model,
+            "ocr_json_dir": os.path.join(work_dir, "ocr_json"),
+            "idp_azure_dir": os.path.join(work_dir, "ocr_json"),
+            "error_json_dir": os.path.join(work_dir, "error_json"),
+            "postprocess_output_dir": os.path.join(work_dir, "post_json"),
+            "idp_postprocess_dir": os.path.join(work_dir, "post_json"),
+            "post_json_dir": os.path.join(work_dir, "error_json"),
+            "idp_error_dir": os.path.join(work_dir, "error_json"),
+        }
+
+        from db_master import query_data_by_date
+        with stage_timer("db_query"):
+            data_records = query_data_by_date({**duser_input, "sqlalchemy_conn": thread_conn()})
+
+        if args.driver == "extractor":
+            from extractor import execute_worker
+
+            def run_one(record):
+                execute_worker(record, {**duser_input, "sqlalchemy_conn": thread_conn()})
+        else:
+            if args.yolo_model:
+                from pre_process import run_pre_pre_process as pre_process_func
+            else:
+                pre_process_func = passthrough_pre_process
+
+            def run_one(record):
+                process_record(record, {**duser_input, "sqlalchemy_conn": thread_conn()}, pre_process_func)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(run_one, data_records))
+        elapsed = time.perf_counter() - start
+
+        with engine.connect() as conn:
+            from sqlalchemy import text
+            inserted = conn.execute(text("SELECT COUNT(*) FROM RPA_CCR_LINE_SUMM")).scalar()
+    finally:
+        image_server.shutdown()
+        azure_server.shutdown()
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    summary = metrics.to_dict()
+    succeeded = summary["counters"].get("pages_succeeded", 0)
+    cost = fake.stats["billed_pages"] * args.price_per_1k / 1000
+    result = {
+        "records": len(data_records),
+        "workers": args.workers,
+        "elapsed_sec": round(elapsed, 3),
+        "docs_per_sec": round(len(data_records) / elapsed, 2) if elapsed else 0.0,
+        "pages_per_sec": round(succeeded / elapsed, 2) if elapsed else 0.0,
+        "db_rows_inserted": inserted,
+        "azure": fake.stats,
+        "cost_usd": round(cost, 4),
+        "cost_per_1k_pages_usd": round(cost / succeeded * 1000, 4) if succeeded else None,
+        **summary,
+    }
+
+    print(f"레코드 {result['records']}건, 스레드 {args.workers}, 소요 {result['elapsed_sec']}s")
+    print(f"처리량: {result['docs_per_sec']} 문서/초, {result['pages_per_sec']} 페이지/초 (DB 저장 {inserted}건)")
+    print(f"Azure: {fake.stats}")
+    print(f"비용: ${result['cost_usd']} (성공 1k 페이지당 ${result['cost_per_1k_pages_usd']})")
+    print(f"{'stage':<20}{'n':>7}{'p50(ms)':>11}{'p95(ms)':>11}{'p99(ms)':>11}")
+    for stage, s in summary["stages"].items():
+        print(f"{stage:<20}{s['count']:>7}{s['p50_ms']:>11}{s['p95_ms']:>11}{s['p99_ms']:>11}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+JPEG 축소 디코딩(image_decode.open_reduced / read_gray) 시간 절감 벤치마크
+
+목표 크기(YOLO 640, 전처리 1024, 검출 1280)별로 원본 디코딩 대비 축소 디코딩 시간과 배율을 측정합니다.
+input_images 의 JPEG 는 대부분 작아 축소 대상이 적으므로 --phone-size 로 긴 변을 키운 사본(휴대폰 사진 크기)을 함께 측정합니다.
+
+실행:
+    python benchmarks/bench_image_decode.py --phone-size 4032 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from image_decode import decode_savings, open_reduced, read_gray, reduction_factor
+from stage_metrics import metrics
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def full_decode(path):
+    with Image.open(path) as img:
+        return img.convert("RGB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JPEG 축소 디코딩 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--phone-size", type=int, default=None, help="긴 변을 이 크기로 키운 JPEG 사본으로 측정")
+    parser.add_argument("--targets", type=int, nargs="+", default=[640, 1024, 1280])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = [os.path.join(args.images, f) for f in sorted(os.listdir(args.images)) if f.lower().endswith((".jpg", ".jpeg"))]
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.phone_size:
+            photos = []
+            for path in paths:
+                img = cv2.imread(path)
+                scale = args.phone_size / max(img.shape[:2])
+                photo = os.path.join(tmp, os.path.basename(path))
+                cv2.imwrite(photo, cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC),
+                            [cv2.IMWRITE_JPEG_QUALITY, 90])
+                photos.append(photo)
+            paths = photos
+
+        print(f"{'이미지':20s} {'크기':>11s} {'원본 PIL(ms)':>12s} " +
+              " ".join(f"{f'{t}px PIL / cv2(ms)':>22s}" for t in args.targets))
+        totals = {"full": 0.0, **{t: 0.0 for t in args.targets}}
+        for path in paths:
+            with Image.open(path) as img:
+                size = img.size
+            full_ms = median_ms(lambda: full_decode(path), args.repeat)
+            cv2_full_ms = median_ms(lambda: cv2.imread(path, cv2.IMREAD_GRAYSCALE), args.repeat)
+            totals["full"] += full_ms
+            cells = []
+            for target in args.targets:
+                pil_ms = median_ms(lambda: open_reduced(path, target), args.repeat)
+                gray_ms = median_ms(lambda: read_gray(path, target), args.repeat)
+                totals[target] += pil_ms
+                cells.append(f"1/{reduction_factor(size, target)} {pil_ms:6.1f} / {gray_ms:5.1f} ({cv2_full_ms:5.1f})")
+            print(f"{os.path.basename(path):20s} {f'{size[0]}x{size[1]}':>11s} {full_ms:12.1f} " +
+                  " ".join(f"{c:>22s}" for c in cells))
+
+        print()
+        for target in args.targets:
+            saved = totals["full"] - totals[target]
+            print(f"목표 {target}px : PIL 디코딩 합계 {totals['full']:.0f} → {totals[target]:.0f} ms "
+                  f"({saved / totals['full']:.0%} 절감)" if totals["full"] else "")
+
+        metrics.reset()
+        for path in paths:
+            open_reduced(path, 1280)
+        print(f"decode_savings() (목표 1280px 1회씩) : {decode_savings()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+파이프라인 진입점 임포트(기동) 시간 벤치마크
+
+각 진입점 모듈을 새 파이썬 프로세스에서 `-X importtime` 으로 임포트하여
+전체 임포트 시간과 가장 무거운 하위 모듈 상위 N개를 출력합니다.
+(로그 파일이 저장소에 생기지 않도록 임시 폴더를 작업 디렉토리로 사용)
+
+실행:
+    python benchmarks/bench_import_time.py --repeat 3 --top 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# (표시 이름, 모듈 이름, 모듈 폴더)
+ENTRY_POINTS = [
+    ("run_pipeline", "run_pipeline", ROOT),
+    ("main", "main", ROOT),
+    ("preprocessing", "preprocessing", ROOT),
+    ("azure_client", "azure_client", ROOT),
+    ("postprocessing", "postprocessing", ROOT),
+    ("RPA_TEST/pre_process", "pre_process", ROOT / "RPA_TEST"),
+]
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        list: [(cumulative_us, self_us, module_name), ...]
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((int(cumulative_us), int(self_us), name[1:].rstrip()))  # 들여쓰기 = 중첩 깊이
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str, module_dir: Path, workdir: str) -> tuple:
+    """
+    새 프로세스에서 모듈 1회 임포트
+
+    Returns:
+        tuple: (총 임포트 시간(us) 또는 None, importtime 행 리스트, 에러 메시지)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(module_dir), str(ROOT)]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir, env=env, capture_output=True, text=True
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return None, rows, error
+
+    total = next((cum for cum, _, name in rows if name == module), None)
+    return total, rows, None
+
+
+def direct_children(rows: list, module: str) -> list:
+    """진입점 모듈이 직접 임포트한 하위 모듈 (누적 시간 내림차순)"""
+    names = [name for _, _, name in rows]
+    if module not in names:
+        return []
+    children = []
+    for row in reversed(rows[:names.index(module)]):
+        indent = len(row[2]) - len(row[2].lstrip())
+        if indent == 0:
+            break
+        children.append((indent, row))
+    if not children:
+        return []
+    depth = min(indent for indent, _ in children)
+    return sorted((row for indent, row in children if indent == depth), reverse=True)
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진입점 임포트 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="진입점별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 무거운 하위 모듈 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, module, module_dir in ENTRY_POINTS:
+            totals, last_rows, error = [], [], None
+            for _ in range(args.repeat):
+                total, rows, error = measure(module, module_dir, workdir)
+                if total is None:
+                    break
+                totals.append(total)
+                last_rows = rows
+
+            print(f"=== {label}")
+            if error:
+                print(f"  임포트 실패: {error}")
+                continue
+
+            print(f"  임포트 시간(중앙값): {statistics.median(totals) / 1000:.1f} ms  (n={len(totals)})")
+            for cumulative_us, _, name in direct_children(last_rows, module)[:args.top]:
+                print(f"  {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+postprocess_receipt_json 라인 추출 벤치마크
+
+기존 3-pass (사업자번호 / 배송지 / 전화번호 개별 re.search) 방식과
+ReceiptLineScanner 단일 스캔 방식을 results/json 코퍼스로 비교합니다.
+
+실행:
+    python benchmarks/bench_line_scanner.py --json-dir ./results/json --repeat 200
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "RPA"))
+
+from receipt_line_scanner import scan_receipt_json
+
+
+# ─ 기존 3-pass 구현 (비교 기준) ─
+def _legacy_extract(analyze_result: dict) -> dict:
+    lines = analyze_result.get("pages", [{}])[0].get("lines", [])
+    full_text = analyze_result.get("content", "")
+
+    biz_no = ""
+    for line in lines:
+        text = line.get("content", "")
+        if "사업자번호" in text or "사업자 번호" in text:
+            match = re.search(r"\d{3}-\d{2}-\d{5}", text)
+            if match:
+                biz_no = match.group()
+                break
+    if not biz_no:
+        match = re.search(r"\d{3}-\d{2}-\d{5}", full_text)
+        biz_no = match.group() if match else ""
+
+    address = ""
+    for line in lines:
+        text = line.get("content", "")
+        if "배송지" in text:
+            address = text
+            break
+
+    match = re.search(r"0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4}", full_text)
+    phone = match.group() if match else ""
+
+    return {"business_number": biz_no, "phone_number": phone, "shipping_address": address}
+
+
+def load_corpus(json_dir: Path) -> list:
+    corpus = []
+    for path in sorted(json_dir.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        analyze_result = data.get("analyzeResult", data)
+        if "content" not in analyze_result and "pages" not in analyze_result:
+            continue  # 후처리 결과 등 OCR 원본이 아닌 파일 제외
+        corpus.append((path.name, analyze_result))
+    return corpus
+
+
+def bench(func, corpus: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, analyze_result in corpus:
+            func(analyze_result)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="라인 추출 3-pass vs 단일 스캔 벤치마크")
+    parser.add_argument("--json-dir", default="./results/json")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus(Path(args.json_dir))
+    if not corpus:
+        print(f"OCR JSON 이 없습니다: {args.json_dir}")
+        return
+
+    mismatches = 0
+    for name, analyze_result in corpus:
+        legacy = _legacy_extract(analyze_result)
+        scanned = scan_receipt_json(analyze_result)
+        diff = {k: (legacy[k], scanned[k]) for k in legacy if legacy[k] != scanned[k]}
+        if diff:
+            mismatches += 1
+            print(f"[차이] {name}: {diff}")
+
+    legacy_sec = bench(_legacy_extract, corpus, args.repeat)
+    scanner_sec = bench(scan_receipt_json, corpus, args.repeat)
+    calls = len(corpus) * args.repeat
+
+    print(f"문서 수: {len(corpus)}, 반복: {args.repeat}, 결과 불일치: {mismatches}")
+    print(f"3-pass   : {legacy_sec:.3f}s ({legacy_sec / calls * 1e6:.1f} us/doc)")
+    print(f"단일 스캔: {scanner_sec:.3f}s ({scanner_sec / calls * 1e6:.1f} us/doc)")
+    print(f"속도 향상: x{legacy_sec / scanner_sec:.2f}")
+
+
+if __name__ == "__main__":
+    main()
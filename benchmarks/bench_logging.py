@@ -0,0 +1,102 @@
+"""
+로깅 오버헤드 벤치마크
+
+작업 스레드 여러 개가 이미지 1건당 여러 줄(한글 + 이모지)의 info 로그를 남길 때,
+기존 동기 방식(FileHandler + StreamHandler 직접 부착)과
+utils.setup_logger 의 큐 방식(QueueHandler + 공용 QueueListener)의 이미지당 로깅 시간을 비교합니다.
+(콘솔 출력은 os.devnull 로 보내고, 로그 파일은 임시 폴더에 기록)
+
+실행:
+    python benchmarks/bench_logging.py --threads 8 --images 2000 --lines 4
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import utils
+
+LINES = [
+    "[시작] 이미지 처리 🚀 {name}",
+    "📌 전처리 완료: {name} (1024x1024)",
+    "✅ OCR 요청 완료: {name}",
+    "[완료] 후처리 및 저장 완료 🎉 {name}",
+]
+
+
+def legacy_logger(name, log_dir):
+    """기존 setup_logger 와 동일한 동기 핸들러 구성"""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter(utils.LOG_FORMAT)
+    fh = logging.FileHandler(os.path.join(log_dir, f"{name}.log"), encoding="utf-8")
+    fh.setFormatter(formatter)
+    ch = logging.StreamHandler()
+    ch.setFormatter(formatter)
+    logger.addHandler(fh)
+    logger.addHandler(ch)
+    return logger
+
+
+def run(logger, threads, images, lines):
+    """
+    Returns:
+        float: 작업 스레드가 로깅에 사용한 이미지당 평균 시간(us)
+    """
+    per_thread = []
+
+    def worker(worker_id):
+        spent = 0.0
+        for i in range(images // threads):
+            name = f"receipt_{worker_id}_{i}.png"
+            for template in LINES[:lines]:
+                start = time.perf_counter()
+                logger.info(template.format(name=name))
+                spent += time.perf_counter() - start
+        per_thread.append(spent / (images // threads))
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return sum(per_thread) / len(per_thread) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기 vs 큐 로깅 오버헤드 벤치마크")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--images", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=4, help="이미지당 로그 줄 수 (최대 4)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w", encoding="utf-8") as devnull:
+        stderr, sys.stderr = sys.stderr, devnull  # StreamHandler 기본 출력 대상
+        try:
+            legacy_us = run(legacy_logger("bench_legacy", log_dir), args.threads, args.images, args.lines)
+
+            queued = utils.setup_logger("bench_queue", log_dir=log_dir)
+            start = time.perf_counter()
+            queued_us = run(queued, args.threads, args.images, args.lines)
+            utils.stop_log_listener()  # 큐에 남은 로그까지 기록 완료 시점
+            drain_sec = time.perf_counter() - start
+        finally:
+            sys.stderr = stderr
+            logging.getLogger("bench_legacy").handlers.clear()
+
+    print(f"스레드: {args.threads}, 이미지: {args.images}, 이미지당 로그: {args.lines}줄")
+    print(f"동기 핸들러 : {legacy_us:8.1f} us/이미지 (작업 스레드 기준)")
+    print(f"큐 핸들러   : {queued_us:8.1f} us/이미지 (작업 스레드 기준)")
+    print(f"감소율      : x{legacy_us / queued_us:.2f}")
+    print(f"큐 방식 전체 기록 완료까지: {drain_sec:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
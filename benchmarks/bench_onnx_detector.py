@@ -0,0 +1,102 @@
+"""
+YOLO 검출 백엔드 PyTorch(ultralytics) vs ONNX Runtime(FP32 / INT8) 지연/정확도 벤치마크
+
+- 임포트 + 모델 로드 시간 (첫 요청 지연), 이미지당 추론 시간 중앙값
+- PyTorch 결과 대비 일치 박스 비율(IoU 매칭)과 평균 IoU, score 차이
+
+.onnx 가 없으면 receipt_detectors.export_onnx() 로 변환합니다. (--int8 이면 양자화 모델도 생성)
+각 백엔드는 별도 프로세스에서 측정해야 임포트 시간이 정확하므로 --only 로 나눠 실행할 수 있습니다.
+
+실행:
+    python benchmarks/bench_onnx_detector.py --pt-model ./yolo/best.pt --int8 --repeat 5
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from bench_detectors import load_images, match
+from receipt_detectors import OnnxDetector, YoloDetector, export_onnx
+
+
+def measure(name, make_detector, images, repeat):
+    start = time.perf_counter()
+    detector = make_detector()
+    detector(images[0][2], images[0][1])  # 임포트 + 모델 로드 + 첫 추론
+    first_call = time.perf_counter() - start
+
+    results, timings = {}, []
+    for image_name, image_path, img in images:
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            detections = detector(img, image_path)
+            samples.append(time.perf_counter() - t0)
+        timings.append(statistics.median(samples) * 1000)
+        results[image_name] = detections
+    print(f"[{name:10s}] 첫 호출(임포트+로드) {first_call:6.2f} s, "
+          f"추론 중앙값 {statistics.median(timings):7.1f} ms, 최대 {max(timings):7.1f} ms / 이미지")
+    return results
+
+
+def compare(name, results, reference, iou_threshold):
+    total = matched = 0
+    ious, score_diffs = [], []
+    for image_name, ref in reference.items():
+        dets = results[image_name]
+        count, pair_ious = match([d["box"] for d in dets], [d["box"] for d in ref], iou_threshold)
+        total += len(ref)
+        matched += count
+        ious += pair_ious
+        if dets and ref:
+            score_diffs.append(abs(dets[0]["score"] - ref[0]["score"]))
+    extra = sum(len(results[n]) for n in reference) - matched
+    print(f"[{name:10s}] PyTorch 대비 일치 박스 {matched}/{total} (IoU>={iou_threshold}), 추가 검출 {extra}, "
+          f"평균 IoU {statistics.mean(ious) if ious else 0:.3f}, "
+          f"최고 score 차 평균 {statistics.mean(score_diffs) if score_diffs else 0:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO PyTorch vs ONNX Runtime 벤치마크")
+    parser.add_argument("--pt-model", required=True, help="YOLO 모델(.pt) 경로")
+    parser.add_argument("--onnx-model", default=None, help="ONNX 모델 경로 (기본값 : .pt 옆 .onnx, 없으면 변환)")
+    parser.add_argument("--int8", action="store_true", help="INT8 양자화 모델도 측정")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--threads", type=int, default=None, help="ONNX Runtime 스레드 수")
+    parser.add_argument("--only", choices=("pytorch", "onnx"), default=None, help="한 백엔드만 측정")
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    onnx_path = Path(args.onnx_model) if args.onnx_model else Path(args.pt_model).with_suffix(".onnx")
+    int8_path = onnx_path.with_suffix(".int8.onnx")
+    if args.only != "pytorch":
+        if not onnx_path.exists():
+            onnx_path = Path(export_onnx(args.pt_model))
+        if args.int8 and not int8_path.exists():
+            int8_path = Path(export_onnx(args.pt_model, int8=True))
+
+    runs = {}
+    if args.only != "onnx":
+        runs["pytorch"] = measure("pytorch", lambda: YoloDetector(model_path=args.pt_model), images, args.repeat)
+    if args.only != "pytorch":
+        runs["onnx_fp32"] = measure("onnx_fp32", lambda: OnnxDetector(str(onnx_path), threads=args.threads),
+                                    images, args.repeat)
+        if args.int8:
+            runs["onnx_int8"] = measure("onnx_int8", lambda: OnnxDetector(str(int8_path), threads=args.threads),
+                                        images, args.repeat)
+
+    if "pytorch" in runs:
+        print()
+        for name, results in runs.items():
+            if name != "pytorch":
+                compare(name, results, runs["pytorch"], args.iou)
+
+
+if __name__ == "__main__":
+    main()
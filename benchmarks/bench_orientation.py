@@ -0,0 +1,112 @@
+"""
+방향 보정 단계(RPA_TEST/orientation.py) 벤치마크
+
+- 기울기 추정 정확도 : input_images 를 알려진 각도로 회전한 사본에서 추정한 보정 각도와 오차 (0 도는 오보정 여부)
+- 단계 시간 : EXIF 읽기(헤더), 썸네일 기울기 추정, 캐시 적중
+- 보정 방식 : EXIF 회전 + 기울기를 합친 affine 1 회 vs PIL transpose 후 rotate 2 회 (시간, 픽셀 차이)
+
+실행:
+    python benchmarks/bench_orientation.py --angles -6 -3 0 2 4 --phone-size 4032
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "RPA_TEST"))
+
+import orientation
+from orientation import apply_orientation, estimate_skew, exif_orientation, orientation_transform, OrientationCache
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="방향 보정 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--angles", type=float, nargs="+", default=[-6, -3, 0, 2, 4])
+    parser.add_argument("--phone-size", type=int, default=None, help="보정 방식 비교에 긴 변을 이 크기로 키운 사본 사용")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [os.path.join(args.images, f) for f in sorted(os.listdir(args.images))
+             if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+
+    print("기울기 추정 (회전 각도 → 추정 보정 각도)")
+    errors, missed, false_fix, estimate_ms = [], 0, 0, []
+    for path in paths:
+        with Image.open(path) as img:
+            img = img.convert("RGB")
+        cells = []
+        for angle in args.angles:
+            tilted = img.rotate(angle, expand=True, fillcolor=orientation.FILL_COLOR) if angle else img
+            start = time.perf_counter()
+            skew = estimate_skew(tilted)
+            estimate_ms.append((time.perf_counter() - start) * 1000)
+            if angle == 0:
+                false_fix += bool(skew)
+            elif skew == 0:
+                missed += 1
+            else:
+                errors.append(abs(skew + angle))
+            cells.append(f"{angle:+.0f}→{skew:+.1f}")
+        print(f"  {os.path.basename(path):20s} " + " ".join(f"{c:>10s}" for c in cells))
+    tilted_total = len(paths) * sum(1 for a in args.angles if a)
+    print(f"  보정 {len(errors)}/{tilted_total}건 (평균 오차 {statistics.mean(errors) if errors else 0:.2f}도), "
+          f"미검출 {missed}건, 0 도 오보정 {false_fix}건, 추정 시간 중앙값 {statistics.median(estimate_ms):.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # EXIF 6 (세로 촬영) + 기울기 사본
+        samples = []
+        for path in paths:
+            with Image.open(path) as img:
+                img = img.convert("RGB")
+            if args.phone_size:
+                scale = args.phone_size / max(img.size)
+                img = img.resize((int(img.width * scale), int(img.height * scale)), Image.BICUBIC)
+            exif = Image.Exif()
+            exif[orientation.EXIF_ORIENTATION_TAG] = 6
+            sample = os.path.join(tmp, os.path.splitext(os.path.basename(path))[0] + ".jpg")
+            img.rotate(-4, expand=True, fillcolor=orientation.FILL_COLOR).transpose(Image.ROTATE_90).save(
+                sample, exif=exif, quality=90)
+            samples.append(sample)
+
+        print()
+        print(f"{'이미지':20s} {'EXIF(ms)':>8s} {'추정(ms)':>8s} {'캐시(ms)':>8s} {'affine 1회(ms)':>14s} {'2회(ms)':>8s} {'픽셀 차':>7s}")
+        for sample in samples:
+            cache = OrientationCache()
+            exif_ms = median_ms(lambda: exif_orientation(sample), args.repeat)
+            estimate = median_ms(lambda: orientation_transform(sample, cache=OrientationCache()), args.repeat)
+            transform = orientation_transform(sample, cache=cache)
+            cached = median_ms(lambda: orientation_transform(sample, cache=cache), args.repeat)
+
+            with Image.open(sample) as img:
+                img = img.convert("RGB")
+            two_step = lambda: img.transpose(orientation.EXIF_TRANSPOSE[transform["orientation"]]).rotate(
+                transform["skew"], Image.BILINEAR, expand=True, fillcolor=orientation.FILL_COLOR)
+            single_ms = median_ms(lambda: apply_orientation(img, transform), args.repeat)
+            two_ms = median_ms(two_step, args.repeat)
+            a, b = apply_orientation(img, transform), two_step()
+            common = (0, 0, min(a.width, b.width), min(a.height, b.height))  # expand 크기 반올림이 1px 다를 수 있음
+            diff = np.abs(np.asarray(a.crop(common), dtype=np.int16) - np.asarray(b.crop(common))).mean()
+            print(f"{os.path.basename(sample):20s} {exif_ms:8.2f} {estimate:8.1f} {cached:8.2f} "
+                  f"{single_ms:14.1f} {two_ms:8.1f} {diff:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
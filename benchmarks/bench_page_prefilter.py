@@ -0,0 +1,138 @@
+"""
+페이지 전처리 필터(RPA_TEST/page_prefilter.py) 정확도/속도 벤치마크
+
+- 양성(영수증) : input_images 전체, 그리고 같은 영수증을 A4 300dpi 빈 페이지에 붙인 스캔 페이지 → 제외되면 false negative
+- 음성(비영수증) : 문서 추출 시 흔한 페이지를 합성 (빈 페이지, 스캔 잡음, 표지, 본문 텍스트, 슬라이드, 로고, 배너)
+  --negatives-dir 로 실제 비영수증 이미지 폴더를 추가할 수 있습니다.
+
+이미지는 미리 디코딩해 두고 check_page() 시간만 측정합니다. (파이프라인에서는 YOLO 용으로 이미 디코딩된 이미지 사용)
+
+실행:
+    python benchmarks/bench_page_prefilter.py --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "RPA_TEST"))
+
+from page_prefilter import check_page
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+A4 = (1240, 1754)
+A4_SCAN = (2480, 3508)     # 300dpi 스캔 페이지 (지출 증빙 문서에 영수증을 붙여 스캔한 형태)
+
+
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def synthetic_negatives(seed=0):
+    """문서 추출 시 나오는 비영수증 페이지 합성 (이름, 이미지)"""
+    rnd = random.Random(seed)
+
+    blank = Image.new("RGB", A4, "white")
+
+    noise = Image.effect_noise(A4, 12).convert("RGB")
+    scan = Image.blend(noise, Image.new("RGB", A4, (235, 235, 230)), 0.8)
+
+    cover = Image.new("RGB", A4, "white")
+    draw = ImageDraw.Draw(cover)
+    draw.rectangle([100, 100, 300, 160], fill=(0, 70, 160))
+    draw.text((250, 600), "2026 EXPENSE REPORT", fill="black", font=_font(60))
+    draw.text((400, 700), "Finance Team", fill="black", font=_font(36))
+
+    text = Image.new("RGB", A4, "white")
+    draw = ImageDraw.Draw(text)
+    for y in range(150, 1600, 34):
+        words = ["".join(rnd.choice("abcdefghij") for _ in range(rnd.randint(2, 9))) for _ in range(11)]
+        draw.text((120, y), " ".join(words), fill="black", font=_font(22))
+
+    slide = Image.new("RGB", (1280, 720), "white")
+    draw = ImageDraw.Draw(slide)
+    draw.rectangle([0, 0, 1280, 110], fill=(30, 60, 120))
+    draw.text((60, 30), "Quarterly Review", fill="white", font=_font(48))
+    for i in range(5):
+        draw.text((100, 180 + i * 80), "- bullet point text here", fill="black", font=_font(36))
+
+    logo = Image.new("RGB", (120, 40), "white")
+    ImageDraw.Draw(logo).text((5, 5), "ACME", fill="red", font=_font(24))
+
+    banner = Image.new("RGB", (1200, 60), (0, 90, 170))
+
+    return [("blank", blank), ("scan_noise", scan), ("cover", cover), ("text_page", text),
+            ("slide", slide), ("logo", logo), ("banner", banner)]
+
+
+def scanned_pages(positives):
+    """영수증을 A4 스캔 페이지 왼쪽 위에 붙인 양성 페이지"""
+    pages = []
+    for name, img in positives:
+        page = Image.new("RGB", A4_SCAN, "white")
+        page.paste(img, (200, 300))
+        pages.append((f"A4_{name}", page))
+    return pages
+
+
+def load_dir(path):
+    images = []
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            with Image.open(os.path.join(path, name)) as img:
+                images.append((name, img.convert("RGB")))
+    return images
+
+
+def evaluate(images, repeat):
+    rows = []
+    for name, img in images:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ok, reason, _ = check_page(img)
+            timings.append(time.perf_counter() - start)
+        rows.append((name, ok, reason, statistics.median(timings) * 1e6, img.size))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 전처리 필터 벤치마크")
+    parser.add_argument("--positives-dir", default=str(ROOT / "input_images"), help="영수증 이미지 폴더")
+    parser.add_argument("--negatives-dir", default=None, help="비영수증 이미지 폴더 (선택)")
+    parser.add_argument("--repeat", type=int, default=20, help="이미지당 반복 측정 횟수")
+    args = parser.parse_args()
+
+    positives = load_dir(args.positives_dir)
+    positives += scanned_pages(positives)
+    negatives = synthetic_negatives() + (load_dir(args.negatives_dir) if args.negatives_dir else [])
+
+    pos_rows = evaluate(positives, args.repeat)
+    neg_rows = evaluate(negatives, args.repeat)
+
+    print(f"{'구분':6s} {'이미지':24s} {'크기':>11s} {'판정':6s} {'사유':10s} {'시간(us)':>9s}")
+    for label, rows in (("영수증", pos_rows), ("비영수증", neg_rows)):
+        for name, ok, reason, us, (w, h) in rows:
+            print(f"{label:6s} {name:24s} {f'{w}x{h}':>11s} {'통과' if ok else '제외':6s} {reason or '-':10s} {us:9.0f}")
+
+    false_negatives = sum(1 for row in pos_rows if not row[1])
+    rejected = sum(1 for row in neg_rows if not row[1])
+    all_us = [row[3] for row in pos_rows + neg_rows]
+    print()
+    print(f"false negative : {false_negatives}/{len(pos_rows)} ({false_negatives / max(len(pos_rows), 1):.1%}) - 영수증 (원본 + A4 스캔) 중 제외된 비율")
+    print(f"제외율         : {rejected}/{len(neg_rows)} ({rejected / max(len(neg_rows), 1):.1%}) - 비영수증 페이지 중 제외된 비율")
+    print(f"판정 시간      : 중앙값 {statistics.median(all_us):.0f} us, 최대 {max(all_us):.0f} us / 페이지")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+preprocessing.preprocess_image 시간 / 메모리 벤치마크 (기존 3 단계 방식 vs 축소 디코딩 + 출력 버퍼 리사이즈)
+
+- legacy : imread(BGR) → cvtColor → resize → copyMakeBorder → imwrite (변경 전 구현)
+- fused  : 그레이 스케일 축소 디코딩 → 재사용 버퍼에 바로 리사이즈 → imwrite
+- fused_nopad : 패딩 없이 리사이즈 이미지만 저장
+
+이미지당 시간 중앙값, numpy 할당 최대치(tracemalloc, OpenCV 버퍼 포함), 출력 PNG 크기,
+legacy 대비 픽셀 차이(패딩 포함 결과끼리 평균 절대 차)를 출력합니다.
+input_images 는 대부분 1024px 이하라 축소 디코딩 대상이 적으므로, --phone-size 로 긴 변을 키운
+JPEG 사본(휴대폰 사진 크기)을 만들어 함께 측정할 수 있습니다.
+
+실행:
+    python benchmarks/bench_preprocess.py --repeat 5 --phone-size 4032
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import preprocessing
+from utils import is_image_file
+
+TARGET = (1024, 1024)
+
+
+def legacy_preprocess(input_path, output_dir, target_size=TARGET):
+    """변경 전 preprocess_image 와 동일한 처리 (기준)"""
+    img = cv2.imread(input_path)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape
+    scale = min(target_size[0] / h, target_size[1] / w)
+    resized = cv2.resize(gray, (int(w * scale), int(h * scale)))
+    top = (target_size[0] - resized.shape[0]) // 2
+    bottom = target_size[0] - resized.shape[0] - top
+    left = (target_size[1] - resized.shape[1]) // 2
+    right = target_size[1] - resized.shape[1] - left
+    padded = cv2.copyMakeBorder(resized, top, bottom, left, right, borderType=cv2.BORDER_CONSTANT, value=0)
+    cv2.imwrite(os.path.join(output_dir, os.path.splitext(os.path.basename(input_path))[0] + ".png"), padded)
+
+
+def run(variant, paths, output_dir, repeat):
+    buffer = np.zeros(TARGET, dtype=np.uint8)
+    if variant == "legacy":
+        func = lambda p: legacy_preprocess(p, output_dir)
+    elif variant == "fused":
+        func = lambda p: preprocessing.preprocess_image(p, output_dir, TARGET, pad=True, buffer=buffer)
+    else:
+        func = lambda p: preprocessing.preprocess_image(p, output_dir, TARGET, pad=False)
+
+    timings, peaks, sizes = [], [], []
+    for path in paths:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(path)
+            samples.append(time.perf_counter() - start)
+        timings.append(statistics.median(samples) * 1000)
+
+        tracemalloc.start()
+        func(path)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+        tracemalloc.stop()
+        out_path = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + ".png")
+        sizes.append(os.path.getsize(out_path) / 1024)
+    return timings, peaks, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="preprocess_image 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--phone-size", type=int, default=None, help="긴 변을 이 크기로 키운 JPEG 사본으로 측정")
+    args = parser.parse_args()
+
+    paths = [os.path.join(args.images, f) for f in sorted(os.listdir(args.images)) if is_image_file(f)]
+    preprocessing.logger.disabled = True
+
+    outputs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.phone_size:
+            photo_dir = os.path.join(tmp, "phone")
+            os.makedirs(photo_dir)
+            photos = []
+            for path in paths:
+                img = cv2.imread(path)
+                scale = args.phone_size / max(img.shape[:2])
+                photo = os.path.join(photo_dir, os.path.splitext(os.path.basename(path))[0] + ".jpg")
+                cv2.imwrite(photo, cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC),
+                            [cv2.IMWRITE_JPEG_QUALITY, 90])
+                photos.append(photo)
+            paths = photos
+            print(f"JPEG 사본 (긴 변 {args.phone_size}px) {len(paths)}장으로 측정")
+
+        print(f"{'방식':12s} {'시간 중앙값(ms)':>15s} {'합계(ms)':>9s} {'최대 할당(MB)':>13s} {'PNG 평균(KB)':>12s}")
+        for variant in ("legacy", "fused", "fused_nopad"):
+            out_dir = os.path.join(tmp, variant)
+            os.makedirs(out_dir)
+            timings, peaks, sizes = run(variant, paths, out_dir, args.repeat)
+            outputs[variant] = out_dir
+            print(f"{variant:12s} {statistics.median(timings):15.1f} {sum(timings):9.0f} "
+                  f"{max(peaks):13.1f} {statistics.mean(sizes):12.0f}")
+
+        diffs = []
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0] + ".png"
+            a = cv2.imread(os.path.join(outputs["legacy"], name), cv2.IMREAD_GRAYSCALE)
+            b = cv2.imread(os.path.join(outputs["fused"], name), cv2.IMREAD_GRAYSCALE)
+            diffs.append(float(np.abs(a.astype(np.int16) - b).mean()) if a.shape == b.shape else float("nan"))
+        print()
+        print(f"legacy 대비 평균 절대 픽셀 차 : 중앙값 {statistics.median(diffs):.2f}, 최대 {max(diffs):.2f} (0~255)")
+
+
+if __name__ == "__main__":
+    main()
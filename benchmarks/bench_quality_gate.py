@@ -0,0 +1,83 @@
+"""
+OCR 전 품질 판정(RPA_TEST/quality_gate.py) 벤치마크
+
+input_images 와 열화 사본(블러 / 어둡게 / 저대비 / 축소 / 50px 미만 / 빈 이미지)을 판정하여
+열화 유형별 pass / enhance / reject 건수, 판정 시간(보정 이미지 저장 포함), 생략된 Azure 호출 수를 출력합니다.
+제외는 --reject 로 켰을 때만 (파이프라인 quality_gate_reject 와 같음). 원본이 reject 되면 기준값이 너무 엄격하다는 뜻입니다.
+
+실행:
+    python benchmarks/bench_quality_gate.py [--reject]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageEnhance, ImageFilter
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "RPA_TEST"))
+
+import quality_gate
+from quality_gate import gate_crop, quality_summary
+from stage_metrics import metrics
+
+
+def resize_long(img, side):
+    factor = side / max(img.size)
+    return img.resize((max(int(img.width * factor), 1), max(int(img.height * factor), 1)), Image.LANCZOS)
+
+
+VARIANTS = {
+    "original": lambda img: img,
+    "blur_2": lambda img: img.filter(ImageFilter.GaussianBlur(2)),
+    "blur_4": lambda img: img.filter(ImageFilter.GaussianBlur(4)),
+    "dark": lambda img: ImageEnhance.Brightness(img).enhance(0.25),
+    "flat": lambda img: ImageEnhance.Contrast(img).enhance(0.2),
+    "small_150": lambda img: resize_long(img, 150),
+    "tiny_40": lambda img: resize_long(img, 40),
+    "blank": lambda img: Image.new("RGB", img.size, (240, 240, 240)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="품질 판정 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--reject", action="store_true", help="빈 / 심한 흐림 크롭 제외 (quality_gate_reject=True)")
+    args = parser.parse_args()
+    options = {"reject": args.reject}
+
+    paths = [os.path.join(args.images, f) for f in sorted(os.listdir(args.images))
+             if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+    quality_gate.logger.disabled = True
+    metrics.reset()
+
+    counts = {name: {"pass": 0, "enhance": 0, "reject": 0} for name in VARIANTS}
+    timings = {name: [] for name in VARIANTS}
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in paths:
+            with Image.open(path) as img:
+                img = img.convert("RGB")
+            stem = os.path.splitext(os.path.basename(path))[0]
+            for name, make in VARIANTS.items():
+                crop_path = os.path.join(tmp, f"{stem}_{name}.png")
+                make(img).save(crop_path)
+                start = time.perf_counter()
+                gate = gate_crop({"file_path": crop_path}, options)
+                timings[name].append((time.perf_counter() - start) * 1000)
+                counts[name][gate["decision"]] += 1
+
+    print(f"{'열화 유형':12s} {'pass':>5s} {'enhance':>8s} {'reject':>7s} {'판정 중앙값(ms)':>15s}")
+    for name in VARIANTS:
+        c = counts[name]
+        print(f"{name:12s} {c['pass']:5d} {c['enhance']:8d} {c['reject']:7d} {statistics.median(timings[name]):15.1f}")
+    print()
+    print(f"quality_summary() : {quality_summary()}")
+
+
+if __name__ == "__main__":
+    main()
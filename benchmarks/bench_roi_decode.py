@@ -0,0 +1,113 @@
+"""
+검출 / 크롭 해상도 분리(ROI 재디코딩) 벤치마크
+
+- full : convert_to_png 와 같은 PNG 변환 → PNG 전체 디코딩 → 원본 해상도 검출 → 크롭 (변경 전 흐름)
+- roi  : JPEG 축소 디코딩(open_reduced) → 검출 → 박스를 원본 좌표로 변환 → 원본에서 박스 영역 크롭(decode_regions)
+  (JPEG 는 부분 디코딩이 불가능해 크롭 시 원본 전체를 1 회 디코딩, 절감분은 PNG 인코딩 / 재디코딩과 원본 해상도 검출)
+
+이미지당 시간, 디코딩한 픽셀 수(메모리 상한 추정 : RGB 3 byte/px), 두 흐름의 검출 박스 IoU,
+같은 박스에서 ROI 크롭과 전체 디코딩 크롭의 픽셀 차이(0 이면 OCR 입력 화질 동일)를 출력합니다.
+
+기본 검출기는 contour, --yolo-model 로 yolo / onnx 를 사용할 수 있습니다.
+
+실행:
+    python benchmarks/bench_roi_decode.py --phone-size 4032 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from bench_detectors import iou
+from image_decode import decode_regions, open_reduced
+from receipt_detectors import build_detector, crop_detections, scale_detections
+
+
+def full_flow(path, tmp, detector):
+    png_path = os.path.join(tmp, "full.png")
+    with Image.open(path) as img:
+        img.convert("RGB").save(png_path, "PNG")
+    with Image.open(png_path) as original:
+        detections = detector(original, png_path)
+        crops = crop_detections(original, detections)
+        pixels = original.width * original.height
+    return detections, crops, pixels
+
+
+def roi_flow(path, detector, detect_side):
+    detect_img, scale = open_reduced(path, detect_side)
+    with Image.open(path) as original:
+        detections = scale_detections(detector(detect_img), scale, original.size)
+        boxes = [d["box"] for d in detections]
+        crops = decode_regions(path, boxes)
+        full_pixels = original.width * original.height
+    pixels = detect_img.width * detect_img.height + (full_pixels if boxes else 0)  # JPEG 영역 디코딩은 전체 1 회
+    return detections, crops, pixels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROI 재디코딩 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--phone-size", type=int, default=None, help="긴 변을 이 크기로 키운 JPEG 사본으로 측정")
+    parser.add_argument("--yolo-model", default=None)
+    parser.add_argument("--detect-side", type=int, default=1280)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    detector = build_detector("yolo" if args.yolo_model else "contour", model_path=args.yolo_model)
+    paths = [os.path.join(args.images, f) for f in sorted(os.listdir(args.images)) if f.lower().endswith((".jpg", ".jpeg"))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.phone_size:
+            photos = []
+            for path in paths:
+                img = cv2.imread(path)
+                scale = args.phone_size / max(img.shape[:2])
+                photo = os.path.join(tmp, os.path.basename(path))
+                cv2.imwrite(photo, cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC),
+                            [cv2.IMWRITE_JPEG_QUALITY, 90])
+                photos.append(photo)
+            paths = photos
+
+        print(f"{'이미지':20s} {'full(ms)':>9s} {'roi(ms)':>8s} {'full 픽셀(M)':>12s} {'roi 검출 픽셀(M)':>16s} "
+              f"{'박스 IoU':>8s} {'크롭 차이':>8s}")
+        full_total = roi_total = 0.0
+        for path in paths:
+            full_ms, roi_ms = [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                full_dets, _, full_px = full_flow(path, tmp, detector)
+                full_ms.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                roi_dets, roi_crops, roi_px = roi_flow(path, detector, args.detect_side)
+                roi_ms.append(time.perf_counter() - start)
+            full_ms, roi_ms = statistics.median(full_ms) * 1000, statistics.median(roi_ms) * 1000
+            full_total += full_ms
+            roi_total += roi_ms
+
+            box_iou = iou(full_dets[0]["box"], roi_dets[0]["box"]) if full_dets and roi_dets else float("nan")
+            crop_diff = "-"
+            if roi_dets:
+                with Image.open(path) as original:
+                    reference = original.convert("RGB").crop(roi_dets[0]["box"])
+                crop_diff = f"{np.abs(np.asarray(reference, dtype=np.int16) - np.asarray(roi_crops[0])).mean():.2f}"
+            detect_px = roi_px - (full_px if roi_dets else 0)
+            print(f"{os.path.basename(path):20s} {full_ms:9.1f} {roi_ms:8.1f} {full_px / 1e6:12.1f} {detect_px / 1e6:16.2f} "
+                  f"{box_iou:8.3f} {crop_diff:>8s}")
+
+        print()
+        print(f"합계 : full {full_total:.0f} ms → roi {roi_total:.0f} ms ({1 - roi_total / full_total:.0%} 절감)")
+
+
+if __name__ == "__main__":
+    main()
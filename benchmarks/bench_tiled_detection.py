@@ -0,0 +1,87 @@
+"""
+타일 검출(TiledDetector) 벤치마크 : 세로 병합 문서 높이별 검출 시간 / 검출률
+
+input_images 를 merge_images_vertically 와 같은 방식으로 N 장씩 세로 병합해 긴 문서 이미지를 만들고,
+- 통째 검출 vs 타일 검출 시간 (타일 검출은 높이에 선형으로 증가해야 함)
+- 페이지 단독 검출 결과(페이지 위치만큼 이동)를 기준으로 한 검출률 (IoU 매칭)
+을 비교합니다.
+
+기본 백엔드는 contour (모델 불필요), --yolo-model 을 주면 yolo(.pt) / onnx(.onnx) 로 측정합니다.
+
+실행:
+    python benchmarks/bench_tiled_detection.py --yolo-model ./yolo/best.onnx --pages 1 2 4 8
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from bench_detectors import load_images, match
+from receipt_detectors import TiledDetector, build_detector
+
+
+def merge_vertically(pages):
+    width = max(img.width for img in pages)
+    merged = Image.new("RGB", (width, sum(img.height for img in pages)), (255, 255, 255))
+    offsets, y = [], 0
+    for img in pages:
+        merged.paste(img, (0, y))
+        offsets.append(y)
+        y += img.height
+    return merged, offsets
+
+
+def timed_detect(detector, image, repeat):
+    samples, detections = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        detections = detector(image)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, detections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="타일 검출 벤치마크")
+    parser.add_argument("--images", default=str(ROOT / "input_images"))
+    parser.add_argument("--yolo-model", default=None, help="YOLO 모델 경로 (.pt / .onnx, 없으면 contour)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 4, 8], help="병합 페이지 수")
+    parser.add_argument("--workers", type=int, default=4, help="타일 병렬 스레드 수")
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    name = "yolo" if args.yolo_model else "contour"
+    base = build_detector(name, model_path=args.yolo_model)
+    tiled = TiledDetector(base, max_workers=args.workers)
+    images = [img for _, _, img in load_images(args.images)]
+    # 페이지 단독 검출 결과 (기준)
+    references = [base(img) for img in images]
+
+    print(f"백엔드 : {name}, 타일 스레드 {args.workers}")
+    print(f"{'페이지':>6s} {'크기':>12s} {'타일':>4s} {'통째(ms)':>9s} {'타일(ms)':>9s} {'ms/1000px':>9s} "
+          f"{'통째 검출률':>12s} {'타일 검출률':>12s}")
+    for count in args.pages:
+        pages = [images[i % len(images)] for i in range(count)]
+        refs = [references[i % len(images)] for i in range(count)]
+        merged, offsets = merge_vertically(pages)
+        reference = [(d["box"][0], d["box"][1] + y, d["box"][2], d["box"][3] + y)
+                     for y, dets in zip(offsets, refs) for d in dets]
+
+        whole_ms, whole = timed_detect(base, merged, args.repeat)
+        tiled_ms, tiles = timed_detect(tiled, merged, args.repeat)
+        whole_hit, _ = match([d["box"] for d in whole], reference, args.iou)
+        tiled_hit, _ = match([d["box"] for d in tiles], reference, args.iou)
+        n_tiles = len(tiled.tiles(*merged.size)) if merged.height >= merged.width * tiled.min_aspect else 1
+        print(f"{count:6d} {f'{merged.width}x{merged.height}':>12s} {n_tiles:4d} {whole_ms:9.1f} {tiled_ms:9.1f} "
+              f"{tiled_ms / merged.height * 1000:9.1f} {f'{whole_hit}/{len(reference)}':>12s} "
+              f"{f'{tiled_hit}/{len(reference)}':>12s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("BOX_POSTPROCESS")
+
+# =============================================
+# 검출 박스 후처리 (_nms_and_merge)
+#   검출 결과 형식은 receipt_detectors 와 동일 : [{"box": (x1, y1, x2, y2), "score": float, "quad": ...}, ...]
+# =============================================
+BOX_DEFAULTS = {
+    "min_score": 0.25,       # 신뢰도 하한 (ultralytics predict 기본 conf 와 동일)
+    "min_area_ratio": 0.01,  # 최소 면적 비율 (짧은 변 기준 정사각형 면적 대비, 병합 문서도 페이지 수와 무관)
+    "iou": 0.5,              # 이 값 이상 겹치면 같은 영수증으로 병합
+    "containment": 0.8,      # 작은 박스가 이 비율 이상 포함되면 같은 영수증으로 병합
+    "top_k": None,           # score 상위 k 개만 남김 (None : 제한 없음)
+}
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.7) -> list:
+    """
+    Non-Maximum Suppression (xyxy 박스, score 내림차순 인덱스 반환)
+    """
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return keep
+
+
+def pairwise_overlap(boxes: np.ndarray) -> tuple:
+    """
+    박스 쌍별 겹침 행렬
+
+    Returns:
+        tuple: (면적 [N], IoU [N, N], 포함 비율 [N, N] = 교집합 / 작은 박스 면적)
+    """
+    boxes = np.asarray(boxes, dtype=np.float32)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    w = np.clip(np.minimum(boxes[:, None, 2], boxes[None, :, 2]) - np.maximum(boxes[:, None, 0], boxes[None, :, 0]), 0, None)
+    h = np.clip(np.minimum(boxes[:, None, 3], boxes[None, :, 3]) - np.maximum(boxes[:, None, 1], boxes[None, :, 1]), 0, None)
+    inter = w * h
+    iou = inter / (areas[:, None] + areas[None, :] - inter + 1e-9)
+    contained = inter / (np.minimum(areas[:, None], areas[None, :]) + 1e-9)
+    return areas, iou, contained
+
+
+def postprocess_boxes(detections: list, image_size: tuple, min_score: float = 0.25, min_area_ratio: float = 0.01,
+                      iou: float = 0.5, containment: float = 0.8, top_k: int = None) -> list:
+    """
+    검출 박스 정리 : 좌표 보정 → 신뢰도 / 면적 필터 → 중복(IoU / 포함) 박스 병합 → 상위 k 개
+
+    중복 박스는 score 가 가장 높은 박스를 기준으로 묶고, 영수증이 잘리지 않도록 묶인 박스들의 합집합 영역으로 병합합니다.
+    (ATTACH_FILE 에서 같은 영수증이 2 개로 겹쳐 검출되어 E002 가 나는 경우 방지)
+
+    Args:
+        detections (list): 검출 결과 리스트
+        image_size (tuple): 원본 이미지 (width, height)
+        min_score (float): 신뢰도 하한
+        min_area_ratio (float): 짧은 변 기준 정사각형 면적 대비 최소 면적 비율
+        iou (float): 병합 IoU 기준
+        containment (float): 병합 포함 비율 기준
+        top_k (int): 최대 박스 수 (None : 제한 없음)
+
+    Returns:
+        list: 정리된 검출 결과 (score 내림차순)
+    """
+    if not detections:
+        return []
+
+    width, height = image_size
+    boxes = np.array([d["box"] for d in detections], dtype=np.float32)
+    scores = np.array([d["score"] for d in detections], dtype=np.float32)
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    valid = (scores >= min_score) & (areas >= min_area_ratio * min(width, height) ** 2)
+    if not valid.all():
+        logger.info(f"[BOX] 신뢰도/면적 미달 박스 {int((~valid).sum())}개 제거")
+    index = np.flatnonzero(valid)
+    if not index.size:
+        return []
+
+    _, iou_matrix, contained = pairwise_overlap(boxes[index])
+    duplicate = (iou_matrix >= iou) | (contained >= containment)
+    order = np.argsort(-scores[index], kind="stable")
+    assigned = np.zeros(index.size, dtype=bool)
+    merged = []
+    for i in order:
+        if assigned[i]:
+            continue
+        group = np.flatnonzero(duplicate[i] & ~assigned)
+        assigned[group] = True
+        source = detections[index[i]]
+        group_boxes = boxes[index[group]]
+        merged.append({
+            "box": (int(group_boxes[:, 0].min()), int(group_boxes[:, 1].min()),
+                    int(group_boxes[:, 2].max()), int(group_boxes[:, 3].max())),
+            "score": source["score"],
+            "quad": source.get("quad") if group.size == 1 else None,
+        })
+    if len(merged) != index.size:
+        logger.info(f"[BOX] 중복 박스 {index.size - len(merged)}개 병합")
+
+    return merged[:top_k] if top_k else merged
+
+
+def box_options_from(in_params: dict) -> dict:
+    """
+    in_params 에서 박스 후처리 옵션 읽기 (box_postprocess=False 이면 None : 후처리 안 함)
+    키 : box_min_score / box_min_area_ratio / box_iou / box_containment / box_top_k
+    """
+    if not in_params.get("box_postprocess", True):
+        return None
+    return {key: in_params.get(f"box_{key}", default) for key, default in BOX_DEFAULTS.items()}
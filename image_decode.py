@@ -0,0 +1,172 @@
+import logging
+import time
+
+import PIL
+from PIL import Image
+
+from stage_metrics import metrics
+
+logger = logging.getLogger("IMAGE_DECODE")
+
+# =============================================
+# 축소 디코딩 (JPEG 는 libjpeg DCT 스케일링으로 1/2, 1/4, 1/8 크기로 바로 디코딩)
+#   목표 크기보다 작아지지 않는 범위에서 가장 큰 배율을 사용하므로 이후 리사이즈 결과는 원본 디코딩과 거의 같습니다.
+#   지표 : 단계(decode_reduced / decode_region)별 시간, <단계>_pixels_full / <단계>_pixels_decoded (원본 대비 실제 디코딩 픽셀 수)
+# =============================================
+REDUCTION_FACTORS = (8, 4, 2)
+JPEG_FORMATS = ("JPEG", "MPO")
+CV2_REDUCED_GRAYSCALE = {8: 'IMREAD_REDUCED_GRAYSCALE_8', 4: 'IMREAD_REDUCED_GRAYSCALE_4', 2: 'IMREAD_REDUCED_GRAYSCALE_2'}
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+# PNG 부분 디코딩은 Pillow 내부 상태(_size, tile)를 바꾸므로 검증한 버전 범위에서만 사용 (그 외 전체 디코딩)
+# 의존하는 Pillow 코드 :
+#   - PngImagePlugin.PngImageFile._open : 비인터레이스 PNG 는 IDAT 전체를 tile 1 개 ("zip", (0, 0, w, h), offset, rawmode) 로 등록
+#   - ImageFile.ImageFile.load : self.size 크기로 이미지를 만들고 tile extents 만큼만 디코더에 넘긴 뒤 읽기를 멈춤
+#   (IDAT 는 위에서부터 행 순서로 압축되어 있어 아래쪽 행을 잘라도 위쪽 행 결과는 같음)
+# tests/test_image_decode.py 가 전체 디코딩 크롭과 픽셀 단위로 같은지 확인합니다.
+PARTIAL_PNG_PILLOW = ((9, 0), (13, 0))     # [이상, 미만)
+_PILLOW_VERSION = tuple(int(part) for part in PIL.__version__.split(".")[:2])
+PARTIAL_PNG_SUPPORTED = PARTIAL_PNG_PILLOW[0] <= _PILLOW_VERSION < PARTIAL_PNG_PILLOW[1]
+
+
+def reduction_factor(size: tuple, target) -> int:
+    """
+    축소 디코딩 배율 (8 / 4 / 2 / 1)
+
+    Args:
+        size (tuple): 원본 (width, height)
+        target (int | tuple): 목표 긴 변 길이, 또는 맞춰 넣을 (width, height) 상자
+
+    Returns:
+        int: 디코딩 결과를 목표 리사이즈 크기 이상으로 유지하는 최대 배율
+    """
+    if not target:
+        return 1
+    width, height = size
+    box_w, box_h = (target, target) if isinstance(target, int) else target
+    # EXIF 회전 시 가로/세로가 바뀌므로 두 방향 중 작은 배율 사용
+    max_factor = min(max(width / box_w, height / box_h), max(width / box_h, height / box_w))
+    return next((factor for factor in REDUCTION_FACTORS if factor <= max_factor), 1)
+
+
+def _record(full_size, decoded_size, seconds, stage="decode_reduced"):
+    metrics.record(stage, seconds)
+    metrics.incr(f"{stage}_pixels_full", full_size[0] * full_size[1])
+    metrics.incr(f"{stage}_pixels_decoded", decoded_size[0] * decoded_size[1])
+
+
+def open_reduced(path: str, target=None, mode: str = "RGB", reduced_only: bool = False) -> tuple:
+    """
+    PIL 로 축소 디코딩 (JPEG 은 draft() 로 DCT 단계 축소, 그 외 포맷은 원본 디코딩)
+
+    Args:
+        path (str): 이미지 경로
+        target (int | tuple): 목표 긴 변 또는 (width, height) 상자 (None : 원본 크기)
+        mode (str): 반환 이미지 모드
+        reduced_only (bool): True 이면 축소 디코딩이 불가능할 때 디코딩하지 않고 (None, None) 반환
+
+    Returns:
+        tuple: (로드된 PIL.Image, 원본 / 디코딩 배율 (sx, sy)) - 검출 좌표에 배율을 곱하면 원본 좌표
+    """
+    start = time.perf_counter()
+    with Image.open(path) as img:
+        full_size = img.size
+        factor = reduction_factor(full_size, target) if img.format in JPEG_FORMATS else 1
+        if factor > 1:
+            img.draft(mode, (full_size[0] // factor, full_size[1] // factor))
+        elif reduced_only:
+            return None, None
+        decoded = img.convert(mode)
+    _record(full_size, decoded.size, time.perf_counter() - start)
+    return decoded, (full_size[0] / decoded.width, full_size[1] / decoded.height)
+
+
+def read_gray(path: str, target=None):
+    """
+    OpenCV 로 그레이 스케일 축소 디코딩 (JPEG 은 IMREAD_REDUCED_GRAYSCALE_*, 그 외 IMREAD_GRAYSCALE)
+
+    Returns:
+        numpy.ndarray | None: 그레이 스케일 이미지 (읽기 실패 시 None)
+    """
+    import cv2  # OpenCV 디코딩 시에만 필요 (임포트 비용을 사용 시점으로 미룸)
+
+    start = time.perf_counter()
+    flag = cv2.IMREAD_GRAYSCALE
+    full_size = None
+    if target and path.lower().endswith(JPEG_EXTENSIONS):
+        with Image.open(path) as img:  # 헤더만 읽어 원본 크기 확인 (디코딩 없음)
+            full_size = img.size
+        factor = reduction_factor(full_size, target)
+        if factor > 1:
+            flag = getattr(cv2, CV2_REDUCED_GRAYSCALE[factor])
+    gray = cv2.imread(path, flag)
+    if gray is not None:
+        decoded_size = (gray.shape[1], gray.shape[0])
+        _record(full_size or decoded_size, decoded_size, time.perf_counter() - start)
+    return gray
+
+
+def decode_regions(path: str, boxes: list) -> list:
+    """
+    원본 해상도로 박스 영역을 잘라냄 (축소 이미지로 검출한 뒤 크롭 이미지만 원본 화질로 만들 때 사용)
+
+    - PNG(비인터레이스) : 마지막 박스 아래 행은 디코딩하지 않음 (zlib 스트림을 필요한 행까지만 해제)
+      검증한 Pillow 버전(PARTIAL_PNG_PILLOW)에서만 사용하고, 실패하거나 디코딩 크기가 다르면 전체 디코딩
+    - 그 외 포맷(JPEG 등) : 부분 디코딩이 불가능하므로 원본 전체를 1 회 디코딩한 뒤 모든 박스를 잘라냄
+      (디코딩 비용은 줄지 않음. 파이프라인의 JPEG 는 convert_to_png 의 PNG 인코딩 / 재디코딩만 생략)
+
+    Args:
+        path (str): 원본 이미지 경로
+        boxes (list): 원본 좌표 박스 [(x1, y1, x2, y2), ...]
+
+    Returns:
+        list[PIL.Image.Image]: 박스 순서대로 RGB 크롭 이미지
+    """
+    if not boxes:
+        return []
+    start = time.perf_counter()
+    with Image.open(path) as img:
+        full_size = img.size
+        width, height = full_size
+        bottom = min(max(int(box[3]) for box in boxes), height)
+        partial = (PARTIAL_PNG_SUPPORTED and img.format == "PNG" and len(img.tile) == 1
+                   and not img.info.get("interlace") and bottom < height)
+        try:
+            if partial:
+                name, _, offset, args = img.tile[0]
+                img._size = (width, bottom)
+                img.tile = [(name, (0, 0, width, bottom), offset, args)]
+            img.load()
+            if partial and img.size != (width, bottom):
+                raise ValueError(f"부분 디코딩 크기 불일치 {img.size} != {(width, bottom)}")
+        except (OSError, AttributeError, TypeError, ValueError) as e:
+            if not partial:
+                raise
+            logger.warning(f"[DECODE] 부분 디코딩 실패, 전체 디코딩: {path} ({e})")
+            return _decode_regions_full(path, boxes)
+        regions = [img.crop(tuple(int(v) for v in box)).convert("RGB") for box in boxes]
+        decoded_size = img.size
+    _record(full_size, decoded_size, time.perf_counter() - start, stage="decode_region")
+    return regions
+
+
+def _decode_regions_full(path, boxes):
+    with Image.open(path) as img:
+        return [img.crop(tuple(int(v) for v in box)).convert("RGB") for box in boxes]
+
+
+def decode_savings() -> dict:
+    """
+    지금까지 축소 디코딩(open_reduced / read_gray)으로 줄인 픽셀 비율과 추정 절감 시간
+    (디코딩 시간은 픽셀 수에 비례한다고 가정, 영역 디코딩 decode_region 은 시간/픽셀을 따로 집계하므로 제외)
+    """
+    data = metrics.to_dict()
+    counters = data["counters"]
+    full = counters.get("decode_reduced_pixels_full", 0)
+    decoded = counters.get("decode_reduced_pixels_decoded", 0)
+    stage = data["stages"].get("decode_reduced", {})
+    spent = stage.get("sum_sec", 0.0)
+    return {
+        "pixels_saved_ratio": round(1 - decoded / full, 4) if full else 0.0,
+        "decode_s": round(spent, 3),
+        "estimated_saved_s": round(spent * (full / decoded - 1), 3) if decoded else 0.0,
+    }
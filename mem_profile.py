@@ -0,0 +1,312 @@
+import bisect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# =============================================
+# 메모리 수치 읽기 (프로세스 RSS / 컨테이너 cgroup)
+# =============================================
+CGROUP_V2_CURRENT = '/sys/fs/cgroup/memory.current'
+CGROUP_V2_MAX = '/sys/fs/cgroup/memory.max'
+CGROUP_V1_USAGE = '/sys/fs/cgroup/memory/memory.usage_in_bytes'
+CGROUP_V1_LIMIT = '/sys/fs/cgroup/memory/memory.limit_in_bytes'
+
+MB = 1024 * 1024
+UNLIMITED = 1 << 60   # cgroup v1 은 한도 미설정 시 매우 큰 값을 반환
+
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+        return None if value == 'max' else int(value)
+    except (OSError, ValueError):
+        return None
+
+
+def read_rss():
+    """현재 프로세스 RSS (bytes, /proc 미지원 환경은 최대 RSS 로 대체)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def read_cgroup_memory():
+    """
+    컨테이너(cgroup) 메모리 사용량/한도 (bytes)
+    cgroup v2 의 memory.current 를 우선 사용하고, 없으면 v1 memory.usage_in_bytes 사용
+
+    Returns:
+        tuple: (usage, limit) - 확인 불가 시 None
+    """
+    usage = _read_int(CGROUP_V2_CURRENT)
+    if usage is not None:
+        limit = _read_int(CGROUP_V2_MAX)
+    else:
+        usage, limit = _read_int(CGROUP_V1_USAGE), _read_int(CGROUP_V1_LIMIT)
+    return usage, (None if limit is None or limit >= UNLIMITED else limit)
+
+
+def _mb(value):
+    return None if value is None else round(value / MB, 1)
+
+
+# =============================================
+# 주기 샘플러
+# =============================================
+class MemorySampler:
+    """
+    백그라운드 스레드에서 RSS / cgroup 사용량을 주기적으로 기록하고 최대값을 추적
+    (스테이지 경계 스냅샷 사이에 발생하는 순간 최대치를 잡기 위함)
+    """
+
+    def __init__(self, interval_sec=1.0, max_samples=100000):
+        self.interval_sec = interval_sec
+        self.max_samples = max_samples
+        self.samples = []
+        self.peak_rss = 0
+        self.peak_cgroup = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        rss = read_rss() or 0
+        cgroup, _ = read_cgroup_memory()
+        cgroup = cgroup or 0
+        with self._lock:
+            if len(self.samples) < self.max_samples:
+                self.samples.append((time.time(), rss, cgroup))
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_cgroup = max(self.peak_cgroup, cgroup)
+        return rss, cgroup
+
+    def peak_between(self, start, end):
+        """[start, end] (time.time()) 구간 샘플의 (RSS 최대, cgroup 최대) - 구간이 겹치는 병렬 스테이지도 각자 계산"""
+        with self._lock:
+            lo = bisect.bisect_left(self.samples, start, key=lambda s: s[0])
+            hi = bisect.bisect_right(self.samples, end, key=lambda s: s[0])
+            window = self.samples[lo:hi]
+        return max((s[1] for s in window), default=0), max((s[2] for s in window), default=0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_sec):
+            self.sample()
+
+    def start(self):
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='mem-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+
+
+# =============================================
+# 스테이지별 메모리 프로파일러
+# =============================================
+class MemoryProfiler:
+    """
+    스테이지 경계마다 tracemalloc 스냅샷을 찍어 스테이지별 증가량 상위 N개 할당 위치를 기록하고,
+    RSS / cgroup 사용량의 스테이지 시작/종료/최대값을 함께 리포트합니다.
+    같은 이름의 스테이지가 여러 번 실행되면 한 항목으로 합산합니다 (calls, 소요 시간 합계, 최대값, 할당 위치별 증가량 합계).
+
+    사용 예:
+        profiler = MemoryProfiler(enabled=args.profile_memory)
+        profiler.start()
+        with profiler.stage('ocr'):
+            ...
+        profiler.stop()
+        profiler.write_report('./results/metrics')
+
+    stage_metrics 와 같은 단계로 나누려면 metrics.add_observer(profiler.stage) 로 등록합니다.
+
+    enabled=False 이면 모든 메소드가 아무 작업도 하지 않습니다.
+    """
+
+    # 스냅샷 비교 시 제외할 할당 위치 (프로파일러 자체 오버헤드)
+    EXCLUDE_FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    )
+
+    def __init__(self, enabled=True, top_n=15, interval_sec=1.0, frames=1):
+        """
+        Args:
+            enabled (bool): 프로파일링 사용 여부
+            top_n (int): 스테이지별 리포트할 증가량 상위 할당 위치 수 (기본값 : 15)
+            interval_sec (float): RSS / cgroup 샘플링 주기 (기본값 : 1초)
+            frames (int): tracemalloc 보관 스택 깊이 (깊을수록 오버헤드 증가, 기본값 : 1)
+        """
+        self.enabled = enabled
+        self.top_n = top_n
+        self.frames = frames
+        self.sampler = MemorySampler(interval_sec)
+        self.stages = []
+        self._stages_by_name = {}
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def start(self):
+        if not self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self.sampler.start()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.sampler.stop()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self.EXCLUDE_FILTERS)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        스테이지 구간 측정
+        스테이지가 중첩/병렬 실행되면 tracemalloc 증가량과 최대값에 겹치는 구간의 할당이 함께 잡히므로 근사치로 봅니다.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        with self._lock:
+            rss_before = read_rss()
+            cgroup_before, _ = read_cgroup_memory()
+            before = self._snapshot()
+            tracemalloc.reset_peak()
+        start_wall = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                traced_current, traced_peak = tracemalloc.get_traced_memory()
+                after = self._snapshot()
+                cgroup_after, _ = read_cgroup_memory()
+                rss_after = read_rss()
+                peak_rss, peak_cgroup = self.sampler.peak_between(start_wall, time.time())
+
+                # 증가한 위치만 남긴 뒤 상위 N개 (감소 위치가 상위를 차지해 결과가 비는 것 방지)
+                growth = [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff > 0]
+                self._merge_stage(name, {
+                    'stage': name,
+                    'calls': 1,
+                    'elapsed_sec': elapsed,
+                    'rss_before_mb': _mb(rss_before),
+                    'rss_after_mb': _mb(rss_after),
+                    'rss_peak_mb': _mb(max(peak_rss, rss_before or 0, rss_after or 0)),
+                    'cgroup_before_mb': _mb(cgroup_before),
+                    'cgroup_after_mb': _mb(cgroup_after),
+                    'cgroup_peak_mb': _mb(max(peak_cgroup, cgroup_before or 0, cgroup_after)) if cgroup_after else None,
+                    'traced_current_mb': _mb(traced_current),
+                    'traced_peak_mb': _mb(traced_peak),
+                    'top_growth': [
+                        {
+                            'location': str(stat.traceback),
+                            'size_diff_kb': round(stat.size_diff / 1024, 1),
+                            'size_kb': round(stat.size / 1024, 1),
+                            'count_diff': stat.count_diff,
+                        }
+                        for stat in growth[:self.top_n]
+                    ],
+                })
+
+    def _merge_stage(self, name, entry):
+        """같은 이름의 스테이지 결과 합산 (시작값은 첫 호출, 종료값은 마지막 호출, 최대값은 전체 최대)"""
+        entry['elapsed_sec'] = round(entry['elapsed_sec'], 3)
+        total = self._stages_by_name.get(name)
+        if total is None:
+            self._stages_by_name[name] = entry
+            self.stages.append(entry)
+            return
+
+        total['calls'] += 1
+        total['elapsed_sec'] = round(total['elapsed_sec'] + entry['elapsed_sec'], 3)
+        for key in ('rss_after_mb', 'cgroup_after_mb', 'traced_current_mb'):
+            total[key] = entry[key]
+        for key in ('rss_peak_mb', 'cgroup_peak_mb', 'traced_peak_mb'):
+            values = [v for v in (total[key], entry[key]) if v is not None]
+            total[key] = max(values) if values else None
+
+        growth = {item['location']: item for item in total['top_growth']}
+        for item in entry['top_growth']:
+            merged = growth.setdefault(item['location'], {**item, 'size_diff_kb': 0.0, 'count_diff': 0})
+            merged['size_diff_kb'] = round(merged['size_diff_kb'] + item['size_diff_kb'], 1)
+            merged['size_kb'] = item['size_kb']
+            merged['count_diff'] += item['count_diff']
+        total['top_growth'] = sorted(growth.values(), key=lambda item: item['size_diff_kb'], reverse=True)[:self.top_n]
+
+    def report(self):
+        """리포트 dict (스테이지별 결과 + 전체 최대치 + cgroup 한도)"""
+        _, cgroup_limit = read_cgroup_memory()
+        return {
+            'peak_rss_mb': _mb(self.sampler.peak_rss),
+            'peak_cgroup_mb': _mb(self.sampler.peak_cgroup) if self.sampler.peak_cgroup else None,
+            'cgroup_limit_mb': _mb(cgroup_limit),
+            'samples': len(self.sampler.samples),
+            'stages': self.stages,
+        }
+
+    def format_report(self):
+        """사람이 읽는 텍스트 리포트"""
+        report = self.report()
+        lines = [
+            f"최대 RSS: {report['peak_rss_mb']} MB / 최대 cgroup 사용량: {report['peak_cgroup_mb']} MB "
+            f"/ cgroup 한도: {report['cgroup_limit_mb']} MB",
+        ]
+        for stage in report['stages']:
+            lines.append('')
+            lines.append(
+                f"[{stage['stage']}] {stage['calls']}회 {stage['elapsed_sec']}s  RSS {stage['rss_before_mb']} -> "
+                f"{stage['rss_after_mb']} MB (최대 {stage['rss_peak_mb']} MB), "
+                f"tracemalloc 최대 {stage['traced_peak_mb']} MB"
+            )
+            for item in stage['top_growth']:
+                lines.append(f"  +{item['size_diff_kb']:>10} KB  ({item['count_diff']:+d} blocks)  {item['location']}")
+        return '\n'.join(lines)
+
+    def write_report(self, output_dir, prefix='memory_report'):
+        """
+        리포트 저장 (JSON + 텍스트)
+
+        Returns:
+            tuple: (json 경로, txt 경로) - 비활성화 시 None
+        """
+        if not self.enabled:
+            return None
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, f'{prefix}.json')
+        txt_path = os.path.join(output_dir, f'{prefix}.txt')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        with open(txt_path, 'w', encoding='utf-8') as f:
+            f.write(self.format_report() + '\n')
+        return json_path, txt_path
@@ -0,0 +1,170 @@
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+
+# =============================================
+# 정규화 키 규칙
+# =============================================
+# 법인 표기 : (유), (주), 주식회사, 유한회사 (㈜ 는 NFKC 정규화 시 (주) 로 변환됨)
+CORP_MARK_RE = re.compile(r"\(\s*[유주]\s*\)|주식회사|유한회사")
+# 지점 접미사 : 공백 뒤 마지막 토큰이 '~점/지점/매장/센터' 인 경우
+BRANCH_SUFFIX_RE = re.compile(r"\s+\S*(?:점|매장|센터)$")
+# 키 비교 시 제거할 문자 (공백, 구두점)
+NON_KEY_CHARS_RE = re.compile(r"[\s\W_]+")
+# 접두어 매칭 시 남은 부분이 지점 표기인지 판정 (한글 지점명 4자 이하 + 점/지점/매장/센터, 예: '서현점')
+# '이마트트레이더스' -> '이마트', 'GS25역삼점' -> 'GS' 처럼 다른 브랜드로 묶이지 않도록 지점 표기만 허용
+BRANCH_REST_RE = re.compile(r"[가-힣]{0,4}(?:점|매장|센터)")
+
+NGRAM_SIZE = 3
+
+
+def canonical_key(name):
+    """
+    상호명 비교용 정규화 키 생성
+    (NFKC → 법인 표기 제거 → 공백/구두점 제거 → 소문자)
+
+    Args:
+        name (str): 상호명
+
+    Returns:
+        str: 정규화 키 (예: '(주)이마트24 서현점' -> '이마트24서현점')
+    """
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKC', str(name))
+    text = CORP_MARK_RE.sub(' ', text)
+    return NON_KEY_CHARS_RE.sub('', text).lower()
+
+
+def brand_key(name):
+    """지점 접미사를 제거한 정규화 키 (예: '이마트 탄현점' -> '이마트')"""
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKC', str(name))
+    text = CORP_MARK_RE.sub(' ', text).strip()
+    return canonical_key(BRANCH_SUFFIX_RE.sub('', text))
+
+
+def ngrams(key, n=NGRAM_SIZE):
+    """키의 n-gram 집합 (키가 n 보다 짧으면 키 자체)"""
+    if len(key) <= n:
+        return {key} if key else set()
+    return {key[i:i + n] for i in range(len(key) - n + 1)}
+
+
+# =============================================
+# 정규화 엔진
+# =============================================
+class MerchantNormalizer:
+    """
+    룩업 테이블 기반 상호명 정규화 엔진
+
+    조회 순서:
+        1) 정규화 키 완전 일치 (공백/법인 표기 차이 흡수)
+        2) 지점 접미사 제거 키 일치
+        3) 룩업 키가 조회 키의 접두어이고 나머지가 지점 표기인 경우 (공백 없는 '브랜드+지점' 표기)
+        4) trigram 인덱스 기반 유사도(Dice) 최고 후보 (min_similarity 이상)
+
+    dict 와 같은 get(name, default) 인터페이스를 제공하므로
+    기존 lookup_table.get(merchant, merchant) 호출부에 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, lookup_table, min_similarity=0.6, min_prefix_len=2, cache_size=4096):
+        """
+        Args:
+            lookup_table (dict): original_name -> normalized_name
+            min_similarity (float): 퍼지 매칭 최소 Dice 유사도 (기본값 : 0.6)
+            min_prefix_len (int): 접두어 매칭 최소 키 길이 (기본값 : 2)
+            cache_size (int): 조회 결과 LRU 캐시 크기 (기본값 : 4096)
+        """
+        self.min_similarity = min_similarity
+        self.min_prefix_len = min_prefix_len
+
+        # 정규화 키 -> normalized_name (정규화된 이름 자신도 키로 등록)
+        self.keys = {}
+        for original, normalized in lookup_table.items():
+            for key in (canonical_key(normalized), canonical_key(original)):
+                if key:
+                    self.keys[key] = normalized
+
+        # trigram -> 키 목록 (posting list), 키별 trigram 수
+        self.key_list = list(self.keys)
+        self.key_ngram_count = [len(ngrams(key)) for key in self.key_list]
+        self.index = defaultdict(list)
+        for key_id, key in enumerate(self.key_list):
+            for gram in ngrams(key):
+                self.index[gram].append(key_id)
+
+        # 접두어 매칭용 키 길이 집합 (짧은 키부터 검사)
+        self.key_lengths = sorted({len(key) for key in self.key_list if len(key) >= min_prefix_len})
+
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _fuzzy(self, key):
+        """trigram 후보 집계 후 Dice 유사도 최고 키 반환 (없으면 None)"""
+        query = ngrams(key)
+        if not query:
+            return None
+        hits = defaultdict(int)
+        for gram in query:
+            for key_id in self.index.get(gram, ()):
+                hits[key_id] += 1
+        best_id, best_score = None, self.min_similarity
+        for key_id, shared in hits.items():
+            score = 2.0 * shared / (len(query) + self.key_ngram_count[key_id])
+            if score >= best_score:
+                best_id, best_score = key_id, score
+        return None if best_id is None else self.key_list[best_id]
+
+    def _lookup_uncached(self, name):
+        key = canonical_key(name)
+        if not key:
+            return None
+        if key in self.keys:
+            return self.keys[key]
+
+        branchless = brand_key(name)
+        if branchless in self.keys:
+            return self.keys[branchless]
+
+        # 긴 접두어 우선, 나머지가 지점 표기일 때만 (예: '이마트24서현점' -> '이마트24')
+        for length in reversed(self.key_lengths):
+            if length < len(key) and key[:length] in self.keys and BRANCH_REST_RE.fullmatch(key, length):
+                return self.keys[key[:length]]
+
+        matched = self._fuzzy(key)
+        return None if matched is None else self.keys[matched]
+
+    def get(self, name, default=None):
+        """
+        단일 상호명 정규화
+
+        Args:
+            name (str): OCR 상호명
+            default: 매칭 실패 시 반환값
+
+        Returns:
+            str: 정규화된 상호명 또는 default
+        """
+        matched = self._lookup(name) if name else None
+        return default if matched is None else matched
+
+    def normalize_many(self, names):
+        """
+        상호명 목록 일괄 정규화 (중복 상호는 1회만 조회, 매칭 실패 시 원본 유지)
+
+        Args:
+            names (list): OCR 상호명 리스트
+
+        Returns:
+            list: 입력 순서대로 정규화된 상호명 리스트
+        """
+        resolved = {name: self.get(name, name) for name in set(names)}
+        return [resolved[name] for name in names]
+
+    def cache_info(self):
+        return self._lookup.cache_info()
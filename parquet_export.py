@@ -0,0 +1,247 @@
+import os
+from datetime import date, time
+from decimal import Decimal, InvalidOperation
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils import setup_logger, ensure_dir, load_json
+from merchant_normalizer import MerchantNormalizer
+
+# 로깅 설정
+logger = setup_logger('parquet_export')
+
+# =============================================
+# 컬럼 스키마 (금액은 decimal, 날짜/시간은 date32/time32 로 명시)
+# =============================================
+AMOUNT_TYPE = pa.decimal128(18, 2)
+AMOUNT_QUANT = Decimal('0.01')
+
+SUMMARY_SCHEMA = pa.schema([
+    ('source_file', pa.string()),
+    ('merchant', pa.string()),
+    ('normalized_merchant', pa.string()),
+    ('country', pa.string()),
+    ('transaction_date', pa.date32()),
+    ('transaction_time', pa.time32('ms')),  # Parquet 는 초 단위 time32 미지원
+    ('subtotal', AMOUNT_TYPE),
+    ('tax', AMOUNT_TYPE),
+    ('total', AMOUNT_TYPE),
+    ('item_count', pa.int32()),
+])
+
+ITEMS_SCHEMA = pa.schema([
+    ('source_file', pa.string()),
+    ('item_index', pa.int32()),
+    ('name', pa.string()),
+    ('quantity', pa.float64()),
+    ('unit_price', AMOUNT_TYPE),
+    ('total_price', AMOUNT_TYPE),
+])
+
+# 필드명 -> REST 응답(analyzeResult) 값 키
+REST_VALUE_KEYS = ('valueString', 'valueCountryRegion', 'valueDate', 'valueTime',
+                   'valueNumber', 'valueCurrency', 'valueArray', 'valueObject')
+
+
+# =============================================
+# 값 변환
+# =============================================
+def _field_value(field):
+    """
+    OCR 필드에서 값 추출 (REST 응답 / SDK to_dict() 형식 모두 지원)
+
+    Args:
+        field (dict): 단일 필드
+
+    Returns:
+        Any: 필드 값 (없으면 None)
+    """
+    if not field:
+        return None
+    if 'value' in field:
+        return field['value']
+    for key in REST_VALUE_KEYS:
+        if key in field:
+            value = field[key]
+            return value.get('amount') if key == 'valueCurrency' else value
+    return field.get('content')
+
+
+def _to_amount(value):
+    """금액 -> Decimal(소수 둘째 자리), 변환 불가 시 None"""
+    if isinstance(value, dict):
+        value = value.get('amount')
+    if value is None or value == '':
+        return None
+    try:
+        return Decimal(str(value)).quantize(AMOUNT_QUANT)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _to_date(value):
+    """'YYYY-MM-DD' -> date, 변환 불가 시 None"""
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _to_time(value):
+    """'HH:MM[:SS]' -> time, 변환 불가 시 None"""
+    try:
+        return time.fromisoformat(str(value)[:8]) if value else None
+    except ValueError:
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _documents(json_data):
+    return (json_data.get('analyzeResult') or json_data).get('documents') or [{}]
+
+
+# =============================================
+# 컬럼 버퍼
+# =============================================
+class ColumnBuffer:
+    """
+    스키마 컬럼별 리스트에 값을 누적했다가 chunk 단위로 RecordBatch 로 변환하는 버퍼
+    (행 dict 를 만들지 않고 컬럼에 바로 append)
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.columns = {name: [] for name in schema.names}
+
+    def __len__(self):
+        return len(self.columns[self.schema.names[0]])
+
+    def append(self, *values):
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+
+    def flush(self):
+        """누적된 값을 RecordBatch 로 변환 후 버퍼 초기화"""
+        arrays = [
+            pa.array(self.columns[field.name], type=field.type)
+            for field in self.schema
+        ]
+        self.columns = {name: [] for name in self.schema.names}
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def append_receipt(summary_buf, items_buf, source_file, json_data, lookup_table):
+    """
+    OCR 결과 1건을 summary / items 컬럼 버퍼에 추가
+
+    Args:
+        summary_buf (ColumnBuffer): summary 버퍼
+        items_buf (ColumnBuffer): items 버퍼
+        source_file (str): 원본 JSON 파일명
+        json_data (dict): OCR 결과
+        lookup_table (MerchantNormalizer | dict): 상호명 정규화 룩업 테이블
+    """
+    fields = _documents(json_data)[0].get('fields') or {}
+
+    items = _field_value(fields.get('Items')) or []
+    for idx, item in enumerate(items, start=1):
+        obj = _field_value(item) or {}
+        items_buf.append(
+            source_file,
+            idx,
+            _field_value(obj.get('Description') or obj.get('Name')),
+            _to_float(_field_value(obj.get('Quantity'))),
+            _to_amount(_field_value(obj.get('Price'))),
+            _to_amount(_field_value(obj.get('TotalPrice'))),
+        )
+
+    merchant = _field_value(fields.get('MerchantName')) or ''
+    summary_buf.append(
+        source_file,
+        merchant,
+        lookup_table.get(merchant, merchant),
+        _field_value(fields.get('CountryRegion')),
+        _to_date(_field_value(fields.get('TransactionDate'))),
+        _to_time(_field_value(fields.get('TransactionTime'))),
+        _to_amount(_field_value(fields.get('Subtotal'))),
+        _to_amount(_field_value(fields.get('TotalTax'))),
+        _to_amount(_field_value(fields.get('Total'))),
+        len(items),
+    )
+
+
+# =============================================
+# 폴더 전체 -> Parquet
+# =============================================
+def process_folder_to_parquet(input_dir, output_dir, lookup_table, chunk_size=50000, compression='zstd'):
+    """
+    OCR JSON 결과들을 summary / items 두 개의 Parquet 테이블로 저장
+    chunk_size 행 단위로 RecordBatch 를 만들어 순차 기록하므로 메모리 사용량이 일정합니다.
+
+    Args:
+        input_dir (str): JSON 파일 폴더
+        output_dir (str): Parquet 저장 폴더 (summary.parquet, items.parquet)
+        lookup_table (dict | MerchantNormalizer): 상호명 정규화 룩업 테이블
+            (dict 인 경우 CSV 출력(postprocessing.process_folder)과 같이 MerchantNormalizer 로 감싸 유사 상호 매칭)
+        chunk_size (int): RecordBatch 당 행 수 (기본값 : 50000)
+        compression (str): Parquet 압축 코덱 (기본값 : zstd)
+
+    Returns:
+        tuple: (summary 행 수, items 행 수)
+    """
+    ensure_dir(output_dir, logger)
+    if not isinstance(lookup_table, MerchantNormalizer):
+        lookup_table = MerchantNormalizer(lookup_table)
+    summary_path = os.path.join(output_dir, 'summary.parquet')
+    items_path = os.path.join(output_dir, 'items.parquet')
+
+    summary_buf = ColumnBuffer(SUMMARY_SCHEMA)
+    items_buf = ColumnBuffer(ITEMS_SCHEMA)
+    summary_rows = item_rows = 0
+
+    with pq.ParquetWriter(summary_path, SUMMARY_SCHEMA, compression=compression) as summary_writer, \
+            pq.ParquetWriter(items_path, ITEMS_SCHEMA, compression=compression) as items_writer:
+
+        for filename in sorted(os.listdir(input_dir)):
+            if not filename.endswith('.json'):
+                continue
+            data = load_json(os.path.join(input_dir, filename))
+            if data is None:
+                logger.warning(f"[스킵] JSON 로드 실패: {filename}")
+                continue
+
+            append_receipt(summary_buf, items_buf, filename, data, lookup_table)
+
+            if len(summary_buf) >= chunk_size:
+                summary_rows += len(summary_buf)
+                summary_writer.write_batch(summary_buf.flush())
+            if len(items_buf) >= chunk_size:
+                item_rows += len(items_buf)
+                items_writer.write_batch(items_buf.flush())
+
+        if len(summary_buf):
+            summary_rows += len(summary_buf)
+            summary_writer.write_batch(summary_buf.flush())
+        if len(items_buf):
+            item_rows += len(items_buf)
+            items_writer.write_batch(items_buf.flush())
+
+    logger.info(f"[완료] Parquet 저장 완료: {summary_path} ({summary_rows}행), {items_path} ({item_rows}행)")
+    return summary_rows, item_rows
+
+
+# =============================================
+# 단독 실행 진입점
+# =============================================
+if __name__ == "__main__":
+    from postprocessing import load_lookup_table
+
+    lookup = load_lookup_table('./lookup_table.csv')
+    process_folder_to_parquet('./results/json', './results/parquet', lookup)
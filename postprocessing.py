@@ -1,7 +1,7 @@
 import os
 import csv
-import pandas as pd
 from utils import setup_logger, ensure_dir, load_json
+from merchant_normalizer import MerchantNormalizer
 
 # 로깅 설정
 logger = setup_logger('postprocessing')
@@ -18,8 +18,9 @@ def load_lookup_table(path):
         dict: original_name -> normalized_name 매핑 딕셔너리
     """
     try:
-        df = pd.read_csv(path)
-        lookup_dict = dict(zip(df['original_name'], df['normalized_name']))
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            lookup_dict = {row['original_name']: row['normalized_name'] for row in reader}
         logger.info(f"[성공] 룩업 테이블 로드 완료: {path}")
         return lookup_dict
     except Exception as e:
@@ -54,13 +55,16 @@ def process_folder(input_dir, output_csv, lookup_table):
     Args:
         input_dir (str): JSON 파일 폴더
         output_csv (str): 결과 CSV 저장 경로
-        lookup_table (dict): 상호명 정규화 룩업 테이블
+        lookup_table (dict | MerchantNormalizer): 상호명 정규화 룩업 테이블
+            (dict 인 경우 MerchantNormalizer 로 감싸 공백/지점/법인 표기 차이 및 유사 상호 매칭)
     """
     try:
         output_dir = os.path.dirname(output_csv) or '.'
         ensure_dir(output_dir, logger)
-        rows = []
-        
+        if not isinstance(lookup_table, MerchantNormalizer):
+            lookup_table = MerchantNormalizer(lookup_table)
+
+        extracted = []
         for filename in os.listdir(input_dir):
             if filename.endswith('.json'):
                 json_path = os.path.join(input_dir, filename)
@@ -71,19 +75,25 @@ def process_folder(input_dir, output_csv, lookup_table):
                     continue
                 
                 merchant, total = extract_fields(data)
-                normalized_merchant = lookup_table.get(merchant, merchant)
-                if merchant != normalized_merchant:
-                    logger.info(f"[정규화] '{merchant}' -> '{normalized_merchant}'")
-                else:
-                    logger.warning(f"[경고] 정규화 미일치 : {merchant}")
-                
-                rows.append({
-                    'filename' : filename,
-                    'merchant' : merchant,
-                    'normalized_merchant' : normalized_merchant,
-                    'total':total   
-                })
-                logger.info(f"[처리] {filename}->상호: {merchant}, 금액: {total}")
+                extracted.append((filename, merchant, total))
+
+        # 상호명 일괄 정규화 (중복 상호는 1회만 조회)
+        normalized_list = lookup_table.normalize_many([merchant for _, merchant, _ in extracted])
+
+        rows = []
+        for (filename, merchant, total), normalized_merchant in zip(extracted, normalized_list):
+            if merchant != normalized_merchant:
+                logger.info(f"[정규화] '{merchant}' -> '{normalized_merchant}'")
+            else:
+                logger.warning(f"[경고] 정규화 미일치 : {merchant}")
+            
+            rows.append({
+                'filename' : filename,
+                'merchant' : merchant,
+                'normalized_merchant' : normalized_merchant,
+                'total':total   
+            })
+            logger.info(f"[처리] {filename}->상호: {merchant}, 금액: {total}")
         # CSV 저장
         with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['filename', 'merchant', 'normalized_merchant', 'total']
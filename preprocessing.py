@@ -1,62 +1,74 @@
 import os
-import cv2
-from utils import setup_logger, ensure_dir, is_image_file
+
+import numpy as np
+
+from utils import setup_logger, ensure_dir, is_image_file, lazy_import
+from stage_metrics import metrics, timed
+from image_decode import read_gray
+
+# OpenCV 는 첫 사용 시 로드
+cv2 = lazy_import('cv2')
 
 # 로거 설정
 logger = setup_logger('preprocessing')
 
 # 단일 이미지 처리
-def preprocess_image(input_path, output_dir, target_size=(1024, 1024)):
+@timed("preprocess_image")
+def preprocess_image(input_path, output_dir, target_size=(1024, 1024), pad=True, buffer=None):
     """
     단일 이미지 파일을 전처리하여 저장
     (그레이 스케일 + 리사이즈 + 패딩)
 
+    그레이 스케일 축소 디코딩 → 출력 버퍼에 바로 리사이즈 (cvtColor / copyMakeBorder 중간 이미지 없음)
+
     Args:
         input_path (str): 원본 이미지 경로
         output_dir (str): 저장할 폴더 경로
         target_size (tuple): 최종 이미지 크기 (기본 : 1024, 1024)
+        pad (bool): target_size 로 패딩 여부 (False 이면 비율 유지 리사이즈 이미지만 저장, Azure 전송 용량 감소)
+        buffer (numpy.ndarray): pad=True 일 때 재사용할 출력 버퍼 (uint8, target_size, 폴더 처리 시 이미지 간 재사용)
     """
     try:
-        img = cv2.imread(input_path)
-        if img is None:
+        gray = read_gray(input_path, (target_size[1], target_size[0]))
+        if gray is None:
             logger.warning(f"[경고] 이미지를 읽을 수 없습니다: {input_path}")
             return
-        
-        # 그레이 스케일
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
+
         # 비율 유지 리사이즈
         h, w = gray.shape
         scale = min(target_size[0] / h, target_size[1] / w)
-        resized = cv2.resize(gray, (int(w * scale), int(h * scale)))
-        
-        # 패딩
-        top = (target_size[0] - resized.shape[0]) // 2
-        bottom = target_size[0] - resized.shape[0] - top
-        left = (target_size[1] - resized.shape[1]) // 2
-        right = target_size[1] - resized.shape[1] - left
-        
-        padded = cv2.copyMakeBorder(
-            resized, top, bottom, left, right,
-            borderType=cv2.BORDER_CONSTANT, value=0
-        )
-        
+        new_w, new_h = max(int(w * scale), 1), max(int(h * scale), 1)
+
+        if pad:
+            # 패딩 : 출력 버퍼 중앙 영역에 바로 리사이즈
+            if buffer is None or buffer.shape != tuple(target_size):
+                buffer = np.zeros(target_size, dtype=np.uint8)
+            else:
+                buffer.fill(0)
+            top = (target_size[0] - new_h) // 2
+            left = (target_size[1] - new_w) // 2
+            cv2.resize(gray, (new_w, new_h), dst=buffer[top:top + new_h, left:left + new_w])
+            output = buffer
+        else:
+            output = cv2.resize(gray, (new_w, new_h))
+
         # 저장
         base_filename = os.path.splitext(os.path.basename(input_path))[0]
         output_path = os.path.join(output_dir, f"{base_filename}.png")
-        
-        success = cv2.imwrite(output_path, padded)
+
+        success = cv2.imwrite(output_path, output)
         if success:
-            logger.info(f"[완료] 전처리 및 저장 완료: {output_path}")    
+            logger.info(f"[완료] 전처리 및 저장 완료: {output_path}")
         else:
             logger.error(f"[에러] 이미지 저장 실패: {output_path}")
-        
+
     except Exception as e:
         logger.error(f"[에러] {input_path} 처리 중 예외 발생: {e}")
-        
-    
+        metrics.incr("preprocess_image_failed")
+
+
     # 폴더 단위 전처리
-def preprocess_folder(input_dir, output_dir, target_size=(1024, 1024)):
+def preprocess_folder(input_dir, output_dir, target_size=(1024, 1024), pad=True):
     """
     폴더 내 모든 이미지 파일을 전처리 합니다.
 
@@ -64,15 +76,17 @@ def preprocess_folder(input_dir, output_dir, target_size=(1024, 1024)):
         input_dir (str): 원본 이미지 폴더
         output_dir (str): 전처리된 이미지 저장 폴더
         target_size (tuple): 전처리 이미지 크기(기본값 : 1024, 1024)
+        pad (bool): target_size 로 패딩 여부 (기본값 : True)
     """
     try:
         ensure_dir(output_dir, logger)
+        buffer = np.zeros(target_size, dtype=np.uint8) if pad else None
         
         files = os.listdir(input_dir)
         for filename in files:
             if is_image_file(filename):
                 input_path = os.path.join(input_dir, filename)
-                preprocess_image(input_path, output_dir, target_size)
+                preprocess_image(input_path, output_dir, target_size, pad=pad, buffer=buffer)
         
         logger.info(f"[완료] 전체 폴더 전처리 완료: {input_dir} -> {output_dir}")
     
@@ -0,0 +1,614 @@
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from box_postprocess import nms, pairwise_overlap, postprocess_boxes
+from image_decode import decode_regions
+from stage_metrics import metrics
+
+logger = logging.getLogger("RECEIPT_DETECTORS")
+
+# =============================================
+# 영수증 검출 백엔드
+#   detect() 는 원본 좌표계 검출 결과 리스트를 반환합니다.
+#   [{"box": (x1, y1, x2, y2), "score": float, "quad": [[x, y] x 4] 또는 None}, ...]
+# =============================================
+# cascade 에서 contour 결과를 채택할 최소 score
+# input_images 15장 기준 contour 는 3장만 4각형을 찾고, 영수증 전체 0.86 / 0.87, 상호명 띠만 잡은 오검출 0.81
+# (YOLO 와의 일치도는 bench_detectors.py --yolo-model / --reference 로 측정, 검증 전까지 cascade 는 실험 기능, 기본 검출기는 yolo)
+CASCADE_MIN_SCORE = 0.85
+
+
+@lru_cache(maxsize=4)
+def load_yolo_model(model_path: str):
+    """YOLO 모델 로드 (경로별 캐시, ultralytics 는 실제 사용 시점에 임포트)"""
+    from ultralytics import YOLO
+
+    logger.info(f"YOLO 모델 로드: {model_path}")
+    return YOLO(model_path)
+
+
+_yolo_locks = weakref.WeakKeyDictionary()
+_yolo_locks_guard = threading.Lock()
+
+
+def yolo_model_lock(model) -> threading.Lock:
+    """YOLO 모델 객체별 추론 잠금 (load_yolo_model 캐시 모델을 여러 워커가 공유하므로 predict 를 직렬화)"""
+    with _yolo_locks_guard:
+        lock = _yolo_locks.get(model)
+        if lock is None:
+            lock = _yolo_locks[model] = threading.Lock()
+        return lock
+
+
+class ReceiptDetector:
+    """검출 백엔드 공통 인터페이스"""
+
+    name = "base"
+    thread_safe = True  # 여러 스레드에서 동시에 detect() 호출 가능 여부
+
+    def detect(self, image: Image.Image, image_path: str = None) -> list:
+        """
+        Args:
+            image (PIL.Image.Image): 검출 대상 이미지 (이미 로드된 원본)
+            image_path (str): 원본 파일 경로 (경로 입력이 빠른 백엔드용, 선택)
+
+        Returns:
+            list[dict]: box / score / quad 검출 결과 (score 내림차순)
+        """
+        raise NotImplementedError
+
+    def __call__(self, image, image_path=None):
+        with metrics.timer(f"detect_{self.name}"):
+            return self.detect(image, image_path)
+
+    def detect_batch(self, images: list) -> list:
+        """이미지 여러 장 검출 (기본 : 순차 실행, 배치 추론이 가능한 백엔드는 재정의)"""
+        return [self(image) for image in images]
+
+
+class YoloDetector(ReceiptDetector):
+    """ultralytics YOLO 백엔드 (기존 crop_receipts_with_yolo 와 동일한 검출)"""
+
+    name = "yolo"
+    thread_safe = False  # ultralytics 모델 객체는 스레드 간 동시 추론이 안전하지 않음 (모델별 잠금으로 직렬 실행)
+
+    def __init__(self, model=None, model_path: str = None):
+        if model is None and not model_path:
+            raise ValueError("YOLO 모델 또는 model_path 가 필요합니다")
+        self._model = model
+        self.model_path = model_path
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_yolo_model(self.model_path)
+        return self._model
+
+    def detect(self, image, image_path=None):
+        model = self.model
+        with yolo_model_lock(model):
+            results = model(image_path or image)
+        return self._to_detections(results[0])
+
+    def detect_batch(self, images):
+        with metrics.timer(f"detect_{self.name}"):
+            model = self.model
+            with yolo_model_lock(model):
+                results = model(list(images))
+            return [self._to_detections(result) for result in results]
+
+    @staticmethod
+    def _to_detections(result):
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return []
+        detections = []
+        for box in boxes:
+            x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
+            score = float(box.conf[0]) if getattr(box, "conf", None) is not None else 1.0
+            detections.append({"box": (x1, y1, x2, y2), "score": score, "quad": None})
+        return detections
+
+
+# =============================================
+# ONNX Runtime 백엔드 (PyTorch / ultralytics 없이 CPU 추론)
+#   전처리(letterbox)와 후처리(NMS)는 ultralytics predict 기본값과 동일하게 맞춤
+# =============================================
+ONNX_PROVIDERS = ("OpenVINOExecutionProvider", "CPUExecutionProvider")
+LETTERBOX_COLOR = (114, 114, 114)
+
+
+def letterbox(image: Image.Image, size: int = 640):
+    """
+    비율 유지 리사이즈 후 size x size 캔버스 중앙에 배치
+
+    Returns:
+        tuple: (입력 텐서 float32 [1, 3, size, size], 축소 비율, (pad_x, pad_y))
+    """
+    width, height = image.size
+    ratio = min(size / width, size / height)
+    new_w, new_h = max(round(width * ratio), 1), max(round(height * ratio), 1)
+    pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+
+    canvas = Image.new("RGB", (size, size), LETTERBOX_COLOR)
+    canvas.paste(image.convert("RGB").resize((new_w, new_h), Image.BILINEAR),
+                 (int(round(pad_x - 0.1)), int(round(pad_y - 0.1))))
+    tensor = np.asarray(canvas, dtype=np.float32).transpose(2, 0, 1)[None] / 255.0
+    return np.ascontiguousarray(tensor), ratio, (pad_x, pad_y)
+
+
+def decode_yolo_output(output: np.ndarray, ratio: float, pad: tuple, image_size: tuple,
+                       conf: float = 0.25, iou: float = 0.7) -> list:
+    """
+    YOLOv8 ONNX 출력 [1, 4 + 클래스 수, 후보 수] (cx, cy, w, h, 클래스 score) → 원본 좌표 검출 결과
+    """
+    pred = output[0].T
+    scores = pred[:, 4:].max(axis=1)
+    mask = scores >= conf
+    pred, scores = pred[mask], scores[mask]
+    if not len(pred):
+        return []
+
+    cx, cy, w, h = pred[:, 0], pred[:, 1], pred[:, 2], pred[:, 3]
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    boxes -= np.array([pad[0], pad[1], pad[0], pad[1]], dtype=boxes.dtype)
+    boxes /= ratio
+    width, height = image_size
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+
+    return [
+        {"box": tuple(int(v) for v in boxes[i]), "score": round(float(scores[i]), 4), "quad": None}
+        for i in nms(boxes, scores, iou)
+    ]
+
+
+@lru_cache(maxsize=4)
+def load_onnx_session(model_path: str, providers: tuple = None, threads: int = None):
+    """
+    ONNX Runtime 세션 로드 (경로별 캐시, onnxruntime 은 실제 사용 시점에 임포트)
+    providers 는 설치된 것만 사용 (OpenVINO EP 가 없으면 CPU EP)
+    """
+    import onnxruntime as ort
+
+    available = ort.get_available_providers()
+    selected = [p for p in (providers or ONNX_PROVIDERS) if p in available] or ["CPUExecutionProvider"]
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    logger.info(f"ONNX 모델 로드: {model_path} ({', '.join(selected)})")
+    return ort.InferenceSession(model_path, sess_options=options, providers=selected)
+
+
+class OnnxDetector(ReceiptDetector):
+    """
+    ONNX Runtime 백엔드 (export_onnx() 로 변환한 best.onnx / best.int8.onnx)
+    세션 run 은 스레드 안전하므로 YOLO 처럼 직렬 실행할 필요가 없습니다.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, imgsz: int = None, conf: float = 0.25, iou: float = 0.7,
+                 providers: tuple = None, threads: int = None):
+        """
+        Args:
+            model_path (str): ONNX 모델 경로
+            imgsz (int): 입력 크기 (기본값 : 모델 입력 shape 에서 읽음)
+            conf (float): 최소 score (ultralytics 기본값 0.25)
+            iou (float): NMS IoU (ultralytics 기본값 0.7)
+            providers (tuple): 실행 provider 우선순위 (기본값 : OpenVINO → CPU)
+            threads (int): 세션 intra-op 스레드 수 (워커 다중 실행 시 코어 수 / 워커 수 권장)
+        """
+        self.model_path = model_path
+        self.conf = conf
+        self.iou = iou
+        self.providers = tuple(providers) if providers else None
+        self.threads = threads
+        self._imgsz = imgsz
+
+    @property
+    def session(self):
+        return load_onnx_session(self.model_path, self.providers, self.threads)
+
+    @property
+    def imgsz(self):
+        if self._imgsz is None:
+            shape = self.session.get_inputs()[0].shape
+            self._imgsz = shape[-1] if isinstance(shape[-1], int) else 640
+        return self._imgsz
+
+    def detect(self, image, image_path=None):
+        tensor, ratio, pad = letterbox(image, self.imgsz)
+        session = self.session
+        output = session.run(None, {session.get_inputs()[0].name: tensor})[0]
+        return decode_yolo_output(output, ratio, pad, image.size, self.conf, self.iou)
+
+
+def export_onnx(model_path: str, imgsz: int = 640, int8: bool = False) -> str:
+    """
+    YOLO .pt 모델을 ONNX 로 변환 (int8=True 이면 동적 INT8 양자화 모델도 생성)
+
+    Returns:
+        str: 생성된 ONNX 경로 (int8=True 이면 양자화 모델 경로)
+    """
+    onnx_path = load_yolo_model(model_path).export(format="onnx", imgsz=imgsz, simplify=True, dynamic=False)
+    logger.info(f"ONNX 변환 완료: {onnx_path}")
+    if not int8:
+        return str(onnx_path)
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = str(Path(onnx_path).with_suffix(".int8.onnx"))
+    quantize_dynamic(str(onnx_path), int8_path, weight_type=QuantType.QUInt8)
+    logger.info(f"INT8 양자화 완료: {int8_path}")
+    return int8_path
+
+
+class ContourDetector(ReceiptDetector):
+    """
+    Canny + 윤곽선 사각형 검출 백엔드 (CPU, 모델 불필요)
+    tracing/receipt_pipeline.py 의 정규화 → Canny → 닫힘 연산 → 4각형 근사 방식을 축소 이미지에서 수행합니다.
+
+    score 는 윤곽선 면적 / 최소 외접 회전 사각형 면적 (사각형에 가까울수록 1)
+    """
+
+    name = "contour"
+
+    def __init__(self, max_side=800, min_area_ratio=0.05, max_area_ratio=0.95, max_detections=10):
+        """
+        Args:
+            max_side (int): 검출용 축소 이미지 긴 변 (기본값 : 800)
+            min_area_ratio (float): 이미지 대비 최소 면적 비율 (작은 잡음 윤곽 제외)
+            max_area_ratio (float): 이미지 대비 최대 면적 비율 (이미지 테두리 자체 제외)
+            max_detections (int): 최대 검출 수
+        """
+        self.max_side = max_side
+        self.min_area_ratio = min_area_ratio
+        self.max_area_ratio = max_area_ratio
+        self.max_detections = max_detections
+
+    def detect(self, image, image_path=None):
+        import cv2  # 윤곽선 검출 시에만 필요 (임포트 비용을 사용 시점으로 미룸)
+
+        width, height = image.size
+        factor = max(max(width, height) // self.max_side, 1)
+        small = image.reduce(factor) if factor > 1 else image
+        gray = np.asarray(small.convert("L"))
+        scale_x, scale_y = width / gray.shape[1], height / gray.shape[0]
+
+        blur = cv2.GaussianBlur(gray, (21, 21), 0)
+        normalized = cv2.divide(gray, blur, scale=255)
+        edges = cv2.Canny(normalized, 50, 150)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel, iterations=2)
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        image_area = gray.shape[0] * gray.shape[1]
+        detections = []
+        for cnt in contours:
+            area = cv2.contourArea(cnt)
+            if not self.min_area_ratio * image_area <= area <= self.max_area_ratio * image_area:
+                continue
+            approx = cv2.approxPolyDP(cnt, 0.02 * cv2.arcLength(cnt, True), True)
+            if len(approx) != 4:
+                continue
+            (_, _), (rect_w, rect_h), _ = cv2.minAreaRect(cnt)
+            score = min(area / max(rect_w * rect_h, 1.0), 1.0)
+
+            quad = approx.reshape(4, 2).astype("float32") * np.array([scale_x, scale_y], dtype="float32")
+            x1, y1 = np.floor(quad.min(axis=0)).astype(int)
+            x2, y2 = np.ceil(quad.max(axis=0)).astype(int)
+            detections.append({
+                "box": (max(int(x1), 0), max(int(y1), 0), min(int(x2), width), min(int(y2), height)),
+                "score": round(float(score), 4),
+                "quad": quad.round(1).tolist(),
+            })
+
+        detections.sort(key=lambda d: d["score"], reverse=True)
+        return detections[:self.max_detections]
+
+
+class CascadeDetector(ReceiptDetector):
+    """
+    저비용 검출기를 먼저 실행하고, 결과가 없거나 신뢰도가 낮으면 fallback(YOLO) 실행
+    (실험 기능 : contour score 와 검출 정확도의 관계가 input_images 3장으로만 확인됨, CASCADE_MIN_SCORE 참고)
+    """
+
+    name = "cascade"
+
+    def __init__(self, primary: ReceiptDetector, fallback: ReceiptDetector, min_score=CASCADE_MIN_SCORE):
+        """
+        Args:
+            primary (ReceiptDetector): 먼저 실행할 검출기 (예: ContourDetector)
+            fallback (ReceiptDetector): 신뢰도 미달 시 실행할 검출기 (예: YoloDetector)
+            min_score (float): primary 결과를 채택할 최소 score (모든 검출이 이 값 이상이어야 채택)
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.min_score = min_score
+        self.thread_safe = primary.thread_safe and fallback.thread_safe
+
+    def detect(self, image, image_path=None):
+        detections = self.primary(image, image_path)
+        if detections and min(d["score"] for d in detections) >= self.min_score:
+            metrics.incr("cascade_primary")
+            return detections
+        metrics.incr("cascade_fallback")
+        return self.fallback(image, image_path)
+
+
+class TiledDetector(ReceiptDetector):
+    """
+    세로로 긴 이미지(문서 병합 이미지)를 겹치는 타일로 나눠 검출 후 원본 좌표로 합치기
+    640 letterbox 에 통째로 넣으면 영수증이 수 픽셀로 줄어 놓치므로, 폭 기준 정사각형에 가까운 타일 단위로 검출합니다.
+
+    - 타일은 병렬 실행 (스레드 안전하지 않은 백엔드는 detect_batch 배치 추론)
+    - 타일 경계에서 잘린 박스는 인접 타일 박스와 이어 붙이고, 겹침 구간 중복은 IoU / 포함 비율로 제거
+    """
+
+    name = "tiled"
+
+    def __init__(self, base: ReceiptDetector, tile_ratio=1.0, overlap=0.25, min_aspect=2.0, max_workers=4,
+                 iou=0.5, containment=0.8):
+        """
+        Args:
+            base (ReceiptDetector): 타일마다 실행할 검출기
+            tile_ratio (float): 타일 높이 / 이미지 폭 (기본값 : 1.0, 정사각형)
+            overlap (float): 인접 타일 겹침 비율 (영수증이 경계에 걸려도 한 타일에는 온전히 들어오도록)
+            min_aspect (float): 세로/가로 비율이 이 값 미만이면 타일 없이 base 로 바로 검출
+            max_workers (int): 타일 병렬 스레드 수
+            iou (float): 중복 판정 IoU
+            containment (float): 작은 박스가 큰 박스에 이 비율 이상 포함되면 중복으로 제거
+        """
+        self.base = base
+        self.tile_ratio = tile_ratio
+        self.overlap = overlap
+        self.min_aspect = min_aspect
+        self.max_workers = max_workers
+        self.iou = iou
+        self.containment = containment
+        self.thread_safe = base.thread_safe
+
+    def tiles(self, width: int, height: int) -> list:
+        """타일 세로 구간 [(y0, y1), ...] (마지막 타일은 이미지 끝에 맞춤)"""
+        tile_h = max(int(width * self.tile_ratio), 1)
+        if height <= tile_h:
+            return [(0, height)]
+        stride = max(int(tile_h * (1 - self.overlap)), 1)
+        starts = list(range(0, height - tile_h, stride)) + [height - tile_h]
+        return [(y0, y0 + tile_h) for y0 in starts]
+
+    def detect(self, image, image_path=None):
+        width, height = image.size
+        if height < width * self.min_aspect:
+            return self.base(image, image_path)
+
+        spans = self.tiles(width, height)
+        tile_images = [image.crop((0, y0, width, y1)) for y0, y1 in spans]
+        metrics.incr("detect_tiles", len(tile_images))
+        if self.thread_safe and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tile_images))) as pool:
+                per_tile = list(pool.map(self.base, tile_images))
+        else:
+            per_tile = self.base.detect_batch(tile_images)
+
+        margin = max(int(width * 0.01), 2)
+        detections = []
+        for (y0, y1), tile_detections in zip(spans, per_tile):
+            for d in tile_detections:
+                x1, by1, x2, by2 = d["box"]
+                detections.append({
+                    "box": (x1, by1 + y0, x2, by2 + y0),
+                    "score": d["score"],
+                    "quad": [[x, y + y0] for x, y in d["quad"]] if d.get("quad") else None,
+                    "cut_top": y0 > 0 and by1 <= margin,
+                    "cut_bottom": y1 < height and by2 >= (y1 - y0) - margin,
+                })
+        detections = self._suppress(self._join_cut(detections))
+        for d in detections:
+            d.pop("cut_top", None)
+            d.pop("cut_bottom", None)
+        return detections
+
+    def _join_cut(self, detections):
+        """타일 아래 경계에서 잘린 박스와 다음 타일 위 경계에서 잘린 박스를 하나로 합치기 (여러 타일에 걸친 긴 영수증)"""
+        detections = sorted(detections, key=lambda d: d["box"][1])
+        merged = True
+        while merged:
+            merged = False
+            for i, a in enumerate(detections):
+                if not a["cut_bottom"]:
+                    continue
+                for j, b in enumerate(detections):
+                    if i == j or not b["cut_top"] or not a["box"][1] < b["box"][1] <= a["box"][3]:
+                        continue
+                    ax1, ay1, ax2, ay2 = a["box"]
+                    bx1, by1, bx2, by2 = b["box"]
+                    x_overlap = min(ax2, bx2) - max(ax1, bx1)
+                    if x_overlap < self.containment * (max(ax2, bx2) - min(ax1, bx1)):
+                        continue
+                    detections[i] = {
+                        "box": (min(ax1, bx1), ay1, max(ax2, bx2), max(ay2, by2)),
+                        "score": max(a["score"], b["score"]),
+                        "quad": None,
+                        "cut_top": a["cut_top"],
+                        "cut_bottom": b["cut_bottom"],
+                    }
+                    del detections[j]
+                    merged = True
+                    break
+                if merged:
+                    break
+        return detections
+
+    def _suppress(self, detections):
+        """겹침 구간 중복 제거 : IoU 가 높으면 score 높은 박스, 포함 관계면 큰 박스를 남김"""
+        if len(detections) < 2:
+            return detections
+        areas, iou, contained = pairwise_overlap([d["box"] for d in detections])
+
+        keep = []
+        for i in sorted(range(len(detections)), key=lambda k: detections[k]["score"], reverse=True):
+            duplicate = [k for k in keep if iou[i, k] >= self.iou or contained[i, k] >= self.containment]
+            if not duplicate:
+                keep.append(i)
+            elif all(areas[i] > areas[k] and iou[i, k] < self.iou for k in duplicate):
+                # 타일 경계에서 잘린 조각이 먼저 남은 경우 온전한 큰 박스로 교체
+                keep = [k for k in keep if k not in duplicate] + [i]
+        keep.sort(key=lambda k: detections[k]["box"][1])
+        return [detections[k] for k in keep]
+
+
+class FilteredDetector(ReceiptDetector):
+    """검출 결과에 box_postprocess.postprocess_boxes (신뢰도 / 면적 필터, 중복 병합, 상위 k) 적용"""
+
+    def __init__(self, base: ReceiptDetector, **box_options):
+        self.base = base
+        self.name = base.name
+        self.box_options = box_options
+        self.thread_safe = base.thread_safe
+
+    def __call__(self, image, image_path=None):
+        return self.detect(image, image_path)
+
+    def detect(self, image, image_path=None):
+        return postprocess_boxes(self.base(image, image_path), image.size, **self.box_options)
+
+    def detect_batch(self, images):
+        return [postprocess_boxes(detections, image.size, **self.box_options)
+                for image, detections in zip(images, self.base.detect_batch(images))]
+
+
+DETECTORS = ("yolo", "onnx", "contour", "cascade")
+
+
+def _model_detector(model=None, model_path: str = None, onnx_options: dict = None) -> ReceiptDetector:
+    """모델 경로 확장자로 YOLO(.pt) / ONNX(.onnx) 백엔드 선택"""
+    if model is None and model_path and str(model_path).lower().endswith(".onnx"):
+        return OnnxDetector(str(model_path), **(onnx_options or {}))
+    return YoloDetector(model=model, model_path=model_path)
+
+
+def build_detector(name: str = "yolo", model=None, model_path: str = None, min_score: float = CASCADE_MIN_SCORE,
+                   onnx_options: dict = None, tile_options: dict = None, box_options: dict = None, **options):
+    """
+    이름으로 검출 백엔드 생성
+
+    Args:
+        name (str): yolo / onnx / contour / cascade (실험 기능)
+            yolo, cascade 는 model_path 가 .onnx 이면 ONNX Runtime 백엔드를 사용
+        model: 이미 로드된 YOLO 모델 (선택)
+        model_path (str): YOLO 모델 경로 (.pt 또는 .onnx)
+        min_score (float): cascade 에서 contour 결과를 채택할 최소 score
+        onnx_options (dict): OnnxDetector 옵션 (providers, threads, conf, iou)
+        tile_options (dict): 지정하면 TiledDetector 로 감싸서 세로로 긴 이미지를 타일 검출 ({} 이면 기본값)
+        box_options (dict): 지정하면 최종 검출 결과에 박스 후처리 적용 (box_postprocess.box_options_from 참고)
+        **options: ContourDetector 옵션 (max_side, min_area_ratio 등)
+
+    Returns:
+        ReceiptDetector
+    """
+    if name == "yolo":
+        detector = _model_detector(model, model_path, onnx_options)
+    elif name == "onnx":
+        if not model_path:
+            raise ValueError("onnx 검출기는 model_path 가 필요합니다")
+        detector = OnnxDetector(str(model_path), **(onnx_options or {}))
+    elif name == "contour":
+        detector = ContourDetector(**options)
+    elif name == "cascade":
+        detector = CascadeDetector(ContourDetector(**options), _model_detector(model, model_path, onnx_options), min_score)
+    else:
+        raise ValueError(f"지원하지 않는 검출기: {name} (지원: {', '.join(DETECTORS)})")
+
+    if tile_options is not None:
+        detector = TiledDetector(detector, **tile_options)
+    if box_options is not None:
+        detector = FilteredDetector(detector, **box_options)
+    return detector
+
+
+def scale_detections(detections: list, scale: tuple, image_size: tuple) -> list:
+    """
+    축소 이미지 검출 결과를 원본 좌표로 변환
+
+    Args:
+        detections (list): 축소 이미지 기준 검출 결과
+        scale (tuple): 원본 / 축소 배율 (sx, sy)
+        image_size (tuple): 원본 (width, height)
+    """
+    sx, sy = scale
+    width, height = image_size
+    scaled = []
+    for d in detections:
+        x1, y1, x2, y2 = d["box"]
+        scaled.append({
+            **d,
+            "box": (max(int(x1 * sx), 0), max(int(y1 * sy), 0), min(int(round(x2 * sx)), width), min(int(round(y2 * sy)), height)),
+            "quad": [[x * sx, y * sy] for x, y in d["quad"]] if d.get("quad") else None,
+        })
+    return scaled
+
+
+def crop_detection(image: Image.Image, detection: dict, warp: bool = False) -> Image.Image:
+    """
+    검출 결과 영역 자르기 (warp=True 이고 quad 가 있으면 원근 보정)
+    """
+    if not warp or not detection.get("quad"):
+        return image.crop(detection["box"])
+
+    import cv2  # 원근 보정 시에만 필요 (임포트 비용을 사용 시점으로 미룸)
+
+    quad = np.array(detection["quad"], dtype="float32")
+    s = quad.sum(axis=1)
+    diff = np.diff(quad, axis=1).ravel()
+    rect = np.array([quad[np.argmin(s)], quad[np.argmin(diff)], quad[np.argmax(s)], quad[np.argmax(diff)]], dtype="float32")
+    tl, tr, br, bl = rect
+    out_w = int(max(np.linalg.norm(br - bl), np.linalg.norm(tr - tl)))
+    out_h = int(max(np.linalg.norm(tr - br), np.linalg.norm(tl - bl)))
+    dst = np.array([[0, 0], [out_w - 1, 0], [out_w - 1, out_h - 1], [0, out_h - 1]], dtype="float32")
+    matrix = cv2.getPerspectiveTransform(rect, dst)
+    warped = cv2.warpPerspective(np.asarray(image.convert("RGB")), matrix, (out_w, out_h))
+    return Image.fromarray(warped)
+
+
+def crop_detections(image: Image.Image, detections: list, warp: bool = False, source_path: str = None) -> list:
+    """
+    검출 결과 여러 개 자르기
+
+    source_path 를 지정하면 image 는 크기 확인용으로만 쓰고, 박스 영역을 source_path 에서 원본 해상도로 잘라냅니다.
+    (축소 이미지로 검출한 경우 크롭 이미지만 원본 화질, 디코딩 범위는 decode_regions 참고 : JPEG 는 원본 전체 1 회)
+    """
+    if not source_path:
+        return [crop_detection(image, d, warp) for d in detections]
+
+    regions = decode_regions(source_path, [d["box"] for d in detections])
+    crops = []
+    for region, d in zip(regions, detections):
+        x1, y1 = d["box"][:2]
+        local = {**d, "box": (0, 0, region.width, region.height),
+                 "quad": [[x - x1, y - y1] for x, y in d["quad"]] if d.get("quad") else None}
+        crops.append(crop_detection(region, local, warp))
+    return crops
+
+
+# ─ ONNX 변환 ─
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="YOLO .pt → ONNX 변환")
+    parser.add_argument("model_path", help="YOLO 모델(.pt) 경로")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--int8", action="store_true", help="동적 INT8 양자화 모델도 생성")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print("변환 결과:", export_onnx(args.model_path, args.imgsz, args.int8))
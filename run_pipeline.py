@@ -1,8 +1,11 @@
 import os
+import argparse
 from utils import setup_logger, ensure_dir
 from preprocessing import preprocess_folder
 from azure_client import AzureReceiptClient
 from postprocessing import load_lookup_table, process_folder
+from stage_metrics import metrics, stage_timer
+from mem_profile import MemoryProfiler
 
 # =============================================
 # 폴더 및 파일 경로 설정
@@ -13,6 +16,7 @@ AZURE_RESULT_DIR = './results/json'
 CSV_OUTPUT_PATH = './results/csv/final_output.csv'
 LOOKUP_TABLE_PATH = './lookup_table.csv'
 LOG_DIR = './logs'
+METRICS_DIR = './results/metrics'
 
 # =============================================
 # 로깅 설정
@@ -22,21 +26,29 @@ logger = setup_logger('run_pipeline', log_dir=LOG_DIR)
 # =============================================
 # 전체 파이프라인 실행
 # =============================================
-def run_pipeline():
+def run_pipeline(profile_memory=False):
+    """
+    Args:
+        profile_memory (bool): 스테이지별 메모리 프로파일링 (RSS / cgroup 샘플링 + tracemalloc 스냅샷 비교)
+    """
+    profiler = MemoryProfiler(enabled=profile_memory)
+    profiler.start()
     try:
         logger.info("🚀 영수증 처리 파이프라인 시작")
 
         # Step 1: 이미지 전처리
         logger.info("📌 Step 1: 이미지 전처리 시작")
         ensure_dir(PROCESSED_IMAGE_DIR, logger)
-        preprocess_folder(INPUT_IMAGE_DIR, PROCESSED_IMAGE_DIR)
+        with profiler.stage("preprocess_folder"), stage_timer("preprocess_folder"):
+            preprocess_folder(INPUT_IMAGE_DIR, PROCESSED_IMAGE_DIR)
         logger.info("✅ Step 1: 이미지 전처리 완료")
 
         # Step 2: Azure OCR 분석
         logger.info("📌 Step 2: Azure OCR 분석 시작")
         ensure_dir(AZURE_RESULT_DIR, logger)
         client = AzureReceiptClient()
-        client.analyze_folder(PROCESSED_IMAGE_DIR, AZURE_RESULT_DIR)
+        with profiler.stage("ocr_folder"), stage_timer("ocr_folder"):
+            client.analyze_folder(PROCESSED_IMAGE_DIR, AZURE_RESULT_DIR)
         logger.info("✅ Step 2: Azure OCR 분석 완료")
 
         # Step 3: 결과 후처리 및 CSV 저장
@@ -44,7 +56,8 @@ def run_pipeline():
         output_dir = os.path.dirname(CSV_OUTPUT_PATH) or '.'
         ensure_dir(output_dir, logger)
         lookup_table = load_lookup_table(LOOKUP_TABLE_PATH)
-        process_folder(AZURE_RESULT_DIR, CSV_OUTPUT_PATH, lookup_table)
+        with profiler.stage("postprocess_folder"), stage_timer("postprocess_folder"):
+            process_folder(AZURE_RESULT_DIR, CSV_OUTPUT_PATH, lookup_table)
         logger.info("✅ Step 3: 후처리 및 CSV 생성 완료")
 
         logger.info("🎉 전체 파이프라인 성공적으로 완료되었습니다.")
@@ -52,8 +65,23 @@ def run_pipeline():
     except Exception as e:
         logger.exception(f"❌ 파이프라인 실행 중 예외 발생: {e}")
 
+    finally:
+        # 스테이지별 지연 시간 요약 (JSON + Prometheus 텍스트)
+        metrics.log_summary(logger)
+        json_path, prom_path = metrics.export(METRICS_DIR)
+        logger.info(f"📊 스테이지 메트릭 저장: {json_path}, {prom_path}")
+
+        profiler.stop()
+        report_paths = profiler.write_report(METRICS_DIR)
+        if report_paths:
+            logger.info(f"🧠 메모리 프로파일 리포트 저장: {report_paths[1]}")
+
 # =============================================
 # 메인 진입점
 # =============================================
 if __name__ == "__main__":
-    run_pipeline()
+    parser = argparse.ArgumentParser(description="영수증 처리 파이프라인")
+    parser.add_argument("--profile-memory", action="store_true", help="스테이지별 메모리 프로파일 리포트 생성")
+    args = parser.parse_args()
+
+    run_pipeline(profile_memory=args.profile_memory)
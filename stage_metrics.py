@@ -0,0 +1,260 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+# =============================================
+# 히스토그램 설정 (HDR 방식 : 2배 구간마다 고정 개수의 하위 구간)
+# =============================================
+SUB_BUCKET_BITS = 5                      # 구간당 하위 구간 32개 → 상대 오차 약 3%
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """
+    지연 시간 히스토그램 (마이크로초 정수 기록, 로그 구간 희소 저장)
+
+    값의 크기와 관계없이 상대 오차가 일정하고 (1us ~ 수 시간),
+    기록은 O(1), 메모리는 실제 값이 들어간 구간 수에 비례합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    @staticmethod
+    def _index(value_us):
+        if value_us < SUB_BUCKET_COUNT:
+            return value_us
+        shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+        return SUB_BUCKET_COUNT * (shift + 1) + (value_us >> shift) - SUB_BUCKET_COUNT
+
+    @staticmethod
+    def _bounds(index):
+        """구간 인덱스 -> (하한, 상한) us"""
+        if index < SUB_BUCKET_COUNT:
+            return index, index + 1
+        shift = index // SUB_BUCKET_COUNT - 1
+        low = (index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT) << shift
+        return low, low + (1 << shift)
+
+    def record(self, seconds):
+        value_us = max(int(seconds * 1_000_000), 0)
+        index = self._index(value_us)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.total_us += value_us
+            self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+            self.max_us = max(self.max_us, value_us)
+
+    def percentile(self, q):
+        """q 분위 지연 시간 (초, 구간 중앙값 기준)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(int(q * self.count + 0.5), 1)
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= rank:
+                    low, high = self._bounds(index)
+                    return min((low + high) / 2, self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum_sec": round(self.total_us / 1_000_000, 6),
+            "mean_ms": round(self.total_us / self.count / 1000, 3) if self.count else 0.0,
+            "min_ms": round((self.min_us or 0) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+            **{f"p{int(q * 100)}_ms": round(self.percentile(q) * 1000, 3) for q in QUANTILES},
+        }
+
+
+# =============================================
+# 스테이지 메트릭 레지스트리
+# =============================================
+class StageMetrics:
+    """
+    스테이지별 지연 시간 히스토그램 + 카운터 (스레드 안전)
+
+    사용 예:
+        with stage_timer("ocr_poll"):
+            result = poller.result()
+
+        @timed("convert")
+        def convert_to_png(...): ...
+
+    @timed 은 함수 밖으로 전파된 예외만 error 로 셉니다.
+    예외를 잡아 기본값을 반환하는 함수는 except 에서 metrics.incr("<stage>_failed") 로 실패를 집계합니다.
+    """
+
+    def __init__(self, namespace="idp"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.observers = ()
+
+    def add_observer(self, observer):
+        """
+        단계 경계 관찰자 등록 (observer(stage) 가 반환하는 컨텍스트 매니저로 timer 구간을 함께 감쌈)
+        예: metrics.add_observer(profiler.stage) - 메모리 프로파일을 지연 시간과 같은 단계로 분리
+        """
+        with self._lock:
+            self.observers = self.observers + (observer,)
+
+    def remove_observer(self, observer):
+        with self._lock:
+            self.observers = tuple(o for o in self.observers if o != observer)
+
+    def histogram(self, stage):
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = LatencyHistogram()
+            return self.histograms[stage]
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, stage, seconds, ok=True):
+        self.histogram(stage).record(seconds)
+        self.incr(f"{stage}_{'ok' if ok else 'error'}")
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        with 블록 실행 시간 기록 (예외 발생 시 error 카운터 증가 후 예외 전파)
+        yield 되는 dict 의 'elapsed' 에 블록 종료 후 소요 시간(초)이 채워집니다.
+        """
+        with ExitStack() as observed:
+            for observer in self.observers:
+                observed.enter_context(observer(stage))
+            span = {"stage": stage, "elapsed": 0.0}
+            start = time.perf_counter()
+            ok = False
+            try:
+                yield span
+                ok = True
+            finally:
+                span["elapsed"] = time.perf_counter() - start
+                self.record(stage, span["elapsed"], ok)
+
+    def timed(self, stage):
+        """함수 실행 시간 기록 데코레이터"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+
+    # ---------------------------------------------
+    # 내보내기
+    # ---------------------------------------------
+    def to_dict(self):
+        with self._lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+        return {
+            "stages": {stage: hist.summary() for stage, hist in sorted(histograms.items())},
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def to_prometheus(self):
+        """Prometheus text exposition 형식 (스테이지 지연 시간은 summary 타입)"""
+        name = f"{self.namespace}_stage_duration_seconds"
+        lines = [f"# HELP {name} Pipeline stage latency.", f"# TYPE {name} summary"]
+        with self._lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+        for stage, hist in sorted(histograms.items()):
+            for q in QUANTILES:
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {hist.percentile(q):.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {hist.total_us / 1_000_000:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+
+        counter_name = f"{self.namespace}_events_total"
+        lines += [f"# HELP {counter_name} Pipeline event counters.", f"# TYPE {counter_name} counter"]
+        for key, value in sorted(counters.items()):
+            lines.append(f'{counter_name}{{event="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_dir, prefix="stage_metrics"):
+        """
+        JSON 요약 + Prometheus 텍스트 파일 저장 (node_exporter textfile collector 로 수집 가능)
+
+        Returns:
+            tuple: (json 경로, prom 경로)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, f"{prefix}.json")
+        prom_path = os.path.join(output_dir, f"{prefix}.prom")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        with open(prom_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        return json_path, prom_path
+
+    def log_summary(self, logger):
+        for stage, s in self.to_dict()["stages"].items():
+            logger.info(
+                f"[메트릭] {stage}: n={s['count']} p50={s['p50_ms']}ms p95={s['p95_ms']}ms "
+                f"p99={s['p99_ms']}ms max={s['max_ms']}ms"
+            )
+
+    def serve(self, port=9108, host="0.0.0.0"):
+        """
+        /metrics (Prometheus), /metrics.json 엔드포인트를 백그라운드 스레드로 제공
+
+        Returns:
+            ThreadingHTTPServer: 종료 시 shutdown() 호출
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.to_dict(), ensure_ascii=False), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="stage-metrics", daemon=True).start()
+        return server
+
+
+# 프로세스 공용 레지스트리
+metrics = StageMetrics()
+stage_timer = metrics.timer
+timed = metrics.timed
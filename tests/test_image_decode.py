@@ -0,0 +1,89 @@
+"""
+image_decode.py 단위 테스트 (PNG 부분 디코딩 / JPEG 영역 디코딩 결과가 전체 디코딩 크롭과 픽셀 단위로 같은지)
+
+실행:
+    python -m pytest -q tests
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import image_decode
+from image_decode import decode_regions, decode_savings, open_reduced
+from stage_metrics import metrics
+
+BOXES = [(10, 20, 120, 90), (0, 0, 200, 15), (150, 60, 200, 140)]
+
+
+def _noise_image(mode, size=(200, 300), seed=0):
+    rng = np.random.default_rng(seed)
+    channels = {"L": 1, "RGB": 3, "RGBA": 4}[mode]
+    pixels = rng.integers(0, 256, size=(size[1], size[0], channels), dtype=np.uint8)
+    return Image.fromarray(pixels[:, :, 0] if channels == 1 else pixels, mode)
+
+
+def _full_crops(path, boxes):
+    with Image.open(path) as img:
+        img.load()
+        return [img.crop(box).convert("RGB") for box in boxes]
+
+
+def _assert_same(regions, expected):
+    assert len(regions) == len(expected)
+    for region, reference in zip(regions, expected):
+        assert region.size == reference.size
+        assert np.array_equal(np.asarray(region), np.asarray(reference))
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+def test_partial_png_matches_full_decode(tmp_path, mode):
+    path = str(tmp_path / f"page_{mode}.png")
+    _noise_image(mode).save(path)
+    metrics.reset()
+
+    regions = decode_regions(path, BOXES)
+
+    _assert_same(regions, _full_crops(path, BOXES))
+    counters = metrics.to_dict()["counters"]
+    if image_decode.PARTIAL_PNG_SUPPORTED:
+        # 마지막 박스 아래(140 행 이후)는 디코딩하지 않음
+        assert counters["decode_region_pixels_decoded"] == 200 * 140
+        assert counters["decode_region_pixels_full"] == 200 * 300
+
+
+def test_partial_png_disabled_falls_back_to_full_decode(tmp_path, monkeypatch):
+    path = str(tmp_path / "page.png")
+    _noise_image("RGB").save(path)
+    monkeypatch.setattr(image_decode, "PARTIAL_PNG_SUPPORTED", False)
+    metrics.reset()
+
+    regions = decode_regions(path, BOXES)
+
+    _assert_same(regions, _full_crops(path, BOXES))
+    assert metrics.to_dict()["counters"]["decode_region_pixels_decoded"] == 200 * 300
+
+
+def test_jpeg_regions_match_full_decode(tmp_path):
+    path = str(tmp_path / "photo.jpg")
+    _noise_image("RGB").save(path, quality=90)
+
+    _assert_same(decode_regions(path, BOXES), _full_crops(path, BOXES))
+
+
+def test_decode_savings_counts_only_reduced_decode(tmp_path):
+    path = str(tmp_path / "photo.jpg")
+    _noise_image("RGB", size=(1600, 1200)).save(path, quality=90)
+    metrics.reset()
+
+    decode_regions(path, BOXES)
+    assert decode_savings() == {"pixels_saved_ratio": 0.0, "decode_s": 0.0, "estimated_saved_s": 0.0}
+
+    img, _ = open_reduced(path, 200)
+    assert img.size == (200, 150)
+    assert decode_savings()["pixels_saved_ratio"] == round(1 - 1 / 64, 4)
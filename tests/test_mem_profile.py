@@ -0,0 +1,52 @@
+"""
+mem_profile.py MemoryProfiler 단위 테스트 (stage_metrics 단계 경계 연동, 스테이지 합산)
+
+실행:
+    python -m pytest -q tests
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from mem_profile import MemoryProfiler
+from stage_metrics import StageMetrics
+
+
+def test_top_growth_skips_freed_locations():
+    profiler = MemoryProfiler(top_n=1, interval_sec=60)
+    profiler.start()
+    freed = [bytearray(1 << 20) for _ in range(4)]
+    try:
+        with profiler.stage("work"):
+            del freed[:]
+            kept = bytearray(1 << 16)
+    finally:
+        profiler.stop()
+
+    top = profiler.report()["stages"][0]["top_growth"]
+    assert len(top) == 1 and top[0]["size_diff_kb"] > 0
+    assert kept
+
+
+def test_observer_profiles_stage_metrics_boundaries():
+    metrics = StageMetrics()
+    profiler = MemoryProfiler(interval_sec=60)
+    profiler.start()
+    metrics.add_observer(profiler.stage)
+    try:
+        for _ in range(3):
+            with metrics.timer("download"):
+                pass
+        with metrics.timer("db_insert"):
+            pass
+    finally:
+        metrics.remove_observer(profiler.stage)
+        profiler.stop()
+
+    stages = {stage["stage"]: stage for stage in profiler.report()["stages"]}
+    assert stages["download"]["calls"] == 3
+    assert stages["db_insert"]["calls"] == 1
+    assert metrics.counters["download_ok"] == 3
+    assert metrics.observers == ()
@@ -0,0 +1,42 @@
+"""
+merchant_normalizer.py MerchantNormalizer 단위 테스트
+
+실행:
+    python -m pytest -q tests
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from merchant_normalizer import MerchantNormalizer
+
+LOOKUP_TABLE = {
+    "이마트": "이마트",
+    "이마트24서현점": "이마트24",
+    "GS": "GS리테일",
+    "스타벅스코리아": "스타벅스",
+}
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return MerchantNormalizer(LOOKUP_TABLE)
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("이마트탄현점", "이마트"),
+    ("이마트24역삼점", "이마트24"),
+    ("(주)이마트24 역삼점", "이마트24"),
+    ("스타벅스 강남점", "스타벅스"),
+])
+def test_prefix_with_branch_suffix_matches(normalizer, name, expected):
+    assert normalizer.get(name) == expected
+
+
+@pytest.mark.parametrize("name", ["이마트트레이더스", "이마트트레이더스수원점", "GS25역삼점", "GS건설"])
+def test_prefix_of_other_brand_does_not_match(normalizer, name):
+    assert normalizer.get(name, name) == name
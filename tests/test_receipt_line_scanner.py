@@ -0,0 +1,53 @@
+"""
+RPA/receipt_line_scanner.py 단위 테스트 (기존 extract_* / parse_line_summary 추출 범위와 우선순위 유지)
+
+실행:
+    python -m pytest -q tests
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "RPA"))
+
+from receipt_line_scanner import ReceiptLineScanner, scan_receipt_json
+
+SUMMARY_SCANNER = ReceiptLineScanner({"delivery_addr": r"address"}, ignore_case=True, prefer_label=False)
+
+
+def _analyze_result(pages):
+    """페이지별 라인 리스트 → REST 응답 형식 (content 는 전체 페이지 텍스트)"""
+    content = "\n".join(line for lines in pages for line in lines)
+    return {"analyzeResult": {
+        "content": content,
+        "pages": [{"lines": [{"content": line} for line in lines]} for lines in pages],
+    }}
+
+
+def test_phone_searched_in_all_pages():
+    data = _analyze_result([["이마트 서현점", "합계 12,000"], ["카드 전표", "가맹점 전화 031-123-4567"]])
+
+    assert scan_receipt_json(data)["phone_number"] == "031-123-4567"
+
+
+def test_unlabelled_business_number_falls_back_to_all_pages():
+    data = _analyze_result([["이마트 서현점"], ["가맹점 123-45-67890"]])
+
+    assert scan_receipt_json(data)["business_number"] == "123-45-67890"
+
+
+def test_labelled_business_number_only_on_first_page():
+    data = _analyze_result([["본사 111-11-11111", "사업자 번호 222-22-22222", "배송지 : 서울"],
+                            ["사업자번호 333-33-33333"]])
+
+    scanned = scan_receipt_json(data)
+    assert scanned["business_number"] == "222-22-22222"
+    assert scanned["shipping_address"] == "배송지 : 서울"
+
+
+def test_summary_scanner_takes_first_business_number():
+    lines = ["본사 111-11-11111", "사업자번호 222-22-22222", "Delivery Address: Seoul"]
+
+    scanned = SUMMARY_SCANNER.scan_lines(lines)
+    assert scanned["business_number"] == "111-11-11111"
+    assert scanned["delivery_addr"] == "Delivery Address: Seoul"
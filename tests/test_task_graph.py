@@ -0,0 +1,97 @@
+"""
+RPA_TEST/task_graph.py TaskGraph 단위 테스트
+
+실행:
+    python -m pytest -q tests
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "RPA_TEST"))
+
+from task_graph import TaskGraph
+
+
+class _Abort(BaseException):
+    """KeyboardInterrupt / SystemExit 대신 사용하는 BaseException"""
+
+
+def test_dependency_failure_skips_dependents():
+    ran = []
+
+    def fail():
+        raise ValueError("boom")
+
+    def record(name):
+        ran.append(name)
+        return name
+
+    graph = TaskGraph(max_workers=2)
+    failed = graph.submit(fail, name="fail")
+    child = graph.submit(record, "child", deps=[failed])
+    grandchild = graph.submit(record, "grandchild", deps=[child])
+    independent = graph.submit(record, "independent")
+    graph.run()
+
+    assert isinstance(failed.error, ValueError)
+    assert child.error is failed.error and grandchild.error is failed.error
+    assert child.done and grandchild.done
+    assert independent.result == "independent"
+    assert ran == ["independent"]
+
+
+def test_idle_workers_steal_subtasks():
+    stolen = threading.Event()
+
+    def child(owner):
+        if threading.current_thread().name != owner:
+            stolen.set()
+        time.sleep(0.01)
+
+    def parent():
+        # 하위 작업은 부모 워커의 deque 에 쌓이므로, 부모가 끝나기 전에 실행되려면 다른 워커가 가져가야 함
+        owner = threading.current_thread().name
+        for _ in range(8):
+            graph.submit(child, owner, name="child")
+        return stolen.wait(timeout=5)
+
+    graph = TaskGraph(max_workers=4)
+    task = graph.submit(parent, name="parent")
+    graph.run()
+
+    assert task.result is True
+    assert graph.steals > 0
+    assert all(t.done and t.error is None for t in graph.tasks)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")  # 워커 스레드에서 다시 발생시킨 예외
+def test_base_exception_marks_task_failed_and_propagates():
+    def abort():
+        raise _Abort()
+
+    graph = TaskGraph(max_workers=2)
+    aborted = graph.submit(abort, name="abort")
+    dependent = graph.submit(lambda: None, deps=[aborted], name="dependent")
+
+    raised = []
+
+    def run():
+        try:
+            graph.run()
+        except _Abort as e:
+            raised.append(e)
+
+    runner = threading.Thread(target=run, daemon=True)
+    runner.start()
+    runner.join(timeout=5)
+
+    assert not runner.is_alive(), "run() 이 BaseException 후 종료되지 않음"
+    assert raised and raised[0] is aborted.error
+    assert aborted.done and isinstance(aborted.error, _Abort)
+    assert not dependent.done
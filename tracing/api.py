@@ -1,5 +1,12 @@
 ```python
+import asyncio
+import hashlib
+import json
 import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
@@ -18,16 +25,120 @@ if app_path and app_path not in sys.path:
 # 각 시스템별 실제 비즈니스 로직(Executor) 임포트
 # 예: from api.endpoints.private.v1 import she_testreport_extractor
 
+# ---------------------------------------------------------
+# 비동기 디스패치 설정
+# ---------------------------------------------------------
+EXTRACT_WORKERS = 16                 # 추출 전용 스레드 수 (FastAPI 기본 threadpool 과 분리)
+MAX_CONCURRENCY_PER_SYSTEM = {       # systemName 별 동시 실행 상한 (없으면 default)
+    "default": 4,
+}
+MAX_PENDING_JOBS = 200               # 대기 + 실행 중 작업 상한 (초과 시 429)
+REQUEST_TIMEOUT_SEC = 300            # 요청 대기 타임아웃 기본값
+JOB_TTL_SEC = 3600                   # 완료된 작업 결과 보관 시간 (polling 용)
+RESULT_CACHE_TTL_SEC = 60            # 동일 요청 재시도에 재사용할 성공 결과 보관 시간
+
+_extract_executor = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix="idp-sync")
+
+
+def _new_request_id() -> str:
+    now = datetime.now()
+    return f"{now.strftime('%Y%m%d%H%M%S')}{int(now.microsecond / 1000):03d}"
+
+
+def request_fingerprint(request_data: dict) -> str:
+    """
+    요청 지문 (idpRequestId 를 제외한 요청 본문의 정규화 JSON sha256)
+    """
+    payload = {key: value for key, value in request_data.items() if key != "idpRequestId"}
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RequestCoalescer:
+    """
+    동일 요청 병합 (in-flight coalescing) + 단기 결과 캐시.
+    - 같은 키의 요청이 실행 중이면 새로 실행하지 않고 실행 중인 Future 에 합류
+    - 성공(code 200) 응답은 ttl_sec 동안 캐시하여 재시도에 그대로 반환
+    키는 클라이언트 Idempotency-Key 헤더 또는 request_fingerprint() 값을 사용합니다.
+    """
+
+    def __init__(self, ttl_sec: float = RESULT_CACHE_TTL_SEC):
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._results = {}
+        self.stats = {"executed": 0, "coalesced": 0, "cache_hits": 0}
+
+    def claim(self, key: str):
+        """
+        Returns:
+            tuple: (Future, owner) - owner 가 True 인 경우에만 실제 실행 후 complete() 호출
+        """
+        now = time.monotonic()
+        with self._lock:
+            for expired in [k for k, (expires, _) in self._results.items() if expires <= now]:
+                del self._results[expired]
+
+            cached = self._results.get(key)
+            if cached:
+                self.stats["cache_hits"] += 1
+                future = Future()
+                future.set_result(cached[1])
+                return future, False
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+
+            future = Future()
+            self._inflight[key] = future
+            self.stats["executed"] += 1
+            return future, True
+
+    def complete(self, key: str, future: Future, response: dict = None, error: BaseException = None):
+        """실행 결과를 합류한 요청들에 전달하고, 성공 응답은 캐시"""
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None and isinstance(response, dict) and response.get("code") == "200" and self.ttl_sec > 0:
+                self._results[key] = (time.monotonic() + self.ttl_sec, response)
+        if error is None:
+            future.set_result(response)
+        else:
+            future.set_exception(error)
+
+
+request_coalescer = RequestCoalescer()
+
+
 class SyncSystemNameHandler:
     """
     기존 비동기 로직을 건드리지 않고, 결과를 즉시 반환하는 동기식 전용 핸들러.
     목표: executor.execute()의 결과(result_json)를 리턴값에 포함함.
     """
     
-    def dispatch_sync(self, request_data: dict) -> dict:
-        start_time = datetime.now()
-        # ID 생성 로직 유지
-        idp_request_id = f"{start_time.strftime('%Y%m%d%H%M%S')}{int(start_time.microsecond / 1000):03d}"
+    def dispatch_sync(self, request_data: dict, idp_request_id: str = None, idempotency_key: str = None) -> dict:
+        """
+        동일 요청(idempotency_key 또는 요청 지문)이 실행 중이면 그 결과를 기다려 반환하고,
+        최근 성공 결과가 캐시에 있으면 재실행 없이 반환합니다.
+        """
+        key = idempotency_key or request_fingerprint(request_data)
+        shared, owner = request_coalescer.claim(key)
+        if not owner:
+            logger.info(f"[Sync Dispatcher] Coalesced request: {key[:12]}")
+            return shared.result()
+
+        try:
+            response = self._dispatch(request_data, idp_request_id)
+        except BaseException as e:
+            request_coalescer.complete(key, shared, error=e)
+            raise
+        request_coalescer.complete(key, shared, response)
+        return response
+
+    def _dispatch(self, request_data: dict, idp_request_id: str = None) -> dict:
+        # ID 생성 로직 유지 (비동기 경로에서는 접수 시점에 미리 발급한 ID 사용)
+        idp_request_id = idp_request_id or _new_request_id()
         request_data["idpRequestId"] = idp_request_id
 
         try:
@@ -51,6 +162,70 @@ class SyncSystemNameHandler:
             logger.error(f"[Sync Dispatcher] Critical Error: {str(e)}")
             return self._make_response(idp_request_id, "500", f"Internal Server Error: {str(e)}", request_data)
 
+    async def dispatch_async(self, request_data: dict, timeout: float = None, idp_request_id: str = None,
+                             on_start=None, idempotency_key: str = None) -> dict:
+        """
+        이벤트 루프를 막지 않는 디스패치.
+        추출은 전용 스레드풀에서 실행하고, systemName 별 세마포어로 동시 실행 수를 제한합니다.
+        타임아웃 시 504 응답을 반환하며, 이미 시작된 추출은 끝까지 실행된 뒤 슬롯을 반납합니다.
+        동일 요청은 dispatch_sync 와 같은 방식으로 실행 중인 작업에 합류합니다 (슬롯을 점유하지 않음).
+        """
+        idp_request_id = idp_request_id or _new_request_id()
+        system_name = request_data.get("systemName", "").lower()
+        timeout = REQUEST_TIMEOUT_SEC if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        key = idempotency_key or request_fingerprint(request_data)
+        shared, owner = request_coalescer.claim(key)
+        if not owner:
+            logger.info(f"[Async Dispatcher] Coalesced request: {key[:12]}")
+            if on_start:
+                on_start()
+            try:
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(shared)), timeout)
+            except asyncio.TimeoutError:
+                return self._make_response(idp_request_id, "504", f"Request Timeout: {timeout}s", request_data)
+
+        semaphore = dispatch_queue.semaphore(system_name)
+        acquired = False
+        try:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                response = self._make_response(idp_request_id, "504", f"Queue Timeout: {system_name} ({timeout}s)", request_data)
+                request_coalescer.complete(key, shared, response)
+                return response
+            acquired = True
+            if on_start:
+                on_start()
+
+            def _on_done(done):
+                # 슬롯 반납 및 합류 요청 결과 전달은 실제 추출이 끝날 때 수행
+                # (타임아웃으로 대기를 포기해도 동시 실행 상한 유지)
+                semaphore.release()
+                if done.cancelled():
+                    request_coalescer.complete(key, shared, error=asyncio.CancelledError())
+                elif done.exception() is not None:
+                    request_coalescer.complete(key, shared, error=done.exception())
+                else:
+                    request_coalescer.complete(key, shared, done.result())
+
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(_extract_executor, self._dispatch, request_data, idp_request_id)
+            future.add_done_callback(_on_done)
+        except BaseException as e:
+            # 추출 시작 전 취소(CancelledError) / 실패 시 슬롯 반납 및 합류 요청 해제 (in-flight 키 누수 방지)
+            if acquired:
+                semaphore.release()
+            request_coalescer.complete(key, shared, error=e)
+            raise
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            logger.warning(f"[Async Dispatcher] Timeout: {idp_request_id} ({system_name}, {timeout}s)")
+            return self._make_response(idp_request_id, "504", f"Request Timeout: {timeout}s", request_data)
+
     def _make_response(self, req_id, code, msg, result_data):
         """
         설계된 리스폰스 규격에 맞춰 데이터를 패키징합니다.
@@ -106,4 +281,80 @@ class SyncSystemNameHandler:
 
     # 추가적인 시스템 함수들(coa02, coa03...)도 동일한 패턴으로 작성
 
+
+class AsyncDispatchQueue:
+    """
+    비동기 작업 큐 (202 + job id polling 모드)
+    - systemName 별 세마포어 (이벤트 루프 안에서 지연 생성)
+    - 작업 상태: queued -> running -> done (응답은 dispatch_sync 와 동일 규격)
+    - 완료 후 JOB_TTL_SEC 가 지난 작업은 다음 submit 시 정리
+    """
+
+    def __init__(self):
+        self._semaphores = {}
+        self._jobs = {}
+
+    def semaphore(self, system_name: str) -> asyncio.Semaphore:
+        if system_name not in self._semaphores:
+            limit = MAX_CONCURRENCY_PER_SYSTEM.get(system_name, MAX_CONCURRENCY_PER_SYSTEM["default"])
+            self._semaphores[system_name] = asyncio.Semaphore(limit)
+        return self._semaphores[system_name]
+
+    def pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job["status"] != "done")
+
+    def _evict_expired(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["status"] == "done" and now - job["finishedAt"] > JOB_TTL_SEC]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, request_data: dict, timeout: float = None, idempotency_key: str = None):
+        """
+        작업 등록 후 즉시 job id 반환 (큐가 가득 차면 None)
+        """
+        self._evict_expired()
+        if self.pending_count() >= MAX_PENDING_JOBS:
+            return None
+
+        job_id = uuid.uuid4().hex
+        idp_request_id = _new_request_id()
+        job = {
+            "jobId": job_id,
+            "idpRequestId": idp_request_id,
+            "systemName": request_data.get("systemName", ""),
+            "status": "queued",
+            "createdAt": time.time(),
+            "finishedAt": None,
+            "response": None,
+        }
+        self._jobs[job_id] = job
+
+        async def _run():
+            try:
+                job["response"] = await SyncSystemNameHandler().dispatch_async(
+                    request_data, timeout, idp_request_id,
+                    on_start=lambda: job.update(status="running"), idempotency_key=idempotency_key)
+            except Exception as e:
+                logger.error(f"[Async Dispatcher] Job {job_id} failed: {str(e)}")
+                job["response"] = SyncSystemNameHandler()._make_response(
+                    idp_request_id, "500", f"Internal Server Error: {str(e)}", request_data)
+            finally:
+                job["status"] = "done"
+                job["finishedAt"] = time.time()
+
+        job["task"] = asyncio.create_task(_run())
+        return job_id
+
+    def get(self, job_id: str):
+        """작업 상태 조회 (없으면 None)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {key: value for key, value in job.items() if key != "task"}
+
+
+dispatch_queue = AsyncDispatchQueue()
+
 ```
@@ -1,10 +1,13 @@
 ```python
+from typing import Optional
+
 from loguru import logger
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import JSONResponse
 
 # (가정) 이전에 논의한 동기식 핸들러를 임포트
 # 실제 경로에 맞게 수정 필요
-from rpa.ai.idp.api.services.private.v1.idp_sync_dispatcher import SyncSystemNameHandler
+from rpa.ai.idp.api.services.private.v1.idp_sync_dispatcher import SyncSystemNameHandler, dispatch_queue
 
 # OpenAPI 스키마 (필요시 동기식 전용으로 분리 권장)
 from rpa.ai.idp.api.models.private.v1.schemas import execute_method_openapi_extra
@@ -14,22 +17,55 @@ router = APIRouter()
 @router.post(
     "/execute",
     summary="[동기식] 각 부서 업무별 서비스 호출",
-    description="작업을 즉시 수행하고 결과를 response body에 포함하여 반환합니다.",
+    description="작업을 즉시 수행하고 결과를 response body에 포함하여 반환합니다. "
+                "mode=async 이면 202 + jobId 를 즉시 반환하고 /jobs/{jobId} 로 결과를 조회합니다.",
     openapi_extra=execute_method_openapi_extra,
 )
-def execute_sync(request_data: dict, request: Request) -> dict:
+async def execute_sync(request_data: dict, request: Request, mode: str = "sync", timeout: Optional[float] = None,
+                       idempotency_key: Optional[str] = Header(None)):
     """
     동기식 실행 엔드포인트.
     BackgroundTasks를 사용하지 않고, 로직이 끝날 때까지 대기 후 결과 반환.
+    추출은 전용 스레드풀에서 실행되므로 대기 중에도 다른 요청은 막히지 않습니다.
+
+    - mode=sync  (기본) : 결과 대기 후 반환 (timeout 초과 시 code 504)
+    - mode=async        : 202 + jobId 반환 (polling 모드)
+
+    Idempotency-Key 헤더(없으면 요청 본문 지문)가 같은 요청은 실행 중인 작업에 합류하거나
+    최근 성공 결과를 그대로 반환합니다 (타임아웃 재시도로 인한 중복 추출 방지).
     """
-    logger.info(f"POST /sync/execute - Client:{request.client.host}")
-    
+    logger.info(f"POST /sync/execute - Client:{request.client.host} mode:{mode}")
+
+    if mode == "async":
+        job_id = dispatch_queue.submit(request_data, timeout, idempotency_key)
+        if job_id is None:
+            return JSONResponse(status_code=429, content={"code": "429", "message": "작업 대기열이 가득 찼습니다."})
+        return JSONResponse(
+            status_code=202,
+            content={"jobId": job_id, "status": "queued", "statusUrl": str(request.url_for("get_job", job_id=job_id))},
+        )
+
     # 동기식 전용 핸들러 호출
     handler = SyncSystemNameHandler()
-    
+
     # 결과를 직접 반환받음 (BackgroundTasks 없음)
-    response_data = handler.dispatch_sync(request_data)
-    
+    response_data = await handler.dispatch_async(request_data, timeout, idempotency_key=idempotency_key)
+
     return response_data
 
+
+@router.get(
+    "/jobs/{job_id}",
+    name="get_job",
+    summary="[polling] 비동기 작업 상태/결과 조회",
+)
+async def get_job(job_id: str):
+    """
+    작업 상태 조회. status 가 done 이면 response 에 execute 와 동일한 규격의 결과가 담깁니다.
+    """
+    job = dispatch_queue.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"code": "404", "message": f"작업 없음: {job_id}"})
+    return job
+
 ```
@@ -1,10 +1,143 @@
 import os
+import sys
 import json
+import queue
+import atexit
 import logging
+import logging.handlers
+import types
+import threading
+import importlib
+import importlib.util
 from datetime import datetime, date, time
 
 # 로깅 유틸
-def setup_logger(name, log_dir = './logs', level=logging.INFO):
+# ---------------------------------------------
+# 모든 모듈 로거는 QueueHandler 로 레코드를 큐에 넣기만 하고,
+# 프로세스 공용 QueueListener(백그라운드 스레드 1개)가 로거 이름별 파일/콘솔 핸들러로 기록합니다.
+# (작업 스레드가 파일 쓰기 락을 잡지 않음)
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+RATE_LIMIT_WINDOW_SEC = 10   # 동일 경고 메시지 집계 구간
+RATE_LIMIT_BURST = 5         # 구간 내 허용 횟수 (초과분은 생략 후 다음 구간에 건수만 표시)
+
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """로그 레코드를 한 줄 JSON 으로 출력 (한글/이모지 그대로 유지)"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    반복 경고 제한 필터 (WARNING 레벨만 대상, ERROR 이상은 항상 통과)
+    같은 로거의 동일한 경고 메시지(인자 적용 후)가 window_sec 안에 burst 회를 넘으면 생략하고,
+    다음 구간 첫 메시지에 생략 건수를 붙입니다.
+    파일명 / 상호명 등이 다른 항목별 경고는 서로 다른 메시지로 유지되며, 구간이 지난 상태는 window_sec 마다 정리합니다.
+    """
+
+    def __init__(self, window_sec=RATE_LIMIT_WINDOW_SEC, burst=RATE_LIMIT_BURST):
+        super().__init__()
+        self.window_sec = window_sec
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._state = {}
+        self._last_prune = 0.0
+
+    def _prune(self, now):
+        # 구간이 끝났고 생략 건수도 없는 상태 제거 (생략 건수가 있으면 다음 경고에 붙이도록 유지)
+        self._state = {key: state for key, state in self._state.items()
+                       if now - state[0] < self.window_sec or state[2]}
+        self._last_prune = now
+
+    def filter(self, record):
+        if record.levelno != logging.WARNING:
+            return True
+        key = (record.name, record.getMessage())
+        now = record.created
+        with self._lock:
+            if now - self._last_prune >= self.window_sec:
+                self._prune(now)
+            window_start, count, suppressed = self._state.get(key, (now, 0, 0))
+            if now - window_start >= self.window_sec:
+                if suppressed:
+                    record.msg = f"{record.msg} (직전 {self.window_sec}초간 동일 경고 {suppressed}건 생략)"
+                window_start, count, suppressed = now, 0, 0
+            count += 1
+            allowed = count <= self.burst
+            self._state[key] = (window_start, count, suppressed + (not allowed))
+        return allowed
+
+
+class _RoutingHandler(logging.Handler):
+    """
+    QueueListener 에서 받은 레코드를 로거 이름에 등록된 핸들러들로 전달
+    하위 로거(예: "PRE.x")에서 전파된 레코드는 가장 가까운 상위 이름으로, 등록된 이름이 없으면 루트 로거 핸들러로 전달
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.routes = {}
+
+    def _handlers_for(self, name):
+        while name:
+            handlers = self.routes.get(name)
+            if handlers is not None:
+                return handlers
+            name = name.rpartition(".")[0]
+        return logging.getLogger().handlers or [logging.lastResort]
+
+    def handle(self, record):
+        for handler in self._handlers_for(record.name):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def emit(self, record):
+        self.handle(record)
+
+    def close(self):
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.close()
+        super().close()
+
+
+_log_router = _RoutingHandler()
+
+
+def _ensure_log_listener():
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is None:
+            _log_listener = logging.handlers.QueueListener(_log_queue, _log_router)
+            _log_listener.start()
+            atexit.register(stop_log_listener)
+
+
+def stop_log_listener():
+    """큐에 남은 로그를 모두 기록한 뒤 백그라운드 기록 스레드 종료 (종료 시 자동 호출)"""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            _log_listener = None
+            for handlers in _log_router.routes.values():
+                for handler in handlers:
+                    handler.flush()
+
+
+def setup_logger(name, log_dir = './logs', level=logging.INFO, json_lines=False, rate_limit=False):
     """
     모듈별 로거 생성 함수
     
@@ -12,13 +145,15 @@ def setup_logger(name, log_dir = './logs', level=logging.INFO):
         name (str): 로거 이름
         log_dir (str): 로그 파일 저장 경로
         level (int): 로그 레벨(기본값 : logging.INFO)
+        json_lines (bool): 로그 파일을 JSON Lines 형식으로 기록 (기본값 : False, 파일명 .jsonl)
+        rate_limit (bool): 동일 경고 반복 제한 필터 적용 여부 (기본값 : False)
     
     Returns:
         logging.Logger: 설정된 로거 인스턴스
     """
     os.makedirs(log_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    log_filename = f"{name}_{timestamp}.log"
+    log_filename = f"{name}_{timestamp}.{'jsonl' if json_lines else 'log'}"
     log_path = os.path.join(log_dir, log_filename)
     
     logger = logging.getLogger(name)
@@ -26,17 +161,65 @@ def setup_logger(name, log_dir = './logs', level=logging.INFO):
     logger.propagate = False
     
     if not logger.handlers:
+        formatter = logging.Formatter(LOG_FORMAT)
+
         fh = logging.FileHandler(log_path, encoding='utf-8')
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
+        fh.setFormatter(JsonLinesFormatter() if json_lines else formatter)
         
         ch = logging.StreamHandler()
         ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        _log_router.routes[name] = [fh, ch]
+
+        qh = logging.handlers.QueueHandler(_log_queue)
+        if rate_limit:
+            qh.addFilter(RateLimitFilter())
+        logger.addHandler(qh)
+        _ensure_log_listener()
     
     return logger
 
+# 지연 임포트 유틸
+_lazy_import_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """
+    첫 속성 접근 시점에 실제 모듈을 임포트하는 자리 표시 모듈
+    importlib.util.LazyLoader 는 여러 스레드가 동시에 첫 속성에 접근하면 초기화 중인 모듈을 노출할 수 있어
+    (TaskGraph / 데몬 워커 스레드), 첫 로드를 모듈 단위 락으로 직렬화합니다.
+    """
+
+    def __getattr__(self, attr):
+        with _lazy_import_lock:
+            module = self.__dict__.get("_lazy_module")
+            if module is None:
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    모듈을 지연 로딩으로 임포트 (첫 속성 접근 시점에 실제 로드, 스레드 안전)
+    cv2, pandas, Azure SDK 등 무거운 의존성의 임포트 비용을 사용하는 단계로 미룹니다.
+
+    Args:
+        name (str): 모듈 이름 (예: 'cv2', 'azure.ai.formrecognizer')
+
+    Returns:
+        module: 지연 로딩 모듈 객체 (이미 로드된 경우 기존 모듈)
+
+    Raises:
+        ModuleNotFoundError: 모듈이 설치되어 있지 않은 경우 (임포트 시점에 확인)
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
+
 # 공통 유틸 함수
 
 def ensure_dir(path, logger=None):